@@ -0,0 +1,247 @@
+"""
+Offline benchmarks of the fetching, conversion and plotting hot paths.
+
+Pages recorded in ``tests/data`` and synthetic pages modelled on them are served by a mocked session, so no token
+or network access is needed. Every benchmark is repeated and the minimum and median times are reported in JSON,
+which can be compared with the results of another commit::
+
+    python -m benchmarks.run --output before.json
+    git checkout my-branch
+    python -m benchmarks.run --compare before.json
+
+Run from the root of the repository. Synthetic data of 10^7 rows needs several GB of memory.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SOURCES, SyntheticSession, load_pages, query_args, synthetic_pages
+from stockgeist import StockGeistClient, MessageMetricsResponse, ArticleMetricsResponse, PriceMetricsResponse, \
+    TopicMetricsResponse, RankingMetricsResponse
+
+RESPONSE_CLASSES = {
+    'message-metrics': MessageMetricsResponse,
+    'article-metrics': ArticleMetricsResponse,
+    'price-metrics': PriceMetricsResponse,
+    'topic-metrics': TopicMetricsResponse,
+    'ranking-metrics': RankingMetricsResponse,
+}
+
+
+def _visualizations(endpoint: str, response) -> Dict[str, Callable]:
+    """
+    Get the visualizations of a response to benchmark, by name.
+    """
+    if endpoint == 'message-metrics':
+        return {'': lambda: response.visualize('total_count+ma', show_fig=False)}
+    if endpoint == 'article-metrics':
+        return {'': lambda: response.visualize('titles+mentions+title_sentiments', show_fig=False)}
+    if endpoint == 'price-metrics':
+        return {'': lambda: response.visualize('close', show_fig=False),
+                '-candlesticks': lambda: response.visualize('open+high+low+close+volume', display_candlesticks=True,
+                                                            show_fig=False)}
+    if endpoint == 'topic-metrics':
+        timestamp = response.as_dict['timestamp'][len(response.as_dict['timestamp']) // 2]
+        return {'': lambda: response.visualize(timestamp, show_fig=False)}
+    return {'': lambda: response.visualize(show_fig=False)}
+
+
+def measure(run: Callable, setup: Callable = None, repeat: int = 5, warmup: bool = False) -> Dict:
+    """
+    Time a function.
+
+    :param run: Function to time, called with the result of ``setup``.
+
+    :param setup: Function preparing a fresh state before every run. Not timed.
+
+    :param repeat: Number of timed runs.
+
+    :param warmup: Whether to make an untimed run first, e.g. to import lazily imported modules.
+
+    :return: Dict with the minimum, median and mean time in seconds.
+    """
+    setup = setup or (lambda: None)
+    if warmup:
+        run(setup())
+
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        started = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - started)
+
+    return {'min': min(times), 'median': statistics.median(times), 'mean': statistics.mean(times), 'repeat': repeat}
+
+
+def count_pages(res: List[Dict]) -> Dict[str, int]:
+    """
+    Count fetched rows and pages.
+    """
+    return {'rows': sum(len(page['body']) for page in res), 'pages': len(res)}
+
+
+def run_benchmarks(endpoints: List[str], sizes: List[int], plot_sizes: List[int], repeat: int,
+                   select: str = None) -> Dict[str, Dict]:
+    """
+    Run all benchmarks.
+
+    :param endpoints: Endpoints (without the ``time-series/`` prefix) whose data to use.
+
+    :param sizes: Numbers of rows of synthetic data for fetching and conversion benchmarks.
+
+    :param plot_sizes: Numbers of rows of synthetic data for visualization benchmarks.
+
+    :param repeat: Number of timed runs of every benchmark.
+
+    :param select: Run only benchmarks whose names contain this string.
+
+    :return: Dict mapping benchmark names to results: times and the number of rows (and pages) actually processed.
+    """
+    results = {}
+
+    def selected(name):
+        return select is None or select in name
+
+    def add(name, run, count, setup=None, warmup=False):
+        """
+        Time a benchmark and record the amount of data it actually processed, counted by ``count`` from the output
+        of the last run.
+        """
+        if not selected(name):
+            return
+        outputs = []
+        result = measure(lambda state: outputs.append(run(state)), setup, repeat, warmup)
+        result.update(count(outputs[-1]))
+        results[name] = result
+        print(f'{name:<55} {result["median"] * 1000:>10.2f} ms', file=sys.stderr)
+
+    for endpoint in endpoints:
+        response_class = RESPONSE_CLASSES[endpoint]
+        endpoint_name = f'time-series/{endpoint}'
+        timeframe = SOURCES[endpoint][1]
+
+        for n_rows in sizes:
+            args = query_args(endpoint, n_rows)
+            pages = synthetic_pages(endpoint, n_rows)
+
+            for max_workers in [1, 4]:
+                name = f'fetch/{endpoint}/{n_rows}' if max_workers == 1 else \
+                    f'fetch-{max_workers}-workers/{endpoint}/{n_rows}'
+                if not selected(name):
+                    continue
+                session = SyntheticSession(pages, timeframe)
+
+                def setup_client(max_workers=max_workers, session=session):
+                    # synthetic bars run around the clock, so price metrics mustn't be planned with the calendar
+                    client = StockGeistClient('benchmark-token', max_workers=max_workers, progress=False,
+                                              calendar=False)
+                    client._session = session
+                    return client
+
+                add(name, lambda client: client._fetch_data_time_series(endpoint_name, args), count_pages,
+                    setup_client)
+                del session
+
+            response = response_class(pages, args)
+            add(f'convert/{endpoint}/{n_rows}', lambda _: response._convert_raw_data_to_time_series(),
+                lambda data: {'rows': len(data['timestamp'])})
+            add(f'as_dataframe/{endpoint}/{n_rows}', lambda response: response.as_dataframe,
+                lambda df: {'rows': len(df)}, lambda: response_class(pages, args))
+            del response, pages
+
+        # recorded data
+        pages = load_pages(endpoint)
+        args = dict(query_args(endpoint, 0), start=None, end=None)
+        response = response_class(pages, args)
+        for suffix, run in _visualizations(endpoint, response).items():
+            add(f'visualize{suffix}/{endpoint}/recorded', lambda _, run=run: run(),
+                lambda _, response=response: {'rows': len(response.timestamps)}, warmup=True)
+
+        # synthetic data
+        for n_rows in plot_sizes:
+            args = query_args(endpoint, n_rows)
+            response = response_class(synthetic_pages(endpoint, n_rows), args)
+            for suffix, run in _visualizations(endpoint, response).items():
+                add(f'visualize{suffix}/{endpoint}/{n_rows}', lambda _, run=run: run(),
+                    lambda _, response=response: {'rows': len(response.timestamps)}, warmup=True)
+
+    return results
+
+
+def metadata() -> Dict:
+    """
+    Describe the environment the benchmarks were run in.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                check=True).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {'commit': commit, 'timestamp': str(pd.Timestamp.now(tz='UTC')), 'python': platform.python_version(),
+            'platform': platform.platform(), 'numpy': np.__version__, 'pandas': pd.__version__}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float = 1.1) -> List[str]:
+    """
+    Compare median times with a baseline.
+
+    :param results: Current results.
+
+    :param baseline: Results of the baseline.
+
+    :param threshold: Ratio of times above which a benchmark is reported as slower.
+
+    :return: Lines of the comparison table.
+    """
+    lines = [f'{"benchmark":<55} {"baseline":>12} {"current":>12} {"ratio":>7}']
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['median'] / baseline[name]['median']
+        flag = ' slower' if ratio > threshold else ' faster' if ratio < 1 / threshold else ''
+        lines.append(f'{name:<55} {baseline[name]["median"] * 1000:>10.2f}ms {result["median"] * 1000:>10.2f}ms '
+                     f'{ratio:>7.2f}{flag}')
+
+    return lines
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description='Offline benchmarks of stockgeist-client-python.')
+    parser.add_argument('--endpoints', nargs='+', default=list(SOURCES), choices=list(SOURCES))
+    parser.add_argument('--rows', nargs='+', type=int, default=[10 ** 5],
+                        help='rows of synthetic data for fetching and conversion, e.g. 100000 1000000 10000000')
+    parser.add_argument('--plot-rows', nargs='+', type=int, default=[10 ** 4],
+                        help='rows of synthetic data for visualizations')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--select', help='run only benchmarks whose names contain this string')
+    parser.add_argument('--output', help='file to write the JSON results to, stdout by default')
+    parser.add_argument('--compare', help='JSON results of a baseline to compare with')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.endpoints, args.rows, args.plot_rows, args.repeat, args.select)
+    report = {'metadata': metadata(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print('\n'.join(compare(results, baseline)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
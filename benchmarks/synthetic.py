@@ -0,0 +1,128 @@
+import json
+import pickle
+from typing import Dict, List
+from urllib.parse import urlsplit, parse_qsl
+
+import numpy as np
+import pandas as pd
+
+# endpoint, symbol, timeframe and metrics of the recorded pages the synthetic data is modelled on
+SOURCES = {
+    'message-metrics': ('TSLA', '5m', None),
+    'article-metrics': ('NVDA', '5m', ('titles', 'title_sentiments', 'mentions')),
+    'price-metrics': ('GILD', '5m', None),
+    'topic-metrics': ('AAPL', '1h', None),
+    'ranking-metrics': ('A', '1h', None),
+}
+
+PAGE_SIZE = 50
+START = pd.Timestamp('2000-01-03 00:00:00', tz='UTC')
+
+
+def load_pages(endpoint: str, timeframe: str = None) -> List[Dict]:
+    """
+    Load pages recorded from REST API in ``tests/data``.
+
+    :param endpoint: Endpoint name without the ``time-series/`` prefix.
+
+    :param timeframe: Time resolution of the data; the one of ``SOURCES`` by default.
+
+    :return: list of pages, ordered from the latest to the earliest one.
+    """
+    symbol, source_timeframe, _ = SOURCES[endpoint]
+    with open(f'tests/data/{endpoint}/{symbol}-{timeframe or source_timeframe}-all-metrics.pkl', 'rb') as f:
+        return pickle.load(f)
+
+
+def query_args(endpoint: str, n_rows: int) -> Dict:
+    """
+    Get query arguments covering ``n_rows`` bars of synthetic data.
+    """
+    symbol, timeframe, metrics = SOURCES[endpoint]
+    end = START + pd.Timedelta(timeframe) * n_rows
+
+    args = {'symbol': symbol, 'timeframe': timeframe, 'filter': metrics,
+            'start': START.strftime('%Y-%m-%dT%H:%M:%S'), 'end': end.strftime('%Y-%m-%dT%H:%M:%S')}
+    if endpoint == 'ranking-metrics':
+        args.update(by='total_count', direction='descending', top=5)
+
+    return args
+
+
+def synthetic_pages(endpoint: str, n_rows: int, seed: int = 0) -> List[Dict]:
+    """
+    Generate pages of ``n_rows`` consecutive bars in the layout of REST API pages. Rows are copies of the recorded
+    ones with new timestamps and, for numeric metrics, randomized values. The same seed gives the same data.
+
+    :param endpoint: Endpoint name without the ``time-series/`` prefix.
+
+    :param n_rows: Number of rows.
+
+    :param seed: Seed of the random generator.
+
+    :return: list of pages, ordered from the latest to the earliest one.
+    """
+    symbol, timeframe, metrics = SOURCES[endpoint]
+    templates = [row for page in load_pages(endpoint)[::-1] for row in page['body'] if len(page['body'])]
+    if metrics is not None:
+        templates = [{key: val for key, val in row.items() if key in metrics + ('timestamp', 'symbol')}
+                     for row in templates]
+    numeric_keys = [key for key, val in templates[0].items() if isinstance(val, (int, float))
+                    and not isinstance(val, bool)]
+
+    rng = np.random.default_rng(seed)
+    noise = rng.uniform(0.5, 1.5, size=(n_rows, len(numeric_keys))).tolist()
+    timestamps = pd.date_range(START, periods=n_rows, freq=pd.Timedelta(timeframe)).strftime('%Y-%m-%d %H:%M:%S+00:00')
+
+    rows = []
+    for i, timestamp in enumerate(timestamps):
+        row = dict(templates[i % len(templates)], timestamp=timestamp)
+        for key, factor in zip(numeric_keys, noise[i]):
+            row[key] = round(row[key] * factor, 4)
+        rows.append(row)
+
+    metadata = {'status_code': 200, 'message': 'OK', 'credits': 10 ** 9,
+                'server_timestamp': '2021-06-23 10:20:12.617781+00:00'}
+    return [{'metadata': metadata, 'body': rows[max(0, end - PAGE_SIZE):end]}
+            for end in range(n_rows, 0, -PAGE_SIZE)]
+
+
+class SyntheticResponse:
+    """
+    Minimal stand-in for ``requests.Response`` holding a pre-encoded page.
+    """
+
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {'Content-Type': 'application/json'}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+class SyntheticSession:
+    """
+    Mocked HTTP session serving pre-encoded synthetic pages by the ``end`` argument of the query, so that only the
+    client side of fetching is measured.
+    """
+
+    def __init__(self, pages: List[Dict], timeframe: str):
+        step = pd.Timedelta(timeframe)
+        self._pages = {}
+        for page in pages:
+            end = pd.Timestamp(page['body'][-1]['timestamp']) + step
+            self._pages[end.strftime('%Y-%m-%dT%H:%M:%S')] = json.dumps(page).encode('utf-8')
+        self._empty = json.dumps({'metadata': pages[0]['metadata'], 'body': []}).encode('utf-8')
+        self.n_bytes = sum(len(content) for content in self._pages.values())
+
+    def get(self, url: str, **kwargs) -> SyntheticResponse:
+        args = dict(parse_qsl(urlsplit(url).query))
+        return SyntheticResponse(self._pages.get(args.get('end'), self._empty))
+
+    def close(self):
+        pass
+
@@ -16,6 +16,13 @@ REQUIRED_PACKAGES = [
     'python-dotenv~=0.18.0'
 ]
 
+EXTRAS_REQUIRE = {
+    'async': ['aiohttp~=3.7.4'],
+    'http2': ['httpx[http2]~=0.18.2'],
+    'brotli': ['brotli~=1.0.9'],
+    'parquet': ['pyarrow~=4.0.1'],
+}
+
 setup(
     name="stockgeist-client-python",
     version="0.1.1",
@@ -33,5 +40,6 @@ setup(
     ],
     packages=find_packages(include=['stockgeist']),
     install_requires=REQUIRED_PACKAGES,
+    extras_require=EXTRAS_REQUIRE,
     python_requires=">=3.6",
 )
\ No newline at end of file
@@ -1,3 +1,14 @@
 from .client import StockGeistClient
+from .async_client import AsyncStockGeistClient
 from .responses import MessageMetricsResponse, ArticleMetricsResponse, PriceMetricsResponse, \
-    TopicMetricsResponse, RankingMetricsResponse, SymbolsResponse, FundamentalsResponse
+    TopicMetricsResponse, RankingMetricsResponse, SymbolsResponse, FundamentalsResponse, \
+    PanelResponse
+from .cache import SnapshotCache
+from .store import TimeSeriesStore
+from .scheduler import RequestScheduler
+from .live import Subscription
+from .hooks import Hooks, ClientStats
+from .transport import CassetteTransport
+from .trading_calendar import NYSECalendar
+from .planning import QueryPlan
+from .analysis import RollingStats
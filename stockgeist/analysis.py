@@ -1,4 +1,280 @@
-import plotly
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class RollingStats:
+    """
+    Incremental rolling statistics of many (symbol, metric) time series at once: mean, variance and z-score over a
+    window of the latest values and an exponentially weighted moving average (EWMA).
+
+    Every series keeps its latest values in a row of a shared ring buffer together with running sums, so an update
+    costs O(1) per series regardless of the window length, and updates of many series are applied as a few vectorized
+    numpy operations. The running sums are recomputed from the buffer whenever a series wraps around its buffer, which
+    keeps floating point errors from accumulating.
+
+    Series are initialized from history with :meth:`add_history` or :meth:`add_response` and updated with new rows
+    with :meth:`update`, whose signature fits the callbacks of :class:`stockgeist.live.Subscription`::
+
+        stats = RollingStats(window=48, metrics=('total_count',))
+        stats.add_response(client.get_message_metrics('TSLA', start='2021-06-01T00:00:00'))
+        subscription = client.tail('message-metrics', ['TSLA'], filter=('total_count',), callback=stats.update)
+        ...
+        print(stats.spikes(threshold=3.))
+    """
+
+    def __init__(self, window: int = 20, span: float = None, metrics: Sequence[str] = None, min_periods: int = 2):
+        """
+        :param window: Number of the latest values the mean, variance and z-score are computed from.
+
+        :param span: Span of the EWMA, its smoothing factor is ``2 / (span + 1)``. Defaults to ``window``.
+
+        :param metrics: Metrics to track. All numeric metrics are tracked if not given.
+
+        :param min_periods: Minimum number of values in the window needed for the variance and z-score.
+        """
+        if window < 2:
+            raise Exception('Window of rolling statistics has to hold at least 2 values!')
+
+        self._window = window
+        self._alpha = 2. / ((span if span is not None else window) + 1.)
+        self._metrics = list(metrics) if metrics is not None else None
+        self._min_periods = max(min_periods, 2)
+
+        self._keys = {}
+        self._buffer = np.empty((0, window), dtype=np.float64)
+        self._pos, self._count, self._updates = (np.empty(0, dtype=np.int64) for _ in range(3))
+        self._sum, self._sumsq, self._ewma, self._last = (np.empty(0, dtype=np.float64) for _ in range(4))
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Grow the state arrays to hold ``capacity`` series, keeping the state of the existing ones.
+        """
+        for name in ['_buffer', '_pos', '_count', '_updates', '_sum', '_sumsq', '_ewma', '_last']:
+            array = getattr(self, name)
+            resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            resized[:len(array)] = array
+            setattr(self, name, resized)
+
+    def _rows(self, symbol: Optional[str], metrics: Iterable[str]) -> np.ndarray:
+        """
+        Get rows of the state arrays of series, registering the new ones.
+        """
+        rows = []
+        for metric in metrics:
+            key = (symbol, metric)
+            row = self._keys.get(key)
+            if row is None:
+                row = len(self._keys)
+                if row == len(self._pos):
+                    # grow geometrically so that registering series is amortized O(1)
+                    self._allocate(max(16, 2 * row))
+                self._keys[key] = row
+            rows.append(row)
+
+        return np.array(rows, dtype=np.int64)
+
+    def _tracked(self, columns: Dict[str, Sequence]) -> Dict[str, np.ndarray]:
+        """
+        Get numeric columns of the tracked metrics.
+
+        :param columns: Dict of columns of data or of values of a single row.
+
+        :return: Dict mapping metrics to float64 arrays, missing values are NaN.
+        """
+        names = self._metrics if self._metrics is not None else \
+            [name for name in columns if name not in ('timestamp', 'symbol')]
+
+        tracked = {}
+        for name in names:
+            if name not in columns:
+                continue
+            try:
+                values = np.atleast_1d(np.array(columns[name], dtype=np.float64))
+            except (TypeError, ValueError):
+                # not a numeric metric, e.g. titles of articles
+                continue
+            if values.ndim == 1:
+                tracked[name] = values
+
+        return tracked
+
+    def _push(self, rows: np.ndarray, values: np.ndarray) -> None:
+        """
+        Append a single value to each of the series. Missing (NaN) values are skipped.
+
+        :param rows: Rows of the series, unique.
+
+        :param values: New values of the series.
+        """
+        valid = np.isfinite(values)
+        rows, values = rows[valid], values[valid]
+
+        # value leaving the window, if the window is full
+        pos = self._pos[rows]
+        evicted = np.where(self._count[rows] >= self._window, self._buffer[rows, pos], 0.)
+        self._sum[rows] += values - evicted
+        self._sumsq[rows] += values * values - evicted * evicted
+        self._buffer[rows, pos] = values
+        self._count[rows] = np.minimum(self._count[rows] + 1, self._window)
+
+        ewma = self._ewma[rows]
+        self._ewma[rows] = np.where(self._updates[rows] == 0, values, ewma + self._alpha * (values - ewma))
+        self._updates[rows] += 1
+        self._last[rows] = values
+
+        pos = (pos + 1) % self._window
+        self._pos[rows] = pos
+
+        # refresh the running sums of series which have just filled their buffer again
+        wrapped = rows[pos == 0]
+        if len(wrapped):
+            self._sum[wrapped] = self._buffer[wrapped].sum(axis=1)
+            self._sumsq[wrapped] = np.square(self._buffer[wrapped]).sum(axis=1)
+
+    def update(self, symbol: Optional[str], delta: Dict[str, Union[Sequence, float]]) -> Dict[str, float]:
+        """
+        Update the series of a symbol with new rows.
+
+        :param symbol: Symbol the rows belong to.
+
+        :param delta: Dict of columns of new rows (e.g. ``Subscription`` delta) or of values of a single row.
+
+        :return: Dict mapping metrics to z-scores of the latest values.
+        """
+        columns = self._tracked(delta)
+        if not columns:
+            return {}
+
+        metrics = list(columns)
+        rows = self._rows(symbol, metrics)
+        values = np.array([columns[name] for name in metrics])
+        for i in range(values.shape[1]):
+            self._push(rows, values[:, i])
+
+        return dict(zip(metrics, self._zscores(rows).tolist()))
+
+    def add_history(self, symbol: Optional[str], columns: Dict[str, Sequence]) -> None:
+        """
+        Initialize the series of a symbol from history in a single vectorized pass, replacing their current state.
+
+        :param symbol: Symbol the data belongs to.
+
+        :param columns: Dict of columns of historical data ordered from the earliest value.
+        """
+        for metric, values in self._tracked(columns).items():
+            row = self._rows(symbol, [metric])[0]
+            values = values[np.isfinite(values)]
+            n = len(values)
+
+            # the latest values fill the buffer in the order they would have been pushed
+            latest = values[-self._window:]
+            self._buffer[row] = np.nan
+            self._buffer[row, np.arange(n - len(latest), n) % self._window] = latest
+            self._pos[row] = n % self._window
+            self._count[row] = len(latest)
+            self._updates[row] = n
+            self._sum[row] = latest.sum()
+            self._sumsq[row] = np.square(latest).sum()
+            self._last[row] = values[-1] if n else np.nan
+
+            # closed form of the recursive EWMA started at the first value
+            if n:
+                weights = self._alpha * (1. - self._alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+                weights[0] = (1. - self._alpha) ** (n - 1)
+                self._ewma[row] = weights @ values
+            else:
+                self._ewma[row] = np.nan
+
+    def add_response(self, response) -> None:
+        """
+        Initialize series from the data of a time series response, e.g. ``MessageMetricsResponse``, or of all
+        symbols of a ``PanelResponse``.
+
+        :param response: Response object.
+        """
+        responses = response.responses if hasattr(response, 'responses') else {None: response}
+        for symbol, symbol_response in responses.items():
+            if symbol is None:
+                symbol = getattr(symbol_response, '_query_args', {}).get('symbol')
+            order = np.argsort(symbol_response.timestamps, kind='stable')
+            columns = {name: values[order] if isinstance(values, np.ndarray) else [values[i] for i in order]
+                       for name, values in symbol_response._data_dict.items() if name != 'timestamp'}
+            self.add_history(symbol, columns)
+
+    def _zscores(self, rows: np.ndarray) -> np.ndarray:
+        mean, std = self._mean_std(rows)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscores = (self._last[rows] - mean) / std
+        return np.where(np.isfinite(zscores), zscores, np.nan)
+
+    def _mean_std(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        count = self._count[rows].astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = self._sum[rows] / count
+            variance = (self._sumsq[rows] - self._sum[rows] * mean) / (count - 1)
+        variance = np.where(count >= self._min_periods, np.maximum(variance, 0.), np.nan)
+        return np.where(count > 0, mean, np.nan), np.sqrt(variance)
+
+    @property
+    def keys(self) -> List[Tuple[Optional[str], str]]:
+        return list(self._keys.keys())
+
+    def get(self, symbol: Optional[str], metric: str) -> Dict[str, float]:
+        """
+        Get statistics of a single series.
+
+        :param symbol: Symbol of the series.
+
+        :param metric: Metric of the series.
+
+        :return: Dict with count, last, mean, std, ewma and zscore.
+        """
+        rows = np.array([self._keys[(symbol, metric)]], dtype=np.int64)
+        mean, std = self._mean_std(rows)
+
+        return {'count': int(self._count[rows][0]), 'last': float(self._last[rows][0]), 'mean': float(mean[0]),
+                'std': float(std[0]), 'ewma': float(self._ewma[rows][0]), 'zscore': float(self._zscores(rows)[0])}
+
+    @property
+    def as_dataframe(self) -> pd.DataFrame:
+        """
+        Statistics of all series as pandas DataFrame indexed by (symbol, metric) MultiIndex.
+        """
+        rows = np.arange(len(self._keys), dtype=np.int64)
+        mean, std = self._mean_std(rows)
+        index = pd.MultiIndex.from_tuples(self.keys, names=['symbol', 'metric']) if self._keys else \
+            pd.MultiIndex.from_arrays([[], []], names=['symbol', 'metric'])
+
+        return pd.DataFrame({'count': self._count[rows], 'last': self._last[rows], 'mean': mean, 'std': std,
+                             'ewma': self._ewma[rows], 'zscore': self._zscores(rows)}, index=index)
+
+    def spikes(self, threshold: float = 3.) -> List[Tuple[Optional[str], str, float]]:
+        """
+        Find series whose latest value deviates from the rolling mean by more than ``threshold`` standard
+        deviations.
+
+        :param threshold: Minimum absolute z-score.
+
+        :return: list of (symbol, metric, z-score) tuples sorted by descending absolute z-score.
+        """
+        rows = np.arange(len(self._keys), dtype=np.int64)
+        zscores = self._zscores(rows)
+        with np.errstate(invalid='ignore'):
+            hits = np.flatnonzero(np.abs(zscores) > threshold)
+        hits = hits[np.argsort(-np.abs(zscores[hits]), kind='stable')]
+        keys = self.keys
+
+        return [(keys[row][0], keys[row][1], float(zscores[row])) for row in hits]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):  # pragma: no cover
+        return f'<rolling statistics>\n' \
+               f'  window: {self._window}\n' \
+               f'  series: {len(self._keys)}'
 
 
 class Plotter:
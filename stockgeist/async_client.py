@@ -0,0 +1,323 @@
+import asyncio
+import logging
+from typing import Tuple, Dict, List, Union
+
+from stockgeist.client import _BaseClient
+from stockgeist.decoding import Decoder, get_decoder
+from stockgeist.responses import ArticleMetricsResponse, MessageMetricsResponse, PriceMetricsResponse, \
+    RankingMetricsResponse, TopicMetricsResponse, SymbolsResponse, FundamentalsResponse
+from stockgeist.scheduler import RequestScheduler
+
+logger = logging.getLogger()
+
+
+class AsyncStockGeistClient(_BaseClient):
+    """
+    A Client class responsible for asynchronous communication with StockGeist's API. Requires ``aiohttp``.
+
+    All fetchers mirror the ones of :class:`stockgeist.client.StockGeistClient` and return the same response
+    objects, but they are coroutines, so a single event loop can keep many queries in flight at the same time::
+
+        async with AsyncStockGeistClient(token, max_concurrency=50) as client:
+            responses = await asyncio.gather(*[client.get_message_metrics(symbol) for symbol in symbols])
+    """
+
+    def __init__(self, token, max_concurrency: int = 10, rate_limit: float = None, max_retries: int = 3,
+                 credit_reserve: int = 0, json_decoder: Union[str, Decoder] = 'auto'):
+        """
+        :param token: StockGeist's REST API token.
+
+        :param max_concurrency: Maximum number of HTTP requests in flight at the same time.
+
+        See :class:`stockgeist.client.StockGeistClient` for the description of the other arguments.
+        """
+        super().__init__(token, RequestScheduler(rate_limit, max_retries=max_retries, credit_reserve=credit_reserve))
+        self._max_concurrency = max_concurrency
+        self._decode = get_decoder(json_decoder)
+        self._session = None
+        self._semaphore = None
+
+        # exceptions raised when no (complete) response is received
+        try:
+            import aiohttp
+            self._network_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        except ImportError:
+            self._network_errors = (asyncio.TimeoutError,)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the underlying HTTP session.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, query: str) -> Dict:
+        """
+        Query REST API respecting the concurrency and rate limits and retry transient errors.
+
+        :param query: REST API query string.
+
+        :return: Decoded page returned by REST API.
+        """
+        # session and semaphore have to be created inside of the running event loop
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError:
+                raise Exception('AsyncStockGeistClient requires aiohttp! Install it with `pip install aiohttp`.')
+            self._session = aiohttp.ClientSession()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        attempt = 0
+        while True:
+            delay = self._scheduler.reserve()
+            if delay is None:
+                return self._refused_page()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self._semaphore:
+                try:
+                    async with self._session.get(query) as response:
+                        content = await response.read()
+                        try:
+                            page = self._decode(content)
+                        except ValueError:
+                            page = self._invalid_page(response.status, len(content))
+                        retry_after = response.headers.get('Retry-After')
+                except self._network_errors as e:
+                    # timeouts and dropped connections are retried like transient errors of REST API
+                    page = self._error_page(self.network_error_status, f'Network error ({type(e).__name__}: {e})')
+                    retry_after = None
+            self._scheduler.update(page['metadata'])
+
+            # retry transient errors, the slot is released while waiting
+            status_code = page['metadata']['status_code']
+            delay = self._scheduler.retry_delay(status_code, attempt, retry_after)
+            if delay is None:
+                return page
+            logger.warning(f'Request failed with status code {status_code}, retrying in {delay:.1f} s.')
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _fetch_data_time_series(self, endpoint_name: str, query_args: Dict) -> List[Dict]:
+        """
+        Fetch data from time series endpoints of REST API.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        query_args = dict(query_args)
+        res = []
+        while True:
+            # construct query
+            query = self._construct_query(endpoint_name, query_args)
+
+            # query endpoint
+            res_batch = await self._get(query)
+            res.append(res_batch)
+
+            # check response
+            if res_batch['metadata']['status_code'] != 200:
+                if len(res) > 1:
+                    logger.warning(f'Fetching of {endpoint_name} stopped after {len(res) - 1} pages before '
+                                   f'{query_args["end"]}: {res_batch["metadata"]["message"]}. The data is incomplete.')
+                return res
+
+            # move to the previous page
+            end = self._next_page_end(endpoint_name, query_args, res_batch)
+            if end is None:
+                break
+            query_args['end'] = end
+
+        return res
+
+    async def _fetch_data_snapshot(self, endpoint_name: str, query_args: Dict) -> List[Dict]:
+        """
+        Fetch data from snapshot endpoints of REST API.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        # construct query
+        query = self._construct_query(endpoint_name, query_args)
+
+        # query endpoint
+        res = await self._get(query)
+
+        return [res]
+
+    async def get_credits(self):
+        """
+        Queries StockGeist's API and gets the number of credits available for given token.
+        """
+
+        # get data
+        res = (await self._fetch_data_snapshot('snapshot/credits', {}))[0]
+        credits = res['metadata']['credits']
+
+        return credits
+
+    async def get_message_metrics(self,
+                                  symbol: str,
+                                  timeframe: str = '5m',
+                                  filter: Tuple[str, ...] = ('total_count', ),
+                                  start: str = None,
+                                  end: str = None) -> MessageMetricsResponse:
+        """
+        Queries StockGeist's API and gets message metrics data. See
+        :meth:`stockgeist.client.StockGeistClient.get_message_metrics` for the description of the arguments.
+
+        :return: MessageMetricsResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        query_args.pop('self')
+
+        # get data
+        res = await self._fetch_data_time_series('time-series/message-metrics', query_args)
+
+        return MessageMetricsResponse(res, query_args)
+
+    async def get_article_metrics(self,
+                                  symbol: str,
+                                  timeframe: str = '5m',
+                                  filter: Tuple[str, ...] = ('titles',),
+                                  start: str = None,
+                                  end: str = None) -> ArticleMetricsResponse:
+        """
+        Queries StockGeist's API and gets article metrics data. See
+        :meth:`stockgeist.client.StockGeistClient.get_article_metrics` for the description of the arguments.
+
+        :return: ArticleMetricsResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        query_args.pop('self')
+
+        # get data
+        res = await self._fetch_data_time_series('time-series/article-metrics', query_args)
+
+        return ArticleMetricsResponse(res, query_args)
+
+    async def get_price_metrics(self,
+                                symbol: str,
+                                timeframe: str = '5m',
+                                filter: Tuple[str, ...] = ('close',),
+                                start: str = None,
+                                end: str = None) -> PriceMetricsResponse:
+        """
+        Queries StockGeist's API and gets price metrics data. See
+        :meth:`stockgeist.client.StockGeistClient.get_price_metrics` for the description of the arguments.
+
+        :return: PriceMetricsResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        query_args.pop('self')
+
+        # get data
+        res = await self._fetch_data_time_series('time-series/price-metrics', query_args)
+
+        return PriceMetricsResponse(res, query_args)
+
+    async def get_topic_metrics(self,
+                                symbol: str,
+                                timeframe: str = '5m',
+                                filter: Tuple[str, ...] = ('words',),
+                                start: str = None,
+                                end: str = None) -> TopicMetricsResponse:
+        """
+        Queries StockGeist's API and gets topic metrics data. See
+        :meth:`stockgeist.client.StockGeistClient.get_topic_metrics` for the description of the arguments.
+
+        :return: TopicMetricsResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        query_args.pop('self')
+
+        # get data
+        res = await self._fetch_data_time_series('time-series/topic-metrics', query_args)
+
+        return TopicMetricsResponse(res, query_args)
+
+    async def get_ranking_metrics(self,
+                                  symbol: str = None,
+                                  timeframe: str = '5m',
+                                  filter: Tuple[str, ...] = ('symbols',),
+                                  start: str = None,
+                                  end: str = None,
+                                  by: str = 'total_count',
+                                  direction: str = 'descending',
+                                  top: int = 5) -> RankingMetricsResponse:
+        """
+        Queries StockGeist's API and gets ranking metrics data. See
+        :meth:`stockgeist.client.StockGeistClient.get_ranking_metrics` for the description of the arguments.
+
+        :return: RankingMetricsResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        query_args.pop('self')
+
+        # get data
+        res = await self._fetch_data_time_series('time-series/ranking-metrics', query_args)
+
+        return RankingMetricsResponse(res, query_args)
+
+    async def get_symbols(self) -> SymbolsResponse:
+        """
+        Queries StockGeist's API and gets all available symbols.
+
+        :return: SymbolsResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        query_args.pop('self')
+
+        # get data
+        res = await self._fetch_data_snapshot('snapshot/symbols', query_args)
+
+        return SymbolsResponse(res, query_args)
+
+    async def get_fundamentals(self,
+                               symbol: str = None,
+                               filter: Tuple[str, ...] = ('market_cap',)) -> FundamentalsResponse:
+        """
+        Queries StockGeist's API and gets fundamentals data. See
+        :meth:`stockgeist.client.StockGeistClient.get_fundamentals` for the description of the arguments.
+
+        :return: FundamentalsResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        query_args.pop('self')
+
+        # get data
+        res = await self._fetch_data_snapshot('snapshot/fundamentals', query_args)
+
+        return FundamentalsResponse(res, query_args)
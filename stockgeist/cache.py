@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class SnapshotCache:
+    """
+    In-process LRU cache of snapshot endpoint responses with a time-to-live configurable per endpoint.
+    """
+
+    # default time-to-live in seconds; credits change with every request, so they are not cached by default
+    default_ttl = {
+        'snapshot/symbols': 3600.,
+        'snapshot/fundamentals': 3600.,
+        'snapshot/credits': 0.,
+    }
+
+    def __init__(self, ttl: Dict[str, float] = None, max_size: int = 1024):
+        """
+        :param ttl: Time-to-live in seconds per endpoint name, e.g. ``{'snapshot/credits': 60}``. Overrides
+            ``default_ttl``. Endpoints with zero time-to-live are not cached.
+
+        :param max_size: Maximum number of cached queries. The least recently used ones are evicted first.
+        """
+        self._ttl = dict(self.default_ttl, **(ttl or {}))
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _endpoint_name(key: str) -> str:
+        return key.split('?')[0]
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """
+        Get cached data of a query.
+
+        :param key: Query key (query string without the token).
+
+        :return: Cached list of batches of data or None if the query is not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, key: str, res: List[Dict]) -> None:
+        """
+        Cache data of a query.
+
+        :param key: Query key (query string without the token).
+
+        :param res: list of batches of data returned by REST API.
+        """
+        ttl = self._ttl.get(self._endpoint_name(key), 0.)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, res)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint_name: str = None) -> None:
+        """
+        Remove cached data.
+
+        :param endpoint_name: Name of the endpoint whose data should be removed, e.g. ``snapshot/symbols``. All data
+            is removed if not given.
+        """
+        with self._lock:
+            if endpoint_name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if self._endpoint_name(key) == endpoint_name]:
+                    del self._entries[key]
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self._hits + self._misses
+        return self._hits / total if total else 0.
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):  # pragma: no cover
+        return f'<snapshot cache>\n' \
+               f'  entries: {len(self._entries)}\n' \
+               f'  hit rate: {self.hit_rate:.2%} ({self._hits} hits, {self._misses} misses)'
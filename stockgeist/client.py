@@ -1,27 +1,117 @@
-from typing import Tuple, Dict, List
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Tuple, Dict, List, Optional, Iterable, Iterator, Callable, Union
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
-from stockgeist.responses import ArticleMetricsResponse, MessageMetricsResponse, PriceMetricsResponse, \
-    RankingMetricsResponse, TopicMetricsResponse, SymbolsResponse, FundamentalsResponse
+from stockgeist.cache import SnapshotCache
+from stockgeist.decoding import Decoder, get_decoder
+from stockgeist.hooks import ClientStats, Hooks
+from stockgeist.live import Subscription
+from stockgeist.planning import QueryPlan
+from stockgeist.responses import _Response, ArticleMetricsResponse, MessageMetricsResponse, PriceMetricsResponse, \
+    RankingMetricsResponse, TopicMetricsResponse, SymbolsResponse, FundamentalsResponse, PanelResponse, \
+    _join_time_series
+from stockgeist.scheduler import RequestScheduler
+from stockgeist.store import TimeSeriesStore
+from stockgeist.trading_calendar import NYSECalendar, nyse
+from stockgeist.transport import CassetteTransport
 
+logger = logging.getLogger()
 
-class StockGeistClient:
+
+def _accept_encoding() -> str:
     """
-    A Client class responsible for communication with StockGeist's API.
+    Get the content encodings which can be decoded in this environment. Brotli requires ``brotli`` or ``brotlicffi``.
+    """
+    encodings = ['gzip', 'deflate']
+    for module in ['brotli', 'brotlicffi']:
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        encodings.append('br')
+        break
+
+    return ', '.join(encodings)
+
+
+class _BaseClient:
+    """
+    Base class holding the query-building and pagination logic shared by the synchronous and asynchronous clients.
     """
 
-    def __init__(self, token):
+    # maximum number of bars returned by REST API in a single page
+    page_size = 50
+    # status code of pages of requests which got no response, e.g. after a timeout or a dropped connection
+    network_error_status = 599
+
+    def __init__(self, token, scheduler: RequestScheduler = None):
         self._token = token
-        self._session = requests.Session()
         self._base_url = 'https://api.stockgeist.ai/'
+        self._scheduler = scheduler if scheduler is not None else RequestScheduler()
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        return self._scheduler
 
     def _gen(self):
         while True:
             yield
 
+    @staticmethod
+    def _error_page(status_code: int, message: str) -> Dict:
+        """
+        Helper function for constructing a page describing a failed request whose response isn't valid JSON, e.g.
+        an error page of a proxy.
+
+        :param status_code: HTTP status code of the response.
+
+        :param message: Error message.
+
+        :return: Page in the layout of REST API pages.
+        """
+
+        metadata = {'status_code': status_code, 'message': message, 'credits': None, 'server_timestamp': None}
+
+        return {'metadata': metadata, 'body': []}
+
+    def _invalid_page(self, status_code: int, n_bytes: int) -> Dict:
+        """
+        Helper function for constructing a page of a response which can't be decoded. A successful response with
+        an invalid body was most likely truncated or garbled in transit, so it's reported as a network error and
+        retried instead of being taken for an empty page, which would end paging with incomplete data.
+
+        :param status_code: HTTP status code of the response.
+
+        :param n_bytes: Size of the response body.
+
+        :return: Page in the layout of REST API pages.
+        """
+
+        message = f'Invalid response (HTTP {status_code}, {n_bytes} bytes)'
+        logger.warning(f'{message} can\'t be decoded.')
+
+        return self._error_page(self.network_error_status if status_code == 200 else status_code, message)
+
+    def _refused_page(self) -> Dict:
+        """
+        Helper function for constructing a page of a request which wasn't sent because the credit balance is below
+        the reserve. The page fails like any other, so fetching stops and keeps the pages collected so far.
+
+        :return: Page in the layout of REST API pages.
+        """
+
+        message = f'Credit balance ({self._scheduler.credits}) is below the reserve ({self._scheduler.credit_reserve})'
+        logger.warning(f'{message}, no more requests are sent.')
+
+        return self._error_page(402, message)
+
     def _construct_query(self, endpoint_name: str, query_args: Dict[str, object]) -> str:
         """
         Helper function for constructing API query.
@@ -34,20 +124,455 @@ class StockGeistClient:
         """
 
         # construct query
-        query = f'{self._base_url}{endpoint_name}?token={self._token}&'
+        query = f'{self._base_url}{endpoint_name}?token={self._token}&{self._encode_args(query_args)}'
+        query = query.strip('&')
+
+        return query
+
+    def _query_key(self, endpoint_name: str, query_args: Dict[str, object]) -> str:
+        """
+        Helper function for constructing a key identifying API query. Unlike the query itself, the key doesn't
+        contain the token.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: Query key string.
+        """
+
+        return f'{endpoint_name}?{self._encode_args(query_args)}'
+
+    @staticmethod
+    def _encode_args(query_args: Dict[str, object]) -> str:
+        """
+        Encode query arguments into the query string format of REST API.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: Encoded arguments.
+        """
+
+        encoded = ''
         for name, value in query_args.items():
             if value is not None:
                 if isinstance(value, tuple):
-                    query += f'{name}={",".join(value)}&'
+                    encoded += f'{name}={",".join(value)}&'
                 else:
-                    query += f'{name}={value}&'
-        query = query.strip('&')
+                    encoded += f'{name}={value}&'
 
-        return query
+        return encoded.strip('&')
+
+    @staticmethod
+    def _next_page_end(endpoint_name: str, query_args: Dict, res_batch: Dict) -> Optional[str]:
+        """
+        Find the ``end`` argument of the next (older) page of a paginated time series query.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API for the current page.
+
+        :param res_batch: Page returned by REST API for the current query.
+
+        :return: ``end`` argument of the next page or None if the whole data range is fetched.
+        """
+
+        if endpoint_name == 'time-series/price-metrics':
+            try:
+                # some data returned
+                first_timestamp = pd.Timestamp(res_batch['body'][0]['timestamp'])
+            except IndexError:
+                # data not returned - might have encountered market holiday, weekend or non-market hours
+                first_timestamp = pd.Timestamp(query_args['end']).replace(hour=23, minute=0,
+                                                                          second=0) - pd.Timedelta(
+                    days=1)
+
+            if query_args['start'] is not None:
+                # check whether all data range is fetched
+                if first_timestamp.strftime('%Y-%m-%dT%H:%M:%S') <= query_args['start']:
+                    return None
+                else:
+                    return first_timestamp.strftime('%Y-%m-%dT%H:%M:%S')
+            else:
+                return None
+        else:
+            if len(res_batch['body']) == 0:
+                # no data in the requested range
+                return None
+
+            first_timestamp = pd.Timestamp(res_batch['body'][0]['timestamp']).strftime('%Y-%m-%dT%H:%M:%S')
+
+            if query_args['start'] is not None:
+                # check whether all data range is fetched
+                if first_timestamp <= query_args['start']:
+                    return None
+                else:
+                    return first_timestamp
+            else:
+                return None
+
+    def _split_range(self, query_args: Dict) -> List[Dict]:
+        """
+        Split the requested time range into independent windows, each of which is covered by a single page of
+        REST API.
+
+        :param query_args: Dict containing all arguments passed to REST API. Both ``start`` and ``end`` have to be
+            set, otherwise the range can't be split and a single window is returned.
+
+        :return: list of query arguments of all windows, ordered from the latest window to the earliest one.
+        """
+
+        if query_args['start'] is None or query_args['end'] is None:
+            return [dict(query_args)]
+
+        start = pd.Timestamp(query_args['start'])
+        end = pd.Timestamp(query_args['end'])
+        step = pd.Timedelta(query_args['timeframe']) * self.page_size
+
+        windows = []
+        while end > start:
+            window_start = max(start, end - step)
+            windows.append(dict(query_args,
+                                start=window_start.strftime('%Y-%m-%dT%H:%M:%S'),
+                                end=end.strftime('%Y-%m-%dT%H:%M:%S')))
+            end = window_start
+
+        return windows
+
+
+class StockGeistClient(_BaseClient):
+    """
+    A Client class responsible for communication with StockGeist's API.
+    """
+
+    # credits consumed by a row of time series data of an endpoint (at 5m timeframe), as observed on REST API
+    credit_costs = {'message-metrics': 3, 'article-metrics': 5, 'price-metrics': 1, 'topic-metrics': 5,
+                    'ranking-metrics': 3}
+    # multipliers of the cost of a row at coarser timeframes; 1d is assumed to cost the same as 1h
+    timeframe_credit_multipliers = {'5m': 1, '1h': 5, '1d': 5}
+    # request latency in seconds assumed by query plans before any request of the endpoint is made
+    default_latency = 0.5
+
+    def __init__(self, token, max_workers: int = 1, store: Union[str, TimeSeriesStore] = None,
+                 snapshot_ttl: Dict[str, float] = None, rate_limit: float = None, max_retries: int = 3,
+                 credit_reserve: int = 0, pool_connections: int = 10, pool_maxsize: int = None,
+                 timeout: Union[float, Tuple[float, float]] = (10., 60.), http2: bool = False,
+                 json_decoder: Union[str, Decoder] = 'auto', coalesce: bool = True, hooks: List[Hooks] = None,
+                 progress: Union[bool, Callable] = True, transport: CassetteTransport = None,
+                 calendar: Union[bool, NYSECalendar] = True):
+        """
+        :param token: StockGeist's REST API token.
+
+        :param max_workers: Number of threads used to fetch pages of a single time series query. If larger than 1
+            and ``start`` of the query is given, the pages planned upfront are fetched concurrently.
+
+        :param store: Local time series store (or path of its root directory) used as a persistent cache. Queries
+            with ``start``, ``end`` and ``filter`` set download only the time ranges missing in the store.
+
+        :param snapshot_ttl: Time-to-live in seconds of cached snapshot endpoint data per endpoint name, e.g.
+            ``{'snapshot/symbols': 86400, 'snapshot/credits': 60}``. See ``SnapshotCache.default_ttl`` for defaults.
+
+        :param rate_limit: Maximum number of requests per second. Not limited by default.
+
+        :param max_retries: Maximum number of retries of a page which failed with a transient error (429 or 5xx).
+            Retries are delayed with exponential backoff.
+
+        :param credit_reserve: Number of credits which must remain on the balance. Once the balance reported by REST
+            API drops below it, no more requests are sent and fetching stops with the pages collected so far.
+
+        :param pool_connections: Number of connection pools (one per host) kept by the HTTP session.
+
+        :param pool_maxsize: Maximum number of kept-alive connections per host. Defaults to the larger of 10 and
+            ``max_workers``, so that concurrent fetching reuses connections instead of opening new ones.
+
+        :param timeout: Timeout of a request in seconds, either a single number or a (connect, read) tuple.
+
+        :param http2: Whether to multiplex requests over HTTP/2 connections. Requires ``httpx`` with HTTP/2 support.
+
+        :param json_decoder: Decoder of raw response bytes: orjson, msgspec, json or a function returning the decoded
+            page. By default the fastest installed library is used.
+
+        :param coalesce: Whether identical queries made concurrently from several threads should share a single
+            fetch. The callers then receive the same list of pages.
+
+        :param hooks: Instrumentation hooks called on requests, retries and conversions, see
+            :class:`stockgeist.hooks.Hooks`. Aggregate statistics are always collected in ``stats``.
+
+        :param progress: Whether to show tqdm progress bars, or a function with the signature of ``tqdm`` (taking
+            an iterable and ``total``) creating a replacement progress bar.
+
+        :param transport: Transport recording responses of REST API to a cassette or replaying them offline, see
+            :class:`stockgeist.transport.CassetteTransport`.
+
+        :param calendar: Trading calendar used to plan pages of price metrics queries with ``start`` set, so that
+            no requests are spent on weekends, holidays and non-market hours. ``True`` uses the NYSE calendar,
+            ``False`` pages backwards through the whole time range.
+        """
+        super().__init__(token, RequestScheduler(rate_limit, max_retries=max_retries, credit_reserve=credit_reserve))
+        pool_maxsize = pool_maxsize if pool_maxsize is not None else max(10, max_workers)
+        self._session, self._request_kwargs = self._create_session(pool_connections, pool_maxsize, timeout, http2)
+        self._network_errors = self._get_network_errors(http2)
+        if transport is not None:
+            self._session = transport.mount(self._session)
+        self._decode = get_decoder(json_decoder)
+        self._coalesce_enabled = coalesce
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self._stats = ClientStats()
+        self._hooks = [self._stats] + list(hooks or [])
+        self._progress_bar = progress
+        self._local = threading.local()
+        self._call_lock = threading.Lock()
+        self._max_workers = max_workers
+        self._calendar = nyse if calendar is True else calendar or None
+        self._store = TimeSeriesStore(store) if isinstance(store, str) else store
+        self._snapshot_cache = SnapshotCache(snapshot_ttl)
+
+    @property
+    def snapshot_cache(self) -> SnapshotCache:
+        return self._snapshot_cache
+
+    @property
+    def stats(self) -> ClientStats:
+        return self._stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session.
+        """
+        self._session.close()
+
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int, timeout: Union[float, Tuple[float, float]],
+                        http2: bool) -> Tuple[object, Dict]:
+        """
+        Create HTTP session keeping connections alive and asking for compressed responses.
+
+        :return: Tuple of the session and keyword arguments passed with every request.
+        """
+        headers = {'Accept-Encoding': _accept_encoding()}
+
+        if http2:
+            try:
+                import httpx
+            except ImportError:
+                raise Exception('HTTP/2 transport requires httpx! Install it with `pip install httpx[http2]`.')
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+            session = httpx.Client(http2=True, limits=limits, headers=headers,
+                                   timeout=httpx.Timeout(read, connect=connect))
+            return session, {}
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(headers)
+
+        return session, {'timeout': timeout}
+
+    @staticmethod
+    def _get_network_errors(http2: bool) -> Tuple[type, ...]:
+        """
+        Get exceptions raised by the HTTP session when no (complete) response is received.
+
+        :return: Tuple of exception classes.
+        """
+        errors = (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                  requests.exceptions.ChunkedEncodingError)
+        if http2:
+            import httpx
+            errors += (httpx.TransportError,)
+
+        return errors
+
+    def _emit(self, event: str, *args) -> None:
+        """
+        Call an event method of all hooks. Errors raised by hooks are logged and don't interrupt fetching.
+
+        :param event: Name of the method, e.g. ``on_request_end``.
+
+        :param args: Arguments of the method.
+        """
+        for hook in self._hooks:
+            try:
+                getattr(hook, event)(*args)
+            except Exception as e:
+                logger.warning(f'Hook {type(hook).__name__}.{event} failed: {e}')
+
+    def _progress(self, iterable: Iterable, total: int = None) -> Iterable:
+        """
+        Wrap an iterable in the configured progress bar.
+        """
+        if self._progress_bar is True:
+            return tqdm(iterable, total=total)
+        if callable(self._progress_bar):
+            return self._progress_bar(iterable, total=total)
+        return iterable
+
+    def _get_page(self, endpoint_name: str, query_args: Dict) -> Dict:
+        """
+        Query REST API respecting the rate limit and retry transient errors.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: Decoded page returned by REST API.
+        """
+
+        # construct query
+        query = self._construct_query(endpoint_name, query_args)
+        key = self._query_key(endpoint_name, query_args)
+        call = getattr(self._local, 'call', None)
+
+        attempt = 0
+        while True:
+            delay = self._scheduler.reserve()
+            if delay is None:
+                return self._refused_page()
+            if delay > 0:
+                time.sleep(delay)
+
+            # query endpoint
+            self._emit('on_request_start', endpoint_name, key)
+            started = time.perf_counter()
+            try:
+                response = self._session.get(query, **self._request_kwargs)
+                content, headers = response.content, response.headers
+            except self._network_errors as e:
+                # timeouts and dropped connections are retried like transient errors of REST API
+                content, headers = b'', {}
+                page = self._error_page(self.network_error_status, f'Network error ({type(e).__name__}: {e})')
+                decoding_started = time.perf_counter()
+            else:
+                decoding_started = time.perf_counter()
+                try:
+                    page = self._decode(content)
+                except ValueError:
+                    page = self._invalid_page(response.status_code, len(content))
+            finished = time.perf_counter()
+            spent = self._scheduler.update(page['metadata'])
+
+            status_code = page['metadata']['status_code']
+            n_rows = len(page['body']) if isinstance(page['body'], list) else 1
+            self._emit('on_page_decoded', endpoint_name, n_rows, finished - decoding_started)
+            self._emit('on_request_end', endpoint_name, status_code, finished - started, len(content))
+            if call is not None:
+                # pages of a call may be fetched by several worker threads
+                with self._call_lock:
+                    call['requests'] += 1
+                    call['bytes'] += len(content)
+                    call['credits'] = call['credits'] + spent if call['credits'] is not None and spent is not None \
+                        else None
+
+            # retry transient errors
+            delay = self._scheduler.retry_delay(status_code, attempt, headers.get('Retry-After'))
+            if delay is None:
+                return page
+            logger.warning(f'Request failed with status code {status_code}, retrying in {delay:.1f} s.')
+            self._emit('on_retry', endpoint_name, status_code, attempt + 1, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _track_call(self, endpoint_name: str, fetch: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        Run a fetch of all pages of a query and report its statistics to hooks.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param fetch: Function fetching the data.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        # credits are summed from the credits spent by every request of the call, so that calls running at the
+        # same time don't count each other's requests
+        call = {'requests': 0, 'bytes': 0, 'credits': 0, 'shared': False}
+        outer_call = getattr(self._local, 'call', None)
+        self._local.call = call
+        started = time.perf_counter()
+        try:
+            res = fetch()
+        finally:
+            self._local.call = outer_call
+
+        stats = dict(call, latency=time.perf_counter() - started, pages=len(res),
+                     rows=sum(len(page['body']) if isinstance(page['body'], list) else 1 for page in res))
+        self._emit('on_call_end', endpoint_name, stats)
+
+        return res
+
+    def _convert(self, response_class: type, res: List[Dict], query_args: Dict) -> _Response:
+        """
+        Convert fetched pages to a response object and report the conversion time to hooks.
+
+        :param response_class: Class of the response.
+
+        :param res: list of batches of data returned by REST API.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: Response object.
+        """
+
+        started = time.perf_counter()
+        response = response_class(res, query_args)
+        self._emit('on_conversion_done', response_class.__name__, len(response._data_dict.get('timestamp', [])),
+                   time.perf_counter() - started)
+
+        return response
+
+    def _coalesce(self, key: str, fetch: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        Run a fetch unless an identical one is already in flight, in which case wait for its result instead.
+
+        :param key: Query key (query string without the token).
+
+        :param fetch: Function fetching the data.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        if not self._coalesce_enabled:
+            return fetch()
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                leader = False
+            else:
+                leader = True
+                future = self._in_flight[key] = Future()
+
+        if not leader:
+            # the pages and credits are reported by the call which fetched them
+            call = getattr(self._local, 'call', None)
+            if call is not None:
+                call['shared'] = True
+            return future.result()
+
+        try:
+            res = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+        future.set_result(res)
+
+        return res
 
     def _fetch_data_time_series(self, endpoint_name: str, query_args: Dict) -> List[Dict]:
         """
-        Fetch data from time series endpoints of REST API.
+        Fetch data from time series endpoints of REST API. Identical queries made concurrently share a single fetch.
 
         :param endpoint_name: Name of the StockGeist's REST API endpoint.
 
@@ -56,50 +581,243 @@ class StockGeistClient:
         :return: list of batches of data returned by REST API.
         """
 
-        res = []
-        for _ in tqdm(self._gen()):
-            # construct query
-            query = self._construct_query(endpoint_name, query_args)
+        key = self._query_key(endpoint_name, query_args)
+
+        def fetch():
+            return self._coalesce(key, lambda: self._fetch_stored(endpoint_name, query_args))
+
+        return self._track_call(endpoint_name, fetch)
+
+    def _fetch_stored(self, endpoint_name: str, query_args: Dict) -> List[Dict]:
+        """
+        Fetch data from time series endpoints of REST API, downloading only the ranges missing in the local store
+        if it's used.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        if self._store is None or query_args['start'] is None or query_args['end'] is None \
+                or not query_args.get('filter'):
+            return self._fetch_range(endpoint_name, query_args)
+
+        # download only the ranges missing in the local store
+        metadata = None
+        for start, end in self._store.missing_ranges(endpoint_name, query_args):
+            range_args = dict(query_args, start=start, end=end)
+            res = self._fetch_range(endpoint_name, range_args)
+            if res[-1]['metadata']['status_code'] != 200:
+                return res
+            self._store.write(endpoint_name, range_args, res)
+            metadata = metadata or res[0]['metadata']
+
+        res = self._store.read(endpoint_name, query_args)
+        if metadata is not None:
+            res[0]['metadata'] = metadata
+
+        return res
+
+    def _fetch_range(self, endpoint_name: str, query_args: Dict) -> List[Dict]:
+        """
+        Fetch all pages of the time range of a query from REST API. Queries with known ``start`` are planned upfront,
+        others are paged backwards from ``end``.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
 
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        windows = self._plan_windows(endpoint_name, query_args)
+        if windows:
+            # every planned window is covered by a single page
+            return self._fetch_windows(endpoint_name, windows, lambda: [None])
+
+        if self._max_workers <= 1:
+            return self._fetch_window(endpoint_name, query_args, self._progress(self._gen()))
+
+        return self._fetch_windows(endpoint_name, self._split_range(self._with_end(query_args)), self._gen)
+
+    def _fetch_windows(self, endpoint_name: str, windows: List[Dict], pages: Callable[[], Iterable]) -> List[Dict]:
+        """
+        Fetch independent time windows of a query, concurrently if ``max_workers`` is larger than 1, and stitch
+        their pages together. Fetching stops at the first failed window.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param windows: list of query arguments of all windows, ordered from the latest window to the earliest one.
+
+        :param pages: Function creating the iterable driving the paging loop of a window.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        call = getattr(self._local, 'call', None)
+
+        def fetch_window(window):
+            # report requests of the worker threads to the statistics of the calling thread
+            self._local.call = call
+            return self._fetch_window(endpoint_name, window, pages())
+
+        def stitch(batches):
+            # stitch pages from the latest window to the earliest one
+            res = []
+            for batch in self._progress(batches, total=len(windows)):
+                if batch[-1]['metadata']['status_code'] != 200:
+                    # keep the same semantics as serial fetching - stop at the first failed page
+                    if res and len(batch) == 1:
+                        logger.warning(f'Fetching of {endpoint_name} stopped after {len(res)} pages: '
+                                       f'{batch[-1]["metadata"]["message"]}. The data is incomplete.')
+                    res.extend(batch)
+                    break
+                res.extend(batch)
+            return res
+
+        if self._max_workers <= 1:
+            # windows are fetched lazily, so nothing is requested after a failure
+            return stitch(map(fetch_window, windows))
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            return stitch(executor.map(fetch_window, windows))
+
+    def _plan_windows(self, endpoint_name: str, query_args: Dict) -> Optional[List[Dict]]:
+        """
+        Plan the pages of a time series query with known ``start``, so that every window is covered by a single page.
+        Windows of price metrics are planned with the trading calendar, so that no page covers only periods when the
+        market is closed.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: list of query arguments of all windows, ordered from the latest window to the earliest one, or None
+            if the query can't be planned. The list is empty if there is no data in the whole time range.
+        """
+
+        if query_args['start'] is None:
+            return None
+
+        query_args = self._with_end(query_args)
+        if endpoint_name == 'time-series/price-metrics':
+            if self._calendar is None:
+                return None
+            windows = self._calendar.plan_windows(query_args['start'], query_args['end'], query_args['timeframe'],
+                                                  self.page_size)
+            return [dict(query_args, start=start, end=end) for start, end in windows]
+
+        return self._split_range(query_args)
+
+    def _fetch_window(self, endpoint_name: str, query_args: Dict, pages: Iterable) -> List[Dict]:
+        """
+        Fetch all pages of a single time window by stepping backwards from its ``end``.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :param pages: Endless iterable driving the paging loop, e.g. a progress bar.
+
+        :return: list of batches of data returned by REST API.
+        """
+
+        return list(self._iter_window(endpoint_name, query_args, pages))
+
+    def _iter_window(self, endpoint_name: str, query_args: Dict, pages: Iterable) -> Iterator[Dict]:
+        """
+        Fetch pages of a single time window one by one, stepping backwards from its ``end``. Fetching stops after
+        the first failed page.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :param pages: Endless iterable driving the paging loop, e.g. a progress bar.
+
+        :return: generator of batches of data returned by REST API.
+        """
+
+        query_args = dict(query_args)
+        for i, _ in enumerate(pages):
             # query endpoint
-            res_batch = self._session.get(query).json()
-            res.append(res_batch)
+            res_batch = self._get_page(endpoint_name, query_args)
+            yield res_batch
 
             # check response
             if res_batch['metadata']['status_code'] != 200:
-                return res
+                if i > 0:
+                    logger.warning(f'Fetching of {endpoint_name} stopped after {i} pages before '
+                                   f'{query_args["end"]}: {res_batch["metadata"]["message"]}. The data is incomplete.')
+                return
+
+            # move to the previous page
+            end = self._next_page_end(endpoint_name, query_args, res_batch)
+            if end is None:
+                break
+            query_args['end'] = end
+
+    @staticmethod
+    def _with_end(query_args: Dict) -> Dict:
+        """
+        Set ``end`` of a query with known ``start`` and open end to the end of the current bar, as nothing exists
+        after it.
 
-            if endpoint_name == 'time-series/price-metrics':
-                try:
-                    # some data returned
-                    first_timestamp = pd.Timestamp(res_batch['body'][0]['timestamp'])
-                except IndexError:
-                    # data not returned - might have encountered market holiday, weekend or non-market hours
-                    first_timestamp = pd.Timestamp(query_args['end']).replace(hour=23, minute=0,
-                                                                              second=0) - pd.Timedelta(
-                        days=1)
-
-                if query_args['start'] is not None:
-                    # check whether all data range is fetched
-                    if first_timestamp.strftime('%Y-%m-%dT%H:%M:%S') <= query_args['start']:
-                        break
-                    else:
-                        query_args['end'] = first_timestamp.strftime('%Y-%m-%dT%H:%M:%S')
-                else:
-                    break
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: Query arguments with ``end`` set.
+        """
+
+        if query_args['end'] is None and query_args['start'] is not None:
+            timeframe = pd.Timedelta(query_args['timeframe'])
+            query_args = dict(query_args, end=pd.Timestamp.now(tz='UTC').ceil(timeframe).strftime('%Y-%m-%dT%H:%M:%S'))
+
+        return query_args
+
+    def _iter_data_time_series(self, endpoint_name: str, query_args: Dict, chronological: bool,
+                               as_dataframe: bool) -> Iterator[Union[Dict, pd.DataFrame]]:
+        """
+        Fetch data from time series endpoints of REST API page by page and yield every page converted to columns.
+        Only a single page (or, in chronological order, a single window of pages) is held in memory at a time.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :param chronological: Whether to yield the earliest data first. Requires ``start`` to be set.
+
+        :param as_dataframe: Whether to yield pandas DataFrames instead of dicts of columns.
+
+        :return: generator of chunks of data.
+        """
+
+        if chronological and query_args['start'] is None:
+            raise Exception('Chronological streaming requires start of the time range!')
+
+        def pages():
+            if chronological:
+                # walk the windows from the earliest one, pages of a window are fetched backwards
+                windows = self._plan_windows(endpoint_name, query_args)
+                if windows:
+                    for window in windows[::-1]:
+                        yield from self._fetch_window(endpoint_name, window, [None])
+                    return
+                for window in self._split_range(self._with_end(query_args))[::-1]:
+                    yield from self._fetch_window(endpoint_name, window, self._gen())[::-1]
             else:
-                first_timestamp = pd.Timestamp(res_batch['body'][0]['timestamp']).strftime('%Y-%m-%dT%H:%M:%S')
-
-                if query_args['start'] is not None:
-                    # check whether all data range is fetched
-                    if first_timestamp == query_args['start']:
-                        break
-                    else:
-                        query_args['end'] = first_timestamp
-                else:
-                    break
+                yield from self._iter_window(endpoint_name, query_args, self._gen())
 
-        return res
+        def chunks():
+            for page in pages():
+                if page['metadata']['status_code'] != 200:
+                    raise Exception(page['metadata']['message'])
+                if len(page['body']) != 0:
+                    chunk = _Response([page])
+                    yield chunk.as_dataframe if as_dataframe else chunk.as_dict
+
+        return chunks()
 
     def _fetch_data_snapshot(self, endpoint_name: str, query_args: Dict) -> List[Dict]:
         """
@@ -112,13 +830,21 @@ class StockGeistClient:
         :return: list of batches of data returned by REST API.
         """
 
-        # construct query
-        query = self._construct_query(endpoint_name, query_args)
+        # check cache
+        key = self._query_key(endpoint_name, query_args)
+        res = self._snapshot_cache.get(key)
+        if res is not None:
+            return res
 
         # query endpoint
-        res = self._session.get(query).json()
+        def fetch():
+            return self._coalesce(key, lambda: [self._get_page(endpoint_name, query_args)])
 
-        return [res]
+        res = self._track_call(endpoint_name, fetch)
+        if res[0]['metadata']['status_code'] == 200:
+            self._snapshot_cache.put(key, res)
+
+        return res
 
     def get_credits(self):
         """
@@ -165,7 +891,7 @@ class StockGeistClient:
         # get data
         res = self._fetch_data_time_series('time-series/message-metrics', query_args)
 
-        return MessageMetricsResponse(res, query_args)
+        return self._convert(MessageMetricsResponse, res, query_args)
 
     def get_article_metrics(self,
                             symbol: str,
@@ -199,7 +925,7 @@ class StockGeistClient:
         # get data
         res = self._fetch_data_time_series('time-series/article-metrics', query_args)
 
-        return ArticleMetricsResponse(res, query_args)
+        return self._convert(ArticleMetricsResponse, res, query_args)
 
     def get_price_metrics(self,
                           symbol: str,
@@ -233,7 +959,7 @@ class StockGeistClient:
         # get data
         res = self._fetch_data_time_series('time-series/price-metrics', query_args)
 
-        return PriceMetricsResponse(res, query_args)
+        return self._convert(PriceMetricsResponse, res, query_args)
 
     def get_topic_metrics(self,
                           symbol: str,
@@ -267,7 +993,7 @@ class StockGeistClient:
         # get data
         res = self._fetch_data_time_series('time-series/topic-metrics', query_args)
 
-        return TopicMetricsResponse(res, query_args)
+        return self._convert(TopicMetricsResponse, res, query_args)
 
     def get_ranking_metrics(self,
                             symbol: str = None,
@@ -314,7 +1040,7 @@ class StockGeistClient:
         # get data
         res = self._fetch_data_time_series('time-series/ranking-metrics', query_args)
 
-        return RankingMetricsResponse(res, query_args)
+        return self._convert(RankingMetricsResponse, res, query_args)
 
     def get_symbols(self) -> SymbolsResponse:
         """
@@ -330,7 +1056,7 @@ class StockGeistClient:
         # get data
         res = self._fetch_data_snapshot('snapshot/symbols', query_args)
 
-        return SymbolsResponse(res, query_args)
+        return self._convert(SymbolsResponse, res, query_args)
 
     def get_fundamentals(self,
                          symbol: str = None,
@@ -362,4 +1088,511 @@ class StockGeistClient:
         # get data
         res = self._fetch_data_snapshot('snapshot/fundamentals', query_args)
 
-        return FundamentalsResponse(res, query_args)
+        return self._convert(FundamentalsResponse, res, query_args)
+
+    def iter_message_metrics(self,
+                             symbol: str,
+                             timeframe: str = '5m',
+                             filter: Tuple[str, ...] = ('total_count',),
+                             start: str = None,
+                             end: str = None,
+                             chronological: bool = False,
+                             as_dataframe: bool = False) -> Iterator[Union[Dict, pd.DataFrame]]:
+        """
+        Queries StockGeist's API and streams message metrics data page by page, so that long time ranges can be
+        processed without holding the whole response in memory. Local time series store is not used.
+
+        :param chronological: Whether to yield the earliest data first. Requires ``start`` to be set. By default
+            the latest data is yielded first, in the order the pages are served by REST API.
+
+        :param as_dataframe: Whether to yield pandas DataFrames instead of dicts of columns.
+
+        See :meth:`get_message_metrics` for the description of the other arguments.
+
+        :return: generator of chunks of data, rows within a chunk are sorted by time.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'chronological', 'as_dataframe']:
+            query_args.pop(name)
+
+        return self._iter_data_time_series('time-series/message-metrics', query_args, chronological, as_dataframe)
+
+    def iter_article_metrics(self,
+                             symbol: str,
+                             timeframe: str = '5m',
+                             filter: Tuple[str, ...] = ('titles',),
+                             start: str = None,
+                             end: str = None,
+                             chronological: bool = False,
+                             as_dataframe: bool = False) -> Iterator[Union[Dict, pd.DataFrame]]:
+        """
+        Queries StockGeist's API and streams article metrics data page by page, so that long time ranges can be
+        processed without holding the whole response in memory. Local time series store is not used.
+
+        :param chronological: Whether to yield the earliest data first. Requires ``start`` to be set. By default
+            the latest data is yielded first, in the order the pages are served by REST API.
+
+        :param as_dataframe: Whether to yield pandas DataFrames instead of dicts of columns.
+
+        See :meth:`get_article_metrics` for the description of the other arguments.
+
+        :return: generator of chunks of data, rows within a chunk are sorted by time.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'chronological', 'as_dataframe']:
+            query_args.pop(name)
+
+        return self._iter_data_time_series('time-series/article-metrics', query_args, chronological, as_dataframe)
+
+    def iter_price_metrics(self,
+                           symbol: str,
+                           timeframe: str = '5m',
+                           filter: Tuple[str, ...] = ('close',),
+                           start: str = None,
+                           end: str = None,
+                           chronological: bool = False,
+                           as_dataframe: bool = False) -> Iterator[Union[Dict, pd.DataFrame]]:
+        """
+        Queries StockGeist's API and streams price metrics data page by page, so that long time ranges can be
+        processed without holding the whole response in memory. Local time series store is not used.
+
+        :param chronological: Whether to yield the earliest data first. Requires ``start`` to be set. By default
+            the latest data is yielded first, in the order the pages are served by REST API.
+
+        :param as_dataframe: Whether to yield pandas DataFrames instead of dicts of columns.
+
+        See :meth:`get_price_metrics` for the description of the other arguments.
+
+        :return: generator of chunks of data, rows within a chunk are sorted by time.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'chronological', 'as_dataframe']:
+            query_args.pop(name)
+
+        return self._iter_data_time_series('time-series/price-metrics', query_args, chronological, as_dataframe)
+
+    def iter_topic_metrics(self,
+                           symbol: str,
+                           timeframe: str = '5m',
+                           filter: Tuple[str, ...] = ('words',),
+                           start: str = None,
+                           end: str = None,
+                           chronological: bool = False,
+                           as_dataframe: bool = False) -> Iterator[Union[Dict, pd.DataFrame]]:
+        """
+        Queries StockGeist's API and streams topic metrics data page by page, so that long time ranges can be
+        processed without holding the whole response in memory. Local time series store is not used.
+
+        :param chronological: Whether to yield the earliest data first. Requires ``start`` to be set. By default
+            the latest data is yielded first, in the order the pages are served by REST API.
+
+        :param as_dataframe: Whether to yield pandas DataFrames instead of dicts of columns.
+
+        See :meth:`get_topic_metrics` for the description of the other arguments.
+
+        :return: generator of chunks of data, rows within a chunk are sorted by time.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'chronological', 'as_dataframe']:
+            query_args.pop(name)
+
+        return self._iter_data_time_series('time-series/topic-metrics', query_args, chronological, as_dataframe)
+
+    def iter_ranking_metrics(self,
+                             symbol: str = None,
+                             timeframe: str = '5m',
+                             filter: Tuple[str, ...] = ('symbols',),
+                             start: str = None,
+                             end: str = None,
+                             by: str = 'total_count',
+                             direction: str = 'descending',
+                             top: int = 5,
+                             chronological: bool = False,
+                             as_dataframe: bool = False) -> Iterator[Union[Dict, pd.DataFrame]]:
+        """
+        Queries StockGeist's API and streams ranking metrics data page by page, so that long time ranges can be
+        processed without holding the whole response in memory. Local time series store is not used.
+
+        :param chronological: Whether to yield the earliest data first. Requires ``start`` to be set. By default
+            the latest data is yielded first, in the order the pages are served by REST API.
+
+        :param as_dataframe: Whether to yield pandas DataFrames instead of dicts of columns.
+
+        See :meth:`get_ranking_metrics` for the description of the other arguments.
+
+        :return: generator of chunks of data, rows within a chunk are sorted by time.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'chronological', 'as_dataframe']:
+            query_args.pop(name)
+
+        return self._iter_data_time_series('time-series/ranking-metrics', query_args, chronological, as_dataframe)
+
+    def get_joined(self,
+                   symbol: str,
+                   timeframe: str = '5m',
+                   endpoints: Tuple[str, ...] = ('message-metrics', 'article-metrics', 'price-metrics'),
+                   start: str = None,
+                   end: str = None,
+                   filters: Dict[str, Tuple[str, ...]] = None,
+                   tolerance: str = None) -> pd.DataFrame:
+        """
+        Queries several time series endpoints of StockGeist's API for the same symbol concurrently and joins their
+        data on a shared bar grid. Price metrics exist only while the market is open, so every bar gets the latest
+        price bar at or before it (as-of join).
+
+        :param symbol: Stock ticker for which to retrieve data.
+
+        :param timeframe: Time resolution of returned data. Possible values are 5m, 1h, 1d.
+
+        :param endpoints: Endpoints to join: message-metrics, article-metrics, price-metrics, topic-metrics.
+
+        :param start: Timestamp of the earliest data point in returned time series. Time is assumed to be in
+            UTC time zone. Valid format: YYYY-mm-ddTHH:MM:SS.
+
+        :param end: Timestamp of the latest data point in returned time series. Time is assumed to be in
+            UTC time zone. Valid format: YYYY-mm-ddTHH:MM:SS.
+
+        :param filters: What metrics to return per endpoint, e.g. ``{'price-metrics': ('close', 'volume')}``.
+            Endpoints not given return the default metrics of their ``get_*`` methods.
+
+        :param tolerance: Maximum age of the price bar joined to a bar, e.g. ``1h``. Not limited if not given.
+
+        :return: pandas DataFrame indexed by UTC DatetimeIndex with (endpoint, metric) MultiIndex columns.
+        """
+
+        fetchers = {'message-metrics': self.get_message_metrics,
+                    'article-metrics': self.get_article_metrics,
+                    'price-metrics': self.get_price_metrics,
+                    'topic-metrics': self.get_topic_metrics}
+        if len(endpoints) == 0:
+            raise Exception('No endpoints to join!')
+        for endpoint in endpoints:
+            if endpoint not in fetchers:
+                raise Exception(f'Unknown endpoint: {endpoint}! Possible values are: {", ".join(fetchers)}.')
+        filters = filters or {}
+
+        def fetch(endpoint):
+            query_args = {'symbol': symbol, 'timeframe': timeframe, 'start': start, 'end': end}
+            if endpoint in filters:
+                query_args['filter'] = filters[endpoint]
+            return fetchers[endpoint](**query_args)
+
+        # fetch all endpoints at once - the latency is that of the slowest one
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            responses = dict(zip(endpoints, executor.map(fetch, endpoints)))
+
+        return _join_time_series(responses, tolerance)
+
+    def tail(self,
+             endpoint: str,
+             symbols: Union[str, List[str]] = None,
+             timeframe: str = '5m',
+             filter: Tuple[str, ...] = None,
+             maxlen: int = 1000,
+             callback: Callable = None,
+             delay: float = 10.,
+             **kwargs) -> Subscription:
+        """
+        Follows time series data of one or more symbols live, fetching only the bars that are new since the last
+        poll. Polling starts with ``Subscription.start()`` or is done manually with ``Subscription.poll()``.
+
+        :param endpoint: Time series endpoint: message-metrics, article-metrics, price-metrics, topic-metrics or
+            ranking-metrics.
+
+        :param symbols: Stock ticker or list of tickers to follow.
+
+        :param timeframe: Time resolution of data. Possible values are 5m, 1h, 1d.
+
+        :param filter: What metrics to fetch. All metrics are fetched if not given.
+
+        :param maxlen: Maximum number of latest bars kept in memory per symbol.
+
+        :param callback: Function called as ``callback(symbol, delta)`` with a dict of columns of every batch of
+            new rows. More callbacks can be registered with ``Subscription.on_update``.
+
+        :param delay: Number of seconds to wait after a bar boundary before polling.
+
+        :param kwargs: Other arguments passed to REST API, e.g. ``by``, ``direction`` and ``top`` of ranking
+            metrics.
+
+        :return: Subscription object.
+        """
+
+        endpoints = ['message-metrics', 'article-metrics', 'price-metrics', 'topic-metrics', 'ranking-metrics']
+        if endpoint not in endpoints:
+            raise Exception(f'Unknown endpoint: {endpoint}! Possible values are: {", ".join(endpoints)}.')
+
+        symbols = symbols if isinstance(symbols, list) else [symbols]
+        query_args = dict({'timeframe': timeframe, 'filter': filter}, **kwargs)
+        callbacks = [callback] if callback is not None else []
+
+        return Subscription(self, f'time-series/{endpoint}', symbols, query_args, maxlen, callbacks, delay)
+
+    def plan(self,
+             endpoint: str,
+             symbol: str = None,
+             timeframe: str = '5m',
+             filter: Tuple[str, ...] = None,
+             start: str = None,
+             end: str = None,
+             **kwargs) -> QueryPlan:
+        """
+        Plans the pages of a time series query without sending any request, e.g. to size a backfill against the
+        credit balance. The plan can be fetched with :meth:`execute`; ``get_*`` methods with ``start`` set fetch the
+        same pages, except for price metrics with the trading calendar disabled, which are paged backwards.
+
+        :param endpoint: Time series endpoint: message-metrics, article-metrics, price-metrics, topic-metrics or
+            ranking-metrics.
+
+        :param symbol: Stock ticker for which to retrieve data.
+
+        :param timeframe: Time resolution of data. Possible values are 5m, 1h, 1d.
+
+        :param filter: What metrics to fetch. All metrics are fetched if not given.
+
+        :param start: Timestamp of the earliest data point in returned time series. Required.
+
+        :param end: Timestamp of the latest data point in returned time series. Defaults to the current bar.
+
+        :param kwargs: Other arguments passed to REST API, e.g. ``by``, ``direction`` and ``top`` of ranking
+            metrics.
+
+        :return: QueryPlan object.
+        """
+
+        endpoints = list(self.credit_costs)
+        if endpoint not in endpoints:
+            raise Exception(f'Unknown endpoint: {endpoint}! Possible values are: {", ".join(endpoints)}.')
+        if start is None:
+            raise Exception('Planning requires start of the time range!')
+
+        endpoint_name = f'time-series/{endpoint}'
+        query_args = self._with_end(dict({'symbol': symbol, 'timeframe': timeframe, 'filter': filter, 'start': start,
+                                          'end': end}, **kwargs))
+        windows = self._plan_windows(endpoint_name, query_args)
+        if windows is None:
+            # pages of price metrics without the trading calendar are one bar of wall-clock time each at most
+            windows = self._split_range(query_args)
+
+        # expected rows
+        if endpoint_name == 'time-series/price-metrics' and self._calendar is not None:
+            rows = len(self._calendar.bars(query_args['start'], query_args['end'], timeframe))
+        else:
+            step = pd.Timedelta(timeframe)
+            rows = sum(-(-(pd.Timestamp(window['end']) - pd.Timestamp(window['start'])) // step) for window in windows)
+
+        # estimated credits
+        credits = rows * self.credit_costs[endpoint] * self.timeframe_credit_multipliers.get(timeframe, 1)
+
+        # estimated duration
+        if endpoint_name in self._stats.endpoints:
+            latency = self._stats.latency_percentiles(endpoint_name)['p50']
+        else:
+            latency = self.default_latency
+        eta = -(-len(windows) // max(self._max_workers, 1)) * latency
+        if self._scheduler.rate is not None:
+            eta = max(eta, len(windows) / self._scheduler.rate)
+
+        return QueryPlan(endpoint_name, query_args, windows, int(rows), int(credits), float(eta))
+
+    def execute(self, plan: QueryPlan) -> _Response:
+        """
+        Fetches the pages of a query plan, concurrently if ``max_workers`` is larger than 1.
+
+        :param plan: QueryPlan returned by :meth:`plan`.
+
+        :return: Response object of the endpoint, e.g. MessageMetricsResponse.
+        """
+
+        response_classes = {'time-series/message-metrics': MessageMetricsResponse,
+                            'time-series/article-metrics': ArticleMetricsResponse,
+                            'time-series/price-metrics': PriceMetricsResponse,
+                            'time-series/topic-metrics': TopicMetricsResponse,
+                            'time-series/ranking-metrics': RankingMetricsResponse}
+        endpoint_name = plan.endpoint_name
+
+        def fetch():
+            if not plan.windows:
+                # no data in the whole time range - a single request still reports the metadata
+                return self._fetch_window(endpoint_name, plan.query_args, [None])
+            return self._fetch_windows(endpoint_name, plan.windows, lambda: [None])
+
+        res = self._track_call(endpoint_name, fetch)
+
+        return self._convert(response_classes[endpoint_name], res, plan.query_args)
+
+    def _fetch_many(self, fetcher: Callable, symbols: List[str], query_args: Dict, max_workers: int) -> PanelResponse:
+        """
+        Run a single-symbol fetcher for many symbols concurrently.
+
+        :param fetcher: Client method fetching the data of a single symbol.
+
+        :param symbols: Stock tickers for which to retrieve data.
+
+        :param query_args: Dict containing all arguments passed to the fetcher except for the symbol.
+
+        :param max_workers: Maximum number of symbols fetched at the same time.
+
+        :return: PanelResponse object.
+        """
+
+        def fetch(symbol):
+            try:
+                return fetcher(symbol=symbol, **query_args), None
+            except Exception as e:
+                return None, e
+
+        responses = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for symbol, (response, error) in zip(symbols, executor.map(fetch, symbols)):
+                if error is None:
+                    responses[symbol] = response
+                else:
+                    logger.warning(f'Failed to fetch data for {symbol}: {error}')
+                    errors[symbol] = error
+
+        return PanelResponse(responses, errors, query_args)
+
+    def get_message_metrics_many(self,
+                                 symbols: List[str],
+                                 timeframe: str = '5m',
+                                 filter: Tuple[str, ...] = ('total_count', ),
+                                 start: str = None,
+                                 end: str = None,
+                                 max_workers: int = 8) -> PanelResponse:
+        """
+        Queries StockGeist's API and gets message metrics data for many symbols concurrently. Symbols for which
+        the data can't be fetched are reported in ``PanelResponse.errors`` and don't abort the whole batch.
+
+        :param symbols: Stock tickers for which to retrieve data.
+
+        :param max_workers: Maximum number of symbols fetched at the same time.
+
+        See :meth:`get_message_metrics` for the description of the other arguments.
+
+        :return: PanelResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'symbols', 'max_workers']:
+            query_args.pop(name)
+
+        return self._fetch_many(self.get_message_metrics, symbols, query_args, max_workers)
+
+    def get_article_metrics_many(self,
+                                 symbols: List[str],
+                                 timeframe: str = '5m',
+                                 filter: Tuple[str, ...] = ('titles',),
+                                 start: str = None,
+                                 end: str = None,
+                                 max_workers: int = 8) -> PanelResponse:
+        """
+        Queries StockGeist's API and gets article metrics data for many symbols concurrently. Symbols for which
+        the data can't be fetched are reported in ``PanelResponse.errors`` and don't abort the whole batch.
+
+        :param symbols: Stock tickers for which to retrieve data.
+
+        :param max_workers: Maximum number of symbols fetched at the same time.
+
+        See :meth:`get_article_metrics` for the description of the other arguments.
+
+        :return: PanelResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'symbols', 'max_workers']:
+            query_args.pop(name)
+
+        return self._fetch_many(self.get_article_metrics, symbols, query_args, max_workers)
+
+    def get_price_metrics_many(self,
+                               symbols: List[str],
+                               timeframe: str = '5m',
+                               filter: Tuple[str, ...] = ('close',),
+                               start: str = None,
+                               end: str = None,
+                               max_workers: int = 8) -> PanelResponse:
+        """
+        Queries StockGeist's API and gets price metrics data for many symbols concurrently. Symbols for which
+        the data can't be fetched are reported in ``PanelResponse.errors`` and don't abort the whole batch.
+
+        :param symbols: Stock tickers for which to retrieve data.
+
+        :param max_workers: Maximum number of symbols fetched at the same time.
+
+        See :meth:`get_price_metrics` for the description of the other arguments.
+
+        :return: PanelResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'symbols', 'max_workers']:
+            query_args.pop(name)
+
+        return self._fetch_many(self.get_price_metrics, symbols, query_args, max_workers)
+
+    def get_topic_metrics_many(self,
+                               symbols: List[str],
+                               timeframe: str = '5m',
+                               filter: Tuple[str, ...] = ('words',),
+                               start: str = None,
+                               end: str = None,
+                               max_workers: int = 8) -> PanelResponse:
+        """
+        Queries StockGeist's API and gets topic metrics data for many symbols concurrently. Symbols for which
+        the data can't be fetched are reported in ``PanelResponse.errors`` and don't abort the whole batch.
+
+        :param symbols: Stock tickers for which to retrieve data.
+
+        :param max_workers: Maximum number of symbols fetched at the same time.
+
+        See :meth:`get_topic_metrics` for the description of the other arguments.
+
+        :return: PanelResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'symbols', 'max_workers']:
+            query_args.pop(name)
+
+        return self._fetch_many(self.get_topic_metrics, symbols, query_args, max_workers)
+
+    def get_fundamentals_many(self,
+                              symbols: List[str],
+                              filter: Tuple[str, ...] = ('market_cap',),
+                              max_workers: int = 8) -> PanelResponse:
+        """
+        Queries StockGeist's API and gets fundamentals data for many symbols concurrently. Symbols for which
+        the data can't be fetched are reported in ``PanelResponse.errors`` and don't abort the whole batch.
+
+        :param symbols: Stock tickers for which to retrieve data.
+
+        :param max_workers: Maximum number of symbols fetched at the same time.
+
+        See :meth:`get_fundamentals` for the description of the other arguments.
+
+        :return: PanelResponse object.
+        """
+
+        # get query arguments
+        query_args = locals()
+        for name in ['self', 'symbols', 'max_workers']:
+            query_args.pop(name)
+
+        return self._fetch_many(self.get_fundamentals, symbols, query_args, max_workers)
@@ -0,0 +1,66 @@
+import json
+from typing import Callable, Dict, Union
+
+Decoder = Callable[[bytes], Dict]
+
+
+def _orjson_decoder() -> Decoder:
+    import orjson
+
+    return orjson.loads
+
+
+def _msgspec_decoder() -> Decoder:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+
+    def decode(content: bytes) -> Dict:
+        # report malformed data the same way as the other decoders
+        try:
+            return decoder.decode(content)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+
+    return decode
+
+
+def _json_decoder() -> Decoder:
+    return json.loads
+
+
+_decoders = {
+    'orjson': _orjson_decoder,
+    'msgspec': _msgspec_decoder,
+    'json': _json_decoder,
+}
+
+
+def get_decoder(decoder: Union[str, Decoder] = 'auto') -> Decoder:
+    """
+    Get function decoding raw bytes of REST API pages.
+
+    :param decoder: Name of the JSON library (orjson, msgspec or json) or a function decoding bytes. With ``auto``
+        the fastest installed library is used, falling back to the standard library. Decoders must raise
+        ValueError on malformed data.
+
+    :return: Decoding function.
+    """
+    if callable(decoder):
+        return decoder
+
+    if decoder == 'auto':
+        for name in ['orjson', 'msgspec']:
+            try:
+                return _decoders[name]()
+            except ImportError:
+                continue
+        return _json_decoder()
+
+    if decoder not in _decoders:
+        raise Exception(f'Unknown JSON decoder: {decoder}! Possible values are: auto, {", ".join(_decoders)}.')
+
+    try:
+        return _decoders[decoder]()
+    except ImportError:
+        raise Exception(f'JSON decoder {decoder} is not installed! Install it with `pip install {decoder}`.')
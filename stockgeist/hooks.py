@@ -0,0 +1,187 @@
+import threading
+from collections import deque
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class Hooks:
+    """
+    Base class of instrumentation hooks of :class:`stockgeist.client.StockGeistClient`. Override the methods of
+    interest and pass instances with the ``hooks`` argument of the client, e.g. to export metrics::
+
+        class PrometheusHooks(stockgeist.Hooks):
+            def on_request_end(self, endpoint_name, status_code, latency, n_bytes):
+                REQUEST_LATENCY.labels(endpoint_name).observe(latency)
+
+    Hooks are called synchronously from the fetching threads, so they should be quick and thread-safe.
+    """
+
+    def on_request_start(self, endpoint_name: str, query_key: str) -> None:
+        """
+        Called before an HTTP request is sent.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_key: Query string without the token.
+        """
+
+    def on_request_end(self, endpoint_name: str, status_code: int, latency: float, n_bytes: int) -> None:
+        """
+        Called after a response is received.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param status_code: Status code reported by REST API.
+
+        :param latency: Time in seconds from sending the request to decoding the response.
+
+        :param n_bytes: Size of the (decompressed) response body in bytes.
+        """
+
+    def on_page_decoded(self, endpoint_name: str, n_rows: int, duration: float) -> None:
+        """
+        Called after a page is decoded from JSON.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param n_rows: Number of rows of the page.
+
+        :param duration: Decoding time in seconds.
+        """
+
+    def on_retry(self, endpoint_name: str, status_code: int, attempt: int, delay: float) -> None:
+        """
+        Called before a failed request is retried.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param status_code: Status code of the failed request.
+
+        :param attempt: Number of the retry, starting at 1.
+
+        :param delay: Backoff delay in seconds.
+        """
+
+    def on_call_end(self, endpoint_name: str, stats: Dict) -> None:
+        """
+        Called after all pages of a query are fetched.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param stats: Dict with ``latency`` (seconds), ``bytes``, ``requests``, ``pages``, ``rows``, ``credits``
+            (credits consumed by the requests of the query, None if the balance before the first request isn't
+            known) and ``shared`` (whether the query waited for an identical query made concurrently and shared its
+            pages - no requests and credits are then counted).
+        """
+
+    def on_conversion_done(self, response_name: str, n_rows: int, duration: float) -> None:
+        """
+        Called after the fetched pages are converted to a response object.
+
+        :param response_name: Class name of the response.
+
+        :param n_rows: Number of rows of the converted data.
+
+        :param duration: Conversion time in seconds.
+        """
+
+
+class ClientStats(Hooks):
+    """
+    Aggregate statistics of requests made by a client, available as ``client.stats``. Latency percentiles are
+    computed from the latest ``window`` requests of every endpoint.
+    """
+
+    _counters = ['calls', 'requests', 'errors', 'retries', 'bytes', 'pages', 'rows', 'credits', 'shared']
+
+    def __init__(self, window: int = 10000):
+        """
+        :param window: Number of the latest request latencies kept per endpoint.
+        """
+        self._window = window
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def _endpoint(self, endpoint_name: str) -> Dict:
+        endpoint = self._endpoints.get(endpoint_name)
+        if endpoint is None:
+            endpoint = dict({name: 0 for name in self._counters}, latencies=deque(maxlen=self._window))
+            self._endpoints[endpoint_name] = endpoint
+        return endpoint
+
+    def on_request_end(self, endpoint_name: str, status_code: int, latency: float, n_bytes: int) -> None:
+        with self._lock:
+            endpoint = self._endpoint(endpoint_name)
+            endpoint['requests'] += 1
+            endpoint['errors'] += status_code != 200
+            endpoint['bytes'] += n_bytes
+            endpoint['latencies'].append(latency)
+
+    def on_retry(self, endpoint_name: str, status_code: int, attempt: int, delay: float) -> None:
+        with self._lock:
+            self._endpoint(endpoint_name)['retries'] += 1
+
+    def on_call_end(self, endpoint_name: str, stats: Dict) -> None:
+        with self._lock:
+            endpoint = self._endpoint(endpoint_name)
+            endpoint['calls'] += 1
+            if stats.get('shared'):
+                # pages of shared queries are counted by the query which fetched them
+                endpoint['shared'] += 1
+                return
+            endpoint['pages'] += stats['pages']
+            endpoint['rows'] += stats['rows']
+            endpoint['credits'] += stats['credits'] or 0
+
+    @property
+    def endpoints(self) -> List[str]:
+        return list(self._endpoints.keys())
+
+    def latency_percentiles(self, endpoint_name: str, percentiles=(50, 95, 99)) -> Dict[str, float]:
+        """
+        Get request latency percentiles of an endpoint.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param percentiles: Percentiles to compute.
+
+        :return: Dict mapping names like ``p50`` to latencies in seconds.
+        """
+        with self._lock:
+            latencies = np.array(self._endpoint(endpoint_name)['latencies'], dtype=np.float64)
+
+        values = np.percentile(latencies, percentiles) if len(latencies) else [np.nan] * len(percentiles)
+
+        return {f'p{percentile}': float(value) for percentile, value in zip(percentiles, values)}
+
+    @property
+    def as_dataframe(self) -> pd.DataFrame:
+        """
+        Statistics as pandas DataFrame with a row per endpoint: counters and p50/p95/p99 request latencies in
+        seconds.
+        """
+        rows = {}
+        for endpoint_name in self.endpoints:
+            with self._lock:
+                row = {name: self._endpoints[endpoint_name][name] for name in self._counters}
+            row.update(self.latency_percentiles(endpoint_name))
+            rows[endpoint_name] = row
+
+        return pd.DataFrame.from_dict(rows, orient='index',
+                                      columns=self._counters + ['p50', 'p95', 'p99'])
+
+    def reset(self) -> None:
+        """
+        Remove all collected statistics.
+        """
+        with self._lock:
+            self._endpoints = {}
+
+    def __repr__(self):  # pragma: no cover
+        return f'<client stats>\n' + '\n'.join(
+            f'  {endpoint_name}: {self._endpoints[endpoint_name]["requests"]} requests, '
+            f'p50 {percentiles["p50"] * 1000:.0f} ms, p95 {percentiles["p95"] * 1000:.0f} ms, '
+            f'p99 {percentiles["p99"] * 1000:.0f} ms'
+            for endpoint_name, percentiles in ((name, self.latency_percentiles(name)) for name in self.endpoints))
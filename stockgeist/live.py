@@ -0,0 +1,223 @@
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger()
+
+
+class Subscription:
+    """
+    Live tail of time series data of one or more symbols, returned by
+    :meth:`stockgeist.client.StockGeistClient.tail`.
+
+    Every poll requests only the bars since the latest known one (``start=last_timestamp``), appends them to a
+    fixed-size ring buffer per symbol and passes just the new rows to the callbacks. The latest known bar is always
+    fetched again, as it might not have been finished when it was fetched the last time, and is reported only if it
+    has changed. Polls can be made manually with :meth:`poll` or by a background thread started with :meth:`start`,
+    which polls right after every bar boundary.
+    """
+
+    def __init__(self, client, endpoint_name: str, symbols: List[Optional[str]], query_args: Dict, maxlen: int,
+                 callbacks: List[Callable], delay: float):
+        """
+        :param client: StockGeistClient used for fetching the data.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param symbols: Symbols whose data is followed.
+
+        :param query_args: Dict containing all other arguments passed to REST API.
+
+        :param maxlen: Maximum number of bars kept per symbol.
+
+        :param callbacks: Functions called as ``callback(symbol, delta)`` with a dict of columns of new rows.
+
+        :param delay: Number of seconds to wait after a bar boundary before polling, so that the bar is processed.
+        """
+        self._client = client
+        self._endpoint_name = endpoint_name
+        self._symbols = symbols
+        self._query_args = query_args
+        self._callbacks = list(callbacks)
+        self._delay = delay
+        self._timeframe = pd.Timedelta(query_args['timeframe'])
+
+        self._last_timestamps = {symbol: None for symbol in symbols}
+        self._buffers = {symbol: deque(maxlen=maxlen) for symbol in symbols}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def on_update(self, callback: Callable) -> Callable:
+        """
+        Register a function called as ``callback(symbol, delta)`` after every poll returning new rows. Can be used
+        as a decorator.
+
+        :param callback: Function to call.
+
+        :return: The same function.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def _poll_symbol(self, symbol: Optional[str]) -> Dict[str, List]:
+        """
+        Fetch bars of a single symbol since the latest known one and append them to its buffer.
+
+        :param symbol: Symbol whose data to fetch.
+
+        :return: Dict of columns of new (or updated) rows.
+        """
+        last_timestamp = self._last_timestamps[symbol]
+        start = None if last_timestamp is None else pd.Timestamp(last_timestamp).strftime('%Y-%m-%dT%H:%M:%S')
+        query_args = dict(self._query_args, symbol=symbol, start=start, end=None)
+
+        res = self._client._fetch_data_time_series(self._endpoint_name, query_args)
+        if res[0]['metadata']['status_code'] != 200:
+            raise Exception(res[0]['metadata']['message'])
+
+        # pages are ordered from the latest to the earliest one, rows within a page from the earliest one
+        rows = [row for page in res[::-1] for row in page['body']
+                if last_timestamp is None or row['timestamp'] >= last_timestamp]
+
+        with self._lock:
+            buffer = self._buffers[symbol]
+            # the latest known bar is fetched again - it replaces the stored one if it has changed
+            if len(rows) and len(buffer) and buffer[-1]['timestamp'] == rows[0]['timestamp']:
+                if buffer[-1] == rows[0]:
+                    rows = rows[1:]
+                else:
+                    buffer.pop()
+            if len(rows) == 0:
+                return {}
+
+            buffer.extend(rows)
+            self._last_timestamps[symbol] = rows[-1]['timestamp']
+
+        return {key: [row.get(key) for row in rows] for key in rows[0]}
+
+    def poll(self) -> Dict[Optional[str], Dict[str, List]]:
+        """
+        Fetch new bars of all symbols and call the callbacks.
+
+        :return: Dict mapping symbols to dicts of columns of new rows. Symbols without new rows are left out.
+        """
+        deltas = {}
+        for symbol in self._symbols:
+            delta = self._poll_symbol(symbol)
+            if len(delta) == 0:
+                continue
+            deltas[symbol] = delta
+            for callback in self._callbacks:
+                callback(symbol, delta)
+
+        return deltas
+
+    def _next_poll_time(self, now: pd.Timestamp) -> pd.Timestamp:
+        """
+        Get the time of the next poll - right after the next bar boundary.
+
+        :param now: Current time (UTC).
+
+        :return: Time of the next poll (UTC).
+        """
+        return now.floor(self._timeframe) + self._timeframe + pd.Timedelta(seconds=self._delay)
+
+    def _run(self) -> None:
+        while True:
+            now = pd.Timestamp.now(tz='UTC')
+            if self._stop_event.wait((self._next_poll_time(now) - now).total_seconds()):
+                break
+            try:
+                self.poll()
+            except Exception as e:
+                # keep following the symbols, the missed bars are fetched by the next poll
+                logger.warning(f'Polling of {self._endpoint_name} failed: {e}')
+
+    def start(self, poll_now: bool = True) -> 'Subscription':
+        """
+        Start polling in a background thread.
+
+        :param poll_now: Whether to poll immediately instead of waiting for the next bar boundary.
+
+        :return: The subscription itself.
+        """
+        if self._thread is not None:
+            raise Exception('Subscription is already running!')
+        if poll_now:
+            self.poll()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop polling in the background thread.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def last_timestamp(self, symbol: Optional[str] = None) -> Optional[str]:
+        """
+        Get timestamp of the latest known bar of a symbol or None if nothing was fetched yet.
+
+        :param symbol: Symbol; may be omitted if the subscription follows a single symbol.
+        """
+        return self._last_timestamps[self._resolve(symbol)]
+
+    def as_dict(self, symbol: Optional[str] = None) -> Dict[str, List]:
+        """
+        Get buffered bars of a symbol as a dict of columns.
+
+        :param symbol: Symbol; may be omitted if the subscription follows a single symbol.
+        """
+        with self._lock:
+            rows = list(self._buffers[self._resolve(symbol)])
+
+        return {key: [row.get(key) for row in rows] for key in rows[0]} if rows else {}
+
+    def as_dataframe(self, symbol: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get buffered bars of a symbol as a pandas DataFrame indexed by timestamp.
+
+        :param symbol: Symbol; may be omitted if the subscription follows a single symbol.
+        """
+        df = pd.DataFrame(self.as_dict(symbol))
+        if 'timestamp' in df:
+            df = df.set_index(pd.to_datetime(df.pop('timestamp'), utc=True))
+
+        return df
+
+    def _resolve(self, symbol: Optional[str]) -> Optional[str]:
+        if symbol is None and len(self._symbols) == 1:
+            return self._symbols[0]
+        return symbol
+
+    @property
+    def symbols(self) -> List[Optional[str]]:
+        return self._symbols
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def __repr__(self):  # pragma: no cover
+        return f'<live subscription>\n' \
+               f'  endpoint: {self._endpoint_name}\n' \
+               f'  symbols: {self._symbols}\n' \
+               f'  timeframe: {self._query_args["timeframe"]}\n' \
+               f'  running: {self.running}'
@@ -0,0 +1,87 @@
+from typing import Dict, List
+
+
+class QueryPlan:
+    """
+    Pages of a time series query planned before any request is sent, returned by
+    :meth:`stockgeist.client.StockGeistClient.plan`. Every window is covered by a single page of REST API, so the
+    number of requests is known upfront and the windows can be fetched in any order::
+
+        plan = client.plan('message-metrics', 'AAPL', '5m', start='2021-01-01T00:00:00', end='2021-07-01T00:00:00')
+        if plan.credits < client.get_credits() - 10000:
+            res = client.execute(plan)
+
+    Expected rows are the number of bars in the time range (trading bars for price metrics). Credits are estimated
+    from the expected rows and the cost of a row of the endpoint and timeframe, ETA from the request latency
+    observed by the client, the number of workers and the rate limit.
+    """
+
+    def __init__(self, endpoint_name: str, query_args: Dict, windows: List[Dict], rows: int, credits: int,
+                 eta: float):
+        """
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :param windows: list of query arguments of all pages, ordered from the latest page to the earliest one.
+
+        :param rows: Expected number of rows.
+
+        :param credits: Estimated number of credits consumed by the query.
+
+        :param eta: Estimated duration of the fetching in seconds.
+        """
+        self._endpoint_name = endpoint_name
+        self._query_args = query_args
+        self._windows = windows
+        self._rows = rows
+        self._credits = credits
+        self._eta = eta
+
+    @property
+    def endpoint_name(self) -> str:
+        return self._endpoint_name
+
+    @property
+    def query_args(self) -> Dict:
+        return self._query_args
+
+    @property
+    def windows(self) -> List[Dict]:
+        return self._windows
+
+    @property
+    def pages(self) -> int:
+        return len(self._windows)
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def credits(self) -> int:
+        return self._credits
+
+    @property
+    def eta(self) -> float:
+        return self._eta
+
+    @property
+    def as_dict(self) -> Dict:
+        """
+        Summary of the plan as a dict.
+        """
+        return {'endpoint': self._endpoint_name, 'pages': self.pages, 'rows': self._rows, 'credits': self._credits,
+                'eta': self._eta}
+
+    def __len__(self):
+        return len(self._windows)
+
+    def __repr__(self):  # pragma: no cover
+        return f'<query plan>\n' \
+               f'  endpoint: {self._endpoint_name}\n' \
+               f'  time range: {self._query_args["start"]} -- {self._query_args["end"]}\n' \
+               f'  pages: {self.pages}\n' \
+               f'  expected rows: {self._rows}\n' \
+               f'  estimated credits: {self._credits}\n' \
+               f'  ETA: {self._eta:.1f} s'
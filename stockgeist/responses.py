@@ -1,23 +1,275 @@
 import logging
-from collections import deque
-from typing import Dict, List, Union
+import threading
+from itertools import chain
+from operator import itemgetter
+from types import SimpleNamespace
+from typing import Dict, List, Tuple, Union
 
-import cufflinks as cf
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import wordcloud
-from plotly.subplots import make_subplots
-from termcolor import colored
 
-import pickle
+from stockgeist.trading_calendar import NYSECalendar, nyse
 
 logger = logging.getLogger()
-cf.go_offline(connected=False)
 
 # type aliases
-Figure = Union[go.Figure, None]
+Figure = Union['plotly.graph_objects.Figure', None]
+
+# plotting stack, imported on the first visualization
+_plotting = None
+_plotting_lock = threading.Lock()
+
+
+def _import_plotting() -> SimpleNamespace:
+    """
+    Import plotly, cufflinks, wordcloud and termcolor. They are heavy to import and are needed only for
+    visualizations, so they are not imported together with the rest of the package.
+    :return: Namespace holding the imported modules and functions.
+    """
+    global _plotting
+
+    with _plotting_lock:
+        if _plotting is None:
+            try:
+                import cufflinks as cf
+                import plotly.express as px
+                import plotly.graph_objects as go
+                import wordcloud
+                from plotly.subplots import make_subplots
+                from termcolor import colored
+            except ImportError as e:
+                raise Exception(f'Visualizations require plotly, cufflinks, wordcloud and termcolor! {e}')
+
+            cf.go_offline(connected=False)
+            _plotting = SimpleNamespace(cf=cf, px=px, go=go, wordcloud=wordcloud, make_subplots=make_subplots,
+                                        colored=colored)
+
+    return _plotting
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow, which is needed only for Arrow and Parquet output.
+    :return: pyarrow module.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise Exception('Arrow and Parquet output requires pyarrow! Install it with `pip install pyarrow`.')
+
+    return pyarrow
+
+
+# metrics holding lists of strings, typed explicitly so that columns of empty lists get the right type as well
+_string_list_metrics = ['titles', 'title_sentiments', 'summaries', 'urls', 'words', 'symbols']
+
+
+def _columns_to_arrow(data: Dict[str, Union[np.ndarray, List]], timestamps: np.ndarray) -> 'pyarrow.Table':
+    """
+    Build an Arrow table from a dict of columns. Numeric columns are passed to Arrow without being converted to
+    Python objects.
+    :param data: Dictionary of columns of data.
+    :param timestamps: Timestamps of the rows as int64 nanoseconds since epoch (UTC).
+    :return: pyarrow Table.
+    """
+    pa = _import_pyarrow()
+
+    arrays = {}
+    for key, column in data.items():
+        if key == 'timestamp':
+            arrays[key] = pa.array(timestamps, type=pa.timestamp('ns', tz='UTC'))
+        elif key in _string_list_metrics:
+            arrays[key] = pa.array(column, type=pa.list_(pa.string()))
+        else:
+            arrays[key] = pa.array(column)
+
+    return pa.table(arrays)
+
+
+def _write_parquet(table: 'pyarrow.Table', path: str, partition_by: Union[str, List[str], None]) -> None:
+    """
+    Write an Arrow table to Parquet.
+    :param table: pyarrow Table.
+    :param path: Path of the Parquet file or, if partitioned, of the root directory of the dataset.
+    :param partition_by: Column or list of columns to partition the dataset by. ``date`` partitions by the UTC
+        date of the timestamps.
+    """
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    if partition_by is None:
+        pq.write_table(table, path)
+        return
+
+    partition_by = [partition_by] if isinstance(partition_by, str) else list(partition_by)
+    if 'date' in partition_by and 'date' not in table.column_names:
+        days = table.column('timestamp').cast(pa.int64()).to_numpy() // (24 * 3600 * 10 ** 9)
+        table = table.append_column('date', pa.array(days.astype(np.int32), type=pa.int32()).cast(pa.date32()))
+
+    pq.write_to_dataset(table, root_path=path, partition_cols=partition_by)
+
+
+def _convert_pages(res: List[Dict]) -> Dict[str, Union[np.ndarray, List]]:
+    """
+    Convert pages of time series data from lists of row dicts to a dict of columns in chronological order.
+
+    Every page is walked only once: numeric metrics are written straight into a pre-sized float64 block whose columns
+    are returned as NumPy arrays, all other metrics (timestamps, lists of titles, words, ...) are collected into
+    Python lists. Rows repeating the timestamp of the last row of the previous (older) page are skipped.
+    :param res: list of batches of data returned by REST API, ordered from the latest batch to the earliest one.
+    :return: Dictionary of columns of data.
+    """
+    bodies = [batch['body'] for batch in res if isinstance(batch['body'], list) and len(batch['body']) != 0]
+    if len(bodies) == 0:
+        return {}
+
+    # split metrics into numeric and other ones based on the first row
+    first_row = bodies[0][0]
+    keys = [key for key in first_row.keys() if key != 'symbol']
+    numeric_keys = [key for key in keys if isinstance(first_row[key], (int, float))
+                    and not isinstance(first_row[key], bool)]
+    object_keys = [key for key in keys if key not in numeric_keys]
+    numeric_getter = itemgetter(*numeric_keys) if numeric_keys else None
+    object_getter = itemgetter(*object_keys)
+
+    # pages are ordered from the latest to the earliest, rows inside of pages are chronological
+    n_rows = sum(len(body) for body in bodies)
+    block = np.empty((n_rows, len(numeric_keys)), dtype=np.float64, order='F')
+    objects = []
+    n = 0
+    last_timestamp = None
+    for body in reversed(bodies):
+        first = 0
+        if last_timestamp is not None:
+            while first < len(body) and body[first]['timestamp'] <= last_timestamp:
+                first += 1
+        if first:
+            body = body[first:]
+        if numeric_getter is not None:
+            try:
+                if len(numeric_keys) > 1:
+                    block[n:n + len(body)] = list(map(numeric_getter, body))
+                else:
+                    block[n:n + len(body), 0] = list(map(numeric_getter, body))
+            except (TypeError, ValueError):
+                # some values are not numeric after all - fall back to Python objects
+                return _convert_pages_as_objects(res, keys)
+        objects.extend(map(object_getter, body))
+        n += len(body)
+        if len(body) != 0:
+            last_timestamp = body[-1]['timestamp']
+
+    data = {key: block[:n, i] for i, key in enumerate(numeric_keys)}
+    if len(object_keys) == 1:
+        data[object_keys[0]] = objects
+    else:
+        data.update({key: list(column) for key, column in zip(object_keys, zip(*objects))})
+
+    # keep the original order of metrics
+    return {key: data[key] for key in keys}
+
+
+def _restore_column(values: np.ndarray, integer: bool) -> List:
+    """
+    Convert a float64 column of numeric metric back to a list of the values returned by REST API: missing values
+    become None again and values of integer metrics become ints again.
+    :param values: float64 column.
+    :param integer: Whether the metric is returned by REST API as integers.
+    :return: List of values.
+    """
+    missing = np.isnan(values)
+    if integer and np.array_equal(values[~missing], np.trunc(values[~missing])):
+        column = np.where(missing, 0., values).astype(np.int64).tolist()
+    else:
+        column = values.tolist()
+    for i in np.flatnonzero(missing).tolist():
+        column[i] = None
+
+    return column
+
+
+def _convert_pages_as_objects(res: List[Dict], keys: List[str]) -> Dict[str, List]:
+    """
+    Convert pages of time series data to a dict of lists of Python objects in chronological order.
+    :param res: list of batches of data returned by REST API, ordered from the latest batch to the earliest one.
+    :param keys: Names of the metrics.
+    :return: Dictionary of lists of data.
+    """
+    data = {key: [] for key in keys}
+    for batch in reversed(res):
+        if isinstance(batch['body'], list):
+            for row in batch['body']:
+                if len(data['timestamp']) == 0 or row['timestamp'] > data['timestamp'][-1]:
+                    for key in keys:
+                        data[key].append(row.get(key))
+
+    return data
+
+
+def _parse_timestamps(timestamps: List[str]) -> np.ndarray:
+    """
+    Parse timestamp strings returned by REST API.
+    :param timestamps: List of timestamp strings.
+    :return: Array of int64 nanoseconds since epoch (UTC).
+    """
+    if len(timestamps) != 0 and {timestamp[19:] for timestamp in timestamps} == {'+00:00'}:
+        # fast path for the fixed YYYY-mm-dd HH:MM:SS+00:00 format
+        parsed = np.array([timestamp[:19] for timestamp in timestamps], dtype='datetime64[s]')
+    else:
+        parsed = pd.to_datetime(timestamps, utc=True).tz_convert(None).values
+
+    return parsed.astype('datetime64[ns]').view(np.int64)
+
+
+def _flatten_lists(column: List[List]) -> Tuple[List, np.ndarray]:
+    """
+    Explode a column of lists (e.g. titles of every bar) into a single flat list.
+    :param column: Column of lists, missing lists are treated as empty ones.
+    :return: Tuple of the flat list and int64 array of the row of every element.
+    """
+    lengths = np.fromiter((len(entry) if entry is not None else 0 for entry in column), dtype=np.int64,
+                          count=len(column))
+    flat = list(chain.from_iterable(entry for entry in column if entry))
+
+    return flat, np.repeat(np.arange(len(column), dtype=np.int64), lengths)
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Downsample a line with the Largest-Triangle-Three-Buckets algorithm, which keeps the visual shape - peaks and
+    troughs - of the line. The first and the last points are always kept, every bucket in between contributes the
+    point forming the largest triangle with the point kept in the previous bucket and the mean of the next bucket.
+
+    :param x: Sorted x coordinates (float64).
+    :param y: y coordinates (float64), finite.
+    :param n_out: Number of points to keep.
+    :return: Sorted int64 array of indices of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n, dtype=np.int64)
+
+    # bucket boundaries of the points between the first and the last one
+    bounds = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    starts, ends = bounds[:-1], bounds[1:]
+
+    # means of all buckets at once
+    cumsum_x = np.concatenate([[0.], np.cumsum(x)])
+    cumsum_y = np.concatenate([[0.], np.cumsum(y)])
+    sizes = ends - starts
+    next_x = np.append(((cumsum_x[ends] - cumsum_x[starts]) / sizes)[1:], x[-1])
+    next_y = np.append(((cumsum_y[ends] - cumsum_y[starts]) / sizes)[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = starts[i], ends[i]
+        area = np.abs((x[a] - next_x[i]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
 
 
 class _Response:
@@ -25,6 +277,11 @@ class _Response:
     Base class for all response objects returned as endpoint-querying results.
     """
 
+    # maximum number of points of a plotted line, roughly the pixel width of a chart
+    max_plot_points = 2000
+    # number of points of a line above which it's rendered with WebGL
+    webgl_threshold = 10000
+
     def __init__(self, res: List[Dict]):
         self._status_codes = [entry['metadata']['status_code'] for entry in res]
         self._messages = [entry['metadata']['message'] for entry in res]
@@ -32,32 +289,17 @@ class _Response:
         self._server_timestamps = [entry['metadata']['server_timestamp'] for entry in res]
         self._raw_data = res
         self._data_dict = self._convert_raw_data_to_time_series()
+        self._as_dict = None
+        self._timestamps = None
+        self._index = None
+        self._dataframe = None
 
-    def _convert_raw_data_to_time_series(self) -> Dict[str, List]:
+    def _convert_raw_data_to_time_series(self) -> Dict[str, Union[np.ndarray, List]]:
         """
-        Convert raw data from list of dicts to dict of lists.
-        :return: Dictionary of lists of data.
+        Convert raw data from list of dicts to dict of columns.
+        :return: Dictionary of columns of data.
         """
-
-        data = {}
-        is_time_series_data = False
-        for batch in self._raw_data:
-            if isinstance(batch['body'], list):
-                # time series endpoint data
-                is_time_series_data = True
-                if len(batch['body']) != 0:
-                    for key in batch['body'][0].keys():
-                        if key != 'symbol':
-                            if key not in data:
-                                data[key] = deque([entry[key] for entry in batch['body']])
-                            else:
-                                data[key].extendleft([entry[key] for entry in batch['body']][::-1])
-
-        if is_time_series_data:
-            # convert deques to lists
-            data = {key: list(val) for key, val in data.items()}
-
-        return data
+        return _convert_pages(self._raw_data)
 
     @property
     def status_codes(self):
@@ -81,14 +323,105 @@ class _Response:
 
     @property
     def as_dict(self):
-        return self._data_dict
+        if self._as_dict is None:
+            # numeric metrics are kept as float64 columns, restore the types of values returned by REST API
+            first_row = next((batch['body'][0] for batch in self._raw_data
+                              if isinstance(batch['body'], list) and len(batch['body']) != 0), {})
+            self._as_dict = {key: _restore_column(val, isinstance(first_row.get(key), int))
+                             if isinstance(val, np.ndarray) else val
+                             for key, val in self._data_dict.items()}
+        return self._as_dict
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """
+        Timestamps of the data points as int64 nanoseconds since epoch (UTC). Parsed once, on the first access.
+        """
+        if self._timestamps is None:
+            self._timestamps = _parse_timestamps(self._data_dict.get('timestamp', []))
+        return self._timestamps
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """
+        Timestamps of the data points as UTC pandas DatetimeIndex. Built once, on the first access.
+        """
+        if self._index is None:
+            self._index = pd.DatetimeIndex(self.timestamps.view('datetime64[ns]')).tz_localize('UTC')
+        return self._index
 
     @property
     def as_dataframe(self):
-        # create pandas DataFrame
-        df = pd.DataFrame(self._data_dict, index=pd.DatetimeIndex(self._data_dict['timestamp']))
-        df = df.drop('timestamp', axis=1)
-        return df
+        """
+        Data as pandas DataFrame indexed by UTC DatetimeIndex. Numeric metrics are float64 columns, the other ones
+        are object columns. The DataFrame is built once, on the first access, and the same object is returned
+        afterwards - copy it before modifying it in place.
+        """
+        if self._dataframe is None:
+            # create pandas DataFrame
+            columns = {key: val for key, val in self._data_dict.items() if key != 'timestamp'}
+            self._dataframe = pd.DataFrame(columns, index=self.index, copy=False)
+        return self._dataframe
+
+    def as_arrow(self) -> 'pyarrow.Table':
+        """
+        Data as Apache Arrow table built directly from the converted columns. Requires ``pyarrow``. Timestamps are
+        stored as ``timestamp[ns, UTC]``, lists of titles, words and symbols as ``list<string>``.
+        :return: pyarrow Table.
+        """
+        table = _columns_to_arrow(self._data_dict, self.timestamps)
+        symbol = getattr(self, '_query_args', {}).get('symbol')
+        if symbol is not None:
+            pa = _import_pyarrow()
+            table = table.append_column('symbol', pa.array([symbol] * table.num_rows, type=pa.string()))
+
+        return table
+
+    def to_parquet(self, path: str, partition_by: Union[str, List[str]] = None) -> None:
+        """
+        Write data to Parquet. Requires ``pyarrow``.
+        :param path: Path of the Parquet file or, if partitioned, of the root directory of the dataset.
+        :param partition_by: Column or list of columns to partition the dataset by, e.g. ``symbol``. ``date``
+            partitions by the UTC date of the timestamps.
+        """
+        _write_parquet(self.as_arrow(), path, partition_by)
+
+    def _resample(self, timeframe: str, aggregations: Dict[str, str]) -> pd.DataFrame:
+        """
+        Aggregate the data to coarser bars with vectorized reductions over the sorted bars of every new bar. Bars
+        are labelled with their start, like the bars of REST API.
+        :param timeframe: Time resolution of the resampled data, a multiple of the current one, e.g. 1h or 1d.
+        :param aggregations: Dict mapping metric names to aggregations: sum, max, min, first or last.
+        :return: pandas DataFrame indexed by UTC DatetimeIndex.
+        """
+        step = pd.Timedelta(timeframe).value
+        source_step = pd.Timedelta(self._query_args['timeframe']).value
+        if step <= source_step or step % source_step != 0:
+            raise Exception(f"Can't resample {self._query_args['timeframe']} data to {timeframe}! The timeframe has "
+                            f"to be a multiple of the timeframe of the data.")
+
+        timestamps = self.timestamps
+        order = np.argsort(timestamps, kind='stable')
+        bins = timestamps[order] - timestamps[order] % step
+
+        # boundaries of the groups of bars falling into the same new bar
+        starts = np.flatnonzero(np.diff(bins, prepend=bins[:1] - 1)) if len(bins) else np.empty(0, np.int64)
+        ends = np.append(starts[1:], len(bins)) - 1
+
+        reducers = {'sum': np.add.reduceat, 'max': np.maximum.reduceat, 'min': np.minimum.reduceat}
+        columns = {}
+        for name, how in aggregations.items():
+            values = np.asarray(self._data_dict[name], dtype=np.float64)[order]
+            if len(values) == 0:
+                columns[name] = values
+            elif how in reducers:
+                columns[name] = reducers[how](values, starts)
+            else:
+                columns[name] = values[starts if how == 'first' else ends]
+
+        index = pd.DatetimeIndex(bins[starts].view('datetime64[ns]')).tz_localize('UTC')
+
+        return pd.DataFrame(columns, index=index)
 
     def _validate_metrics(self, to_parse: str, available_metrics: List[str]) -> List[str]:
         """
@@ -108,14 +441,61 @@ class _Response:
 
         return metric_names
 
-    def _plot_simple(self, title: str, metric_names: List[str], right_y_metric_names: List[str]) -> Figure:
+    def _line(self, name: str, y: np.ndarray, full_resolution: bool, webgl: bool = True, text: np.ndarray = None,
+              **kwargs) -> 'plotly.graph_objects.Scatter':
+        """
+        Create a line trace of a metric. Lines longer than ``max_plot_points`` are downsampled with LTTB to about
+        the pixel width of a chart unless ``full_resolution`` is set, lines longer than ``webgl_threshold`` are
+        rendered with WebGL. Shorter lines are plotted as they are.
+        :param name: Name of the trace.
+        :param y: Values of the metric, one per timestamp.
+        :param full_resolution: Whether to plot all points.
+        :param webgl: Whether WebGL may be used. Rangebreaks of the time axis don't work with WebGL traces.
+        :param text: Hover-on texts, one per timestamp.
+        :param kwargs: Other arguments of the trace.
+        :return: plotly trace.
+        """
+        plotting = _import_plotting()
+        if text is not None:
+            kwargs['text'] = text
+
+        # timestamps are plotted as epoch milliseconds on a date axis - plotly copies numeric arrays as they are,
+        # while strings and datetime objects are validated one by one and nanosecond datetime64 is sent as integers
+        if len(self.timestamps) <= self.max_plot_points:
+            # short lines are plotted as they are
+            return plotting.go.Scatter(x=self.timestamps // 10 ** 6, y=y, name=name, **kwargs)
+
+        # plot lines in chronological order
+        order = np.argsort(self.timestamps, kind='stable')
+        timestamps = self.timestamps[order]
+        values = np.asarray(y, dtype=np.float64)[order]
+
+        if not full_resolution:
+            # missing values would break the buckets - keep only the valid points
+            valid = np.flatnonzero(np.isfinite(values))
+            seconds = (timestamps[valid] - timestamps[0]) / 1e9
+            order = order[valid[_lttb(seconds, values[valid], self.max_plot_points)]]
+            timestamps, values = self.timestamps[order], np.asarray(y, dtype=np.float64)[order]
+        if text is not None:
+            kwargs['text'] = np.asarray(text, dtype=object)[order]
+
+        x = timestamps // 10 ** 6
+        trace = plotting.go.Scattergl if webgl and len(values) > self.webgl_threshold else plotting.go.Scatter
+        return trace(x=x, y=values, name=name, **kwargs)
+
+    def _plot_simple(self, title: str, metric_names: List[str], right_y_metric_names: List[str],
+                     full_resolution: bool = False, webgl: bool = True) -> Figure:
         """
         Standard method for plotting line plots.
         :param title: String displayed as graph title.
         :param metric_names: List of validated metrics.
         :param right_y_metric_names: List of metrics to be displayed on right-y axis.
+        :param full_resolution: Whether to plot all points instead of downsampling long lines.
+        :param webgl: Whether long lines may be rendered with WebGL.
         :return: plotly Figure object.
         """
+        _import_plotting()
+
         # plot metrics
         fig = pd.DataFrame(index=self._data_dict['timestamp']) \
             .iplot(kind='scatter',
@@ -123,23 +503,19 @@ class _Response:
                    title=title,
                    asFigure=True)
         fig = fig.set_subplots(specs=[[{"secondary_y": True}]])
+        fig.update_xaxes(type='date')
 
         left_y_metrics = []
         right_y_metrics = []
         for name in metric_names:
             # add trace
-            plot_args = dict(
-                x=self._data_dict['timestamp'],
-                y=np.array(self._data_dict[name]).flatten(),
-                mode='lines',
-                name=name,
-            )
+            trace = self._line(name, np.array(self._data_dict[name]).flatten(), full_resolution, webgl, mode='lines')
 
             if name in right_y_metric_names:
-                fig.add_trace(go.Scatter(**plot_args), secondary_y=True)
+                fig.add_trace(trace, secondary_y=True)
                 right_y_metrics.append(name)
             else:
-                fig.add_trace(go.Scatter(**plot_args), secondary_y=False)
+                fig.add_trace(trace, secondary_y=False)
                 left_y_metrics.append(name)
 
         # set y axis titles
@@ -165,7 +541,30 @@ class MessageMetricsResponse(_Response):
                                    'em_positive_count', 'em_neutral_count', 'em_negative_count', 'em_total_count',
                                    'total_count', 'pos_index', 'msg_ratio', 'ma', 'ma_diff', 'std_dev', 'ma_count_change']
 
-    def visualize(self, what: str = 'total_count', show_fig: bool = True) -> Figure:
+    # ratios and moving statistics of the original bars can't be aggregated to coarser bars
+    _non_resampled_metrics = ['pos_index', 'msg_ratio', 'ma', 'ma_diff', 'std_dev', 'ma_count_change']
+
+    def resample(self, timeframe: str, drop_unsupported: bool = False) -> pd.DataFrame:
+        """
+        Aggregate message counts to coarser bars locally, e.g. 5m data to 1h or 1d bars, instead of fetching the data
+        again. Counts are summed.
+
+        :param timeframe: Time resolution of the resampled data, a multiple of the current one, e.g. 1h or 1d.
+
+        :param drop_unsupported: Whether to leave out metrics which can't be aggregated (pos_index, msg_ratio, ma,
+            ma_diff, std_dev, ma_count_change) instead of raising an Exception.
+
+        :return: pandas DataFrame indexed by UTC DatetimeIndex.
+        """
+        metric_names = [name for name in self._data_dict.keys() if name in self._available_metrics]
+        unsupported = [name for name in metric_names if name in self._non_resampled_metrics]
+        if unsupported and not drop_unsupported:
+            raise Exception(f"Can't resample {', '.join(unsupported)}! Fetch them in the {timeframe} timeframe or "
+                            f"pass drop_unsupported=True.")
+
+        return self._resample(timeframe, {name: 'sum' for name in metric_names if name not in unsupported})
+
+    def visualize(self, what: str = 'total_count', show_fig: bool = True, full_resolution: bool = False) -> Figure:
         """
         Visualize selected metrics from the downloaded message metrics data.
 
@@ -173,6 +572,8 @@ class MessageMetricsResponse(_Response):
 
         :param show_fig: Whether to show generated plotly figure or not.
 
+        :param full_resolution: Whether to plot all points instead of downsampling long time series.
+
         :return: plotly Figure object.
         """
         # validate metrics
@@ -181,7 +582,8 @@ class MessageMetricsResponse(_Response):
         # plot metrics
         fig = self._plot_simple(title=f'{self._query_args["symbol"]} Message Metrics',
                                 metric_names=metric_names,
-                                right_y_metric_names=['pos_index', 'msg_ratio', 'ma_count_change'])
+                                right_y_metric_names=['pos_index', 'msg_ratio', 'ma_count_change'],
+                                full_resolution=full_resolution)
 
         if show_fig:  # pragma: no cover
             fig.show()
@@ -201,6 +603,8 @@ class ArticleMetricsResponse(_Response):
     Object containing data received from the *article-metrics* endpoint of StockGeist's API.
     """
 
+    _sentiment_labels = ['positive', 'neutral', 'negative']
+
     def __init__(self, res: List[Dict], query_args: Dict):
         super().__init__(res)
 
@@ -211,8 +615,97 @@ class ArticleMetricsResponse(_Response):
         self._available_metrics = ['titles', 'mentions', 'title_sentiments']
         self._max_title_words = 10
         self._max_titles = 15
+        self._aggregates = None
+        self._flat = {}
 
-    def _plot_simple(self, title: str, metric_names: List[str], right_y_metric_names=None) -> Figure:
+    def _flat_column(self, name: str) -> Tuple[List, np.ndarray]:
+        """
+        Get a list column exploded into a flat list with the row of every element. Built once per column.
+        """
+        if name not in self._flat:
+            self._flat[name] = _flatten_lists(self._data_dict[name])
+        return self._flat[name]
+
+    def _sentiment_codes(self) -> np.ndarray:
+        """
+        Get the index of the label in ``_sentiment_labels`` of every title sentiment, -1 for unknown labels.
+        """
+        flat, _ = self._flat_column('title_sentiments')
+        return pd.Categorical(flat, categories=self._sentiment_labels).codes.astype(np.int64)
+
+    @property
+    def aggregates(self) -> pd.DataFrame:
+        """
+        Per-bar aggregates of the list metrics as pandas DataFrame indexed by UTC DatetimeIndex: ``titles_count``,
+        ``mentions_count`` and ``titles_count_positive``, ``titles_count_neutral``, ``titles_count_negative``,
+        depending on the downloaded metrics. Computed once, in bulk over the flattened lists.
+        """
+        if self._aggregates is None:
+            n_rows = len(self._data_dict.get('timestamp', []))
+            columns = {}
+            if 'titles' in self._data_dict:
+                _, rows = self._flat_column('titles')
+                columns['titles_count'] = np.bincount(rows, minlength=n_rows)
+            if 'mentions' in self._data_dict:
+                flat, rows = self._flat_column('mentions')
+                mentions = np.asarray(flat)
+                sums = np.zeros(n_rows, dtype=mentions.dtype if len(mentions) else np.int64)
+                if len(mentions):
+                    # rows without mentions don't start a segment of the flat array
+                    starts = np.flatnonzero(np.diff(rows, prepend=-1))
+                    sums[rows[starts]] = np.add.reduceat(mentions, starts)
+                columns['mentions_count'] = sums
+            if 'title_sentiments' in self._data_dict:
+                _, rows = self._flat_column('title_sentiments')
+                codes = self._sentiment_codes()
+                known = codes >= 0
+                n_labels = len(self._sentiment_labels)
+                counts = np.bincount(rows[known] * n_labels + codes[known], minlength=n_rows * n_labels)
+                counts = counts.reshape(n_rows, n_labels)
+                for i, label in enumerate(self._sentiment_labels):
+                    columns[f'titles_count_{label}'] = counts[:, i]
+            self._aggregates = pd.DataFrame(columns, index=self.index)
+
+        return self._aggregates
+
+    def _hover_texts(self, formatted: List[str], rows: np.ndarray) -> np.ndarray:
+        """
+        Assemble hover-on texts listing titles of every bar.
+
+        :param formatted: Formatted titles, ordered by bar.
+
+        :param rows: Bar of every title.
+
+        :return: object array of texts, one per bar.
+        """
+        counts = np.bincount(rows, minlength=len(self._data_dict['timestamp']))
+        starts = np.cumsum(counts) - counts
+
+        text = []
+        for start, count in zip(starts.tolist(), counts.tolist()):
+            txt = "<br>Titles:" + ''.join(formatted[start:start + min(count, self._max_titles)])
+            if count > self._max_titles:
+                txt += "<br> ..."
+            text.append(txt)
+
+        return np.array(text, dtype=object)
+
+    def _format_titles(self) -> List[str]:
+        """
+        Format every title once for hover-on texts - shortened to ``_max_title_words`` words.
+        """
+        flat, _ = self._flat_column('titles')
+        formatted = []
+        for title in flat:
+            title_words = title.split()
+            if len(title_words) <= self._max_title_words:
+                formatted.append(f"<br> - {' '.join(title_words)}")
+            else:
+                formatted.append(f"<br> - {' '.join(title_words[:self._max_title_words])} ...")
+        return formatted
+
+    def _plot_simple(self, title: str, metric_names: List[str], right_y_metric_names=None,
+                     full_resolution: bool = False, webgl: bool = True) -> Figure:
         """
         Method for plotting line plots tailored to article metrics data.
 
@@ -222,9 +715,15 @@ class ArticleMetricsResponse(_Response):
 
         :param right_y_metric_names: Not used.
 
+        :param full_resolution: Whether to plot all points instead of downsampling long lines.
+
+        :param webgl: Whether long lines may be rendered with WebGL.
+
         :return: plotly Figure object.
         """
 
+        _import_plotting()
+
         # plot metrics
         fig = pd.DataFrame(index=self._data_dict['timestamp']) \
             .iplot(kind='scatter',
@@ -232,106 +731,73 @@ class ArticleMetricsResponse(_Response):
                    title=title,
                    asFigure=True)
         fig = fig.set_subplots(specs=[[{"secondary_y": True}]])
+        fig.update_xaxes(type='date')
+
+        aggregates = self.aggregates
+        formatted = self._format_titles() if 'titles' in metric_names else None
 
         left_y_metrics = []
         right_y_metrics = []
         for name in metric_names:
             if name == 'titles':
-                # add trace
-                plot_args = dict(
-                    x=self._data_dict['timestamp'],
-                    y=[len(entry) for entry in self._data_dict[name]],
-                    mode='lines',
-                    name='titles_count',
-                )
                 # prepare hover-on text
-                text = []
-                for entry in self._data_dict[name]:
-                    txt = "<br>Titles:"
-
-                    # format titles
-                    for title in entry[:self._max_titles]:
-                        title_words = title.split()
-                        if len(title_words) <= self._max_title_words:
-                            txt += f"<br> - {' '.join(title_words)}"
-                        else:
-                            txt += f"<br> - {' '.join(title_words[:self._max_title_words])} ..."
-                    if len(entry) > self._max_titles:
-                        txt += "<br> ..."
-                    text.append(txt)
-                fig.add_trace(go.Scatter(**plot_args,
-                                          hovertemplate=
-                                          '<br>Timestamp: %{x}' +
-                                          '<br>Counts: %{y}' +
-                                          '%{text}',
-                                          text=text
-                                          ), secondary_y=False)
+                text = self._hover_texts(formatted, self._flat_column('titles')[1])
+                # add trace
+                fig.add_trace(self._line('titles_count', aggregates['titles_count'].to_numpy(), full_resolution,
+                                         webgl, text=text, mode='lines',
+                                         hovertemplate=
+                                         '<br>Timestamp: %{x}' +
+                                         '<br>Counts: %{y}' +
+                                         '%{text}'), secondary_y=False)
                 left_y_metrics.append(name)
             elif name == 'mentions':
                 # add trace
-                plot_args = dict(
-                    x=self._data_dict['timestamp'],
-                    y=[sum(entry) for entry in self._data_dict[name]],
-                    mode='lines',
-                    name='mentions_count',
-                )
-                fig.add_trace(go.Scatter(**plot_args,
-                                          hovertemplate=
-                                          '<br>Timestamp: %{x}' +
-                                          '<br>Mentions: %{y}'
-                                          ), secondary_y=False)
+                fig.add_trace(self._line('mentions_count', aggregates['mentions_count'].to_numpy(), full_resolution,
+                                         webgl, mode='lines',
+                                         hovertemplate=
+                                         '<br>Timestamp: %{x}' +
+                                         '<br>Mentions: %{y}'), secondary_y=False)
                 left_y_metrics.append(name)
             elif name == 'title_sentiments':
                 # add traces
-                counts = [np.unique(entry, return_counts=True) for entry in self._data_dict[name]]
-                y = {label: [] for label in ['positive', 'neutral', 'negative']}
-                for entry in counts:
-                    d = dict(zip(entry[0], entry[1]))
-                    for label in ['positive', 'neutral', 'negative']:
-                        y[label].append(d.get(label, 0))
-
-                for label in ['positive', 'neutral', 'negative']:
+                codes = self._sentiment_codes()
+                rows = self._flat_column('title_sentiments')[1]
+                if 'titles' in metric_names:
+                    # position of the title of every sentiment in the flat list of titles
+                    n_rows = len(self._data_dict['timestamp'])
+                    title_rows = self._flat_column('titles')[1]
+                    title_counts = np.bincount(title_rows, minlength=n_rows)
+                    title_starts = np.cumsum(title_counts) - title_counts
+                    sentiment_counts = np.bincount(rows, minlength=n_rows)
+                    sentiment_starts = np.cumsum(sentiment_counts) - sentiment_counts
+                    title_index = title_starts[rows] + np.arange(len(rows)) - sentiment_starts[rows]
+                for i, label in enumerate(self._sentiment_labels):
                     plot_args = dict(
-                        x=self._data_dict['timestamp'],
-                        y=y[label],
-                        mode='lines',
                         name=f'titles_count_{label}',
+                        y=aggregates[f'titles_count_{label}'].to_numpy(),
+                        full_resolution=full_resolution,
+                        webgl=webgl,
+                        mode='lines',
                     )
                     # prepare hover-on text
                     if 'titles' in metric_names:
-                        # add titles as hover-on
-                        text = []
-                        for i, entry in enumerate(self._data_dict[name]):
-                            titles = np.array(self._data_dict['titles'][i])
-                            if len(entry) != 0:
-                                titles = titles[np.array(entry) == label]
-                            else:
-                                titles = []
-
-                            # format titles
-                            txt = "<br>Titles:"
-                            for title in titles[:self._max_titles]:
-                                title_words = title.split()
-                                if len(title_words) <= self._max_title_words:
-                                    txt += f"<br> - {' '.join(title_words)}"
-                                else:
-                                    txt += f"<br> - {' '.join(title_words[:self._max_title_words])} ..."
-                            if len(titles) > self._max_titles:
-                                txt += "<br> ..."
-                            text.append(txt)
+                        # add titles with the sentiment as hover-on
+                        selected = np.flatnonzero(codes == i)
+                        titles = [formatted[j] for j in title_index[selected].tolist()]
+                        text = self._hover_texts(titles, rows[selected])
 
                         hovertemplate = '<br>Timestamp: %{x}' + \
                                         '<br>Counts: %{y}' + \
                                         '%{text}'
-                        fig.add_trace(go.Scatter(**plot_args,
-                                                  hovertemplate=hovertemplate,
-                                                  text=text), secondary_y=False)
+                        fig.add_trace(self._line(**plot_args,
+                                                 hovertemplate=hovertemplate,
+                                                 text=text), secondary_y=False)
                     else:
                         # don't add titles
                         hovertemplate = '<br>Timestamp: %{x}' + \
                                         '<br>Counts: %{y}'
-                        fig.add_trace(go.Scatter(**plot_args,
-                                                  hovertemplate=hovertemplate), secondary_y=False)
+                        fig.add_trace(self._line(**plot_args,
+                                                 hovertemplate=hovertemplate), secondary_y=False)
                     left_y_metrics.append(f'titles_count_{label}')
 
         # set y axis titles
@@ -340,7 +806,7 @@ class ArticleMetricsResponse(_Response):
 
         return fig
 
-    def visualize(self, what: str = 'titles', show_fig: bool = True) -> Figure:
+    def visualize(self, what: str = 'titles', show_fig: bool = True, full_resolution: bool = False) -> Figure:
         """
         Visualize selected metrics from the downloaded article metrics data.
 
@@ -348,13 +814,16 @@ class ArticleMetricsResponse(_Response):
 
         :param show_fig: Whether to show generated plotly figure or not.
 
+        :param full_resolution: Whether to plot all points instead of downsampling long time series.
+
         :return: plotly Figure object.
         """
         # validate metrics
         metric_names = self._validate_metrics(what, self._available_metrics)
 
         fig = self._plot_simple(title=f'{self._query_args["symbol"]} Article Metrics',
-                                metric_names=metric_names)
+                                metric_names=metric_names,
+                                full_resolution=full_resolution)
 
         if show_fig:  # pragma: no cover
             fig.show()
@@ -370,6 +839,8 @@ class ArticleMetricsResponse(_Response):
 
         :param sentiment_spans: Sentiment spans corresponding to specified summary string.
         """
+        colored = _import_plotting().colored
+
         def print_colored(text, sentiment=None):
             if sentiment == 'positive':
                 print(colored(text, 'green'), end='')
@@ -410,7 +881,23 @@ class PriceMetricsResponse(_Response):
         self._query_args = query_args
         self._available_metrics = ['open', 'high', 'low', 'close', 'volume']
 
-    def visualize(self, what: str = 'close', display_candlesticks: bool = False, show_fig: bool = True) -> Figure:
+    def resample(self, timeframe: str) -> pd.DataFrame:
+        """
+        Aggregate price bars to coarser bars locally, e.g. 5m data to 1h or 1d bars, instead of fetching the data
+        again. Open is the first open, high the maximum high, low the minimum low, close the last close and volume
+        the sum of volumes of the bars.
+
+        :param timeframe: Time resolution of the resampled data, a multiple of the current one, e.g. 1h or 1d.
+
+        :return: pandas DataFrame indexed by UTC DatetimeIndex.
+        """
+        aggregations = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+        return self._resample(timeframe, {name: aggregations[name] for name in self._data_dict.keys()
+                                          if name in aggregations})
+
+    def visualize(self, what: str = 'close', display_candlesticks: bool = False, show_fig: bool = True,
+                  calendar: NYSECalendar = nyse, full_resolution: bool = False) -> Figure:
         """
         Visualize selected metrics from the downloaded price metrics data.
 
@@ -420,6 +907,12 @@ class PriceMetricsResponse(_Response):
 
         :param show_fig: Whether to show generated plotly figure or not.
 
+        :param calendar: Trading calendar whose closed periods are hidden on the time axis. If None, only weekends
+            and non-market hours are hidden.
+
+        :param full_resolution: Whether to plot all points instead of downsampling long time series. Long lines are
+            then rendered with WebGL, which doesn't support hiding closed periods. Not used for candlestick charts.
+
         :return: plotly Figure object.
         """
         # validate metrics
@@ -429,22 +922,15 @@ class PriceMetricsResponse(_Response):
         if not display_candlesticks:
             fig = self._plot_simple(title=f'{self._query_args["symbol"]} Price Metrics',
                                     metric_names=metric_names,
-                                    right_y_metric_names=['volume'])
+                                    right_y_metric_names=['volume'],
+                                    full_resolution=full_resolution,
+                                    webgl=full_resolution)
 
-            # remove gaps in chart where there is no data
-            if self._query_args['timeframe'] != '1d':
-                fig.update_xaxes(
-                    rangebreaks=[
-                        dict(bounds=[21.5, 12], pattern="hour"),  # hide non-market hours
-                        dict(bounds=["sat", "mon"]),  # hide weekends, eg. hide sat to before mon
-                    ]
-                )
+            # remove gaps in chart where there is no data - non-market hours, weekends and holidays
+            if any(trace.type == 'scattergl' for trace in fig.data):
+                logger.warning("WebGL traces don't support rangebreaks, periods when the market is closed are shown.")
             else:
-                fig.update_xaxes(
-                    rangebreaks=[
-                        dict(bounds=["sat", "mon"]),  # hide weekends, eg. hide sat to before mon
-                    ]
-                )
+                fig.update_xaxes(rangebreaks=self._rangebreaks(calendar))
             if show_fig:  # pragma: no cover
                 fig.show()
 
@@ -455,18 +941,14 @@ class PriceMetricsResponse(_Response):
                     and 'volume' in metric_names:
 
                 # candlestick chart
+                cf = _import_plotting().cf
                 qf = cf.QuantFig(self.as_dataframe, title=f'{self._query_args["symbol"]} Price Chart', legend='top',
                                  name=self._query_args["symbol"])
                 qf.add_volume()
                 fig = qf.figure()
 
-                # remove gaps in chart where there is no data
-                fig.update_xaxes(
-                        rangebreaks=[
-                            dict(bounds=["sat", "mon"]),  # hide weekends, eg. hide sat to before mon
-                            dict(bounds=[21.5, 12], pattern="hour"),  # hide non-market hours
-                        ]
-                    )
+                # remove gaps in chart where there is no data - non-market hours, weekends and holidays
+                fig.update_xaxes(rangebreaks=self._rangebreaks(calendar))
 
                 if show_fig:  # pragma: no cover
                     fig.show()
@@ -476,6 +958,22 @@ class PriceMetricsResponse(_Response):
                 logger.warning("Can't display candlestick chart! Make sure, that you downloaded full OHLCV data!")
                 return
 
+    def _rangebreaks(self, calendar: NYSECalendar) -> List[Dict]:
+        """
+        Get plotly rangebreaks hiding periods when the market is closed.
+
+        :param calendar: Trading calendar. If None, only weekends and non-market hours are hidden.
+
+        :return: list of rangebreak dicts.
+        """
+        if calendar is None:
+            rangebreaks = [dict(bounds=['sat', 'mon'])]  # hide weekends, eg. hide sat to before mon
+            if self._query_args['timeframe'] != '1d':
+                rangebreaks.insert(0, dict(bounds=[21.5, 12], pattern='hour'))  # hide non-market hours
+            return rangebreaks
+
+        return calendar.rangebreaks(self.index, self._query_args['timeframe'])
+
     def __repr__(self):  # pragma: no cover
         return f'<price-metrics> endpoint data\n' \
                f'  symbol: {self._query_args["symbol"]}\n' \
@@ -504,20 +1002,21 @@ class TopicMetricsResponse(_Response):
         :param n: Index of the data point to be visualized.
         :return: plotly Figure object.
         """
-        fig = make_subplots(1, 2)
+        plotting = _import_plotting()
+        fig = plotting.make_subplots(1, 2)
 
         # calculate word cloud
         words = self._data_dict['words'][n]
         scores = self._data_dict['scores'][n]
-        wc = wordcloud.WordCloud(width=800, height=800)
+        wc = plotting.wordcloud.WordCloud(width=800, height=800)
         wc.generate_from_frequencies(dict(zip(words, scores)))
         img = wc.to_array()
 
         # word cloud plot
-        fig.append_trace(go.Image(z=img), 1, 1)
+        fig.append_trace(plotting.go.Image(z=img), 1, 1)
 
         # bar plot
-        fig.append_trace(go.Bar(
+        fig.append_trace(plotting.go.Bar(
             x=scores[::-1],
             y=list(range(1, len(words)+1)),
             text=words[::-1],
@@ -557,7 +1056,7 @@ class TopicMetricsResponse(_Response):
         """
         try:
             # check whether timestamp is valid
-            n = self.as_dataframe.index.get_loc(timestamp)
+            n = self.index.get_loc(timestamp)
         except:
             raise Exception("Can't visualize topics at given timestamp! Timestamp is not valid or out of range!")
 
@@ -596,6 +1095,8 @@ class RankingMetricsResponse(_Response):
         """
         Create animated plot showing stock ranking changes over time.
         """
+        plotting = _import_plotting()
+
         # create dataframe suitable for plotly express animation
         d = {}
         n = len(self._data_dict['symbols'][0])
@@ -610,7 +1111,7 @@ class RankingMetricsResponse(_Response):
         df = pd.DataFrame(d)
 
         # create animated plot
-        fig = px.bar(df, x="score", y="value",
+        fig = plotting.px.bar(df, x="score", y="value",
                      animation_frame="timestamp",
                      color="symbol", hover_name="symbol",
                      range_x=[-0.5, len(self._data_dict['scores'][0]) - 0.5],
@@ -626,20 +1127,23 @@ class RankingMetricsResponse(_Response):
 
         return fig
 
-    def _plot_simple(self, title: str, metric_names: List[str], right_y_metric_names: List[str]) -> Figure:
-        fig = super()._plot_simple(title, metric_names, right_y_metric_names)
+    def _plot_simple(self, title: str, metric_names: List[str], right_y_metric_names: List[str],
+                     full_resolution: bool = False, webgl: bool = True) -> Figure:
+        fig = super()._plot_simple(title, metric_names, right_y_metric_names, full_resolution, webgl)
 
         # reverse y axis range
         fig['layout']['yaxis']['autorange'] = "reversed"
 
         return fig
 
-    def visualize(self, show_fig: bool = True) -> Figure:
+    def visualize(self, show_fig: bool = True, full_resolution: bool = False) -> Figure:
         """
         Visualize selected metrics from the downloaded ranking metrics data.
 
         :param show_fig: Whether to show generated plotly figure or not.
 
+        :param full_resolution: Whether to plot all points instead of downsampling long time series.
+
         :return: plotly Figure object.
         """
         if self._query_args['symbol'] is None:
@@ -647,7 +1151,8 @@ class RankingMetricsResponse(_Response):
         else:
             fig = self._plot_simple(title=f'{self._query_args["symbol"]} Ranking by {self._query_args["by"]}',
                                     metric_names=['scores'],
-                                    right_y_metric_names=['values'])
+                                    right_y_metric_names=['values'],
+                                    full_resolution=full_resolution)
 
         if show_fig:  # pragma: no cover
             fig.show()
@@ -681,12 +1186,16 @@ class SymbolsResponse(_Response):
 
     @property
     def as_dataframe(self):
-        stocks = self._raw_data[0]['body']['symbols']['stocks']
-        crypto = self._raw_data[0]['body']['symbols']['crypto']
-        crypto.extend(['-' for _ in range(len(stocks)-len(crypto))])
-        d = {'stocks': stocks, 'crypto': crypto}
-        df = pd.DataFrame(d)
-        return df
+        if self._dataframe is None:
+            stocks = self._raw_data[0]['body']['symbols']['stocks']
+            crypto = self._raw_data[0]['body']['symbols']['crypto']
+            crypto = crypto + ['-' for _ in range(len(stocks)-len(crypto))]
+            d = {'stocks': stocks, 'crypto': crypto}
+            self._dataframe = pd.DataFrame(d)
+        return self._dataframe
+
+    def as_arrow(self) -> 'pyarrow.Table':
+        return _import_pyarrow().Table.from_pandas(self.as_dataframe, preserve_index=False)
 
     def __repr__(self):  # pragma: no cover
         return f'<symbols> endpoint data\n' \
@@ -712,9 +1221,13 @@ class FundamentalsResponse(_Response):
 
     @property
     def as_dataframe(self):
-        d = self._raw_data[0]['body']
-        df = pd.DataFrame({key: [val] for key, val in d.items()})
-        return df
+        if self._dataframe is None:
+            d = self._raw_data[0]['body']
+            self._dataframe = pd.DataFrame({key: [val] for key, val in d.items()})
+        return self._dataframe
+
+    def as_arrow(self) -> 'pyarrow.Table':
+        return _import_pyarrow().Table.from_pandas(self.as_dataframe, preserve_index=False)
 
     def __repr__(self):  # pragma: no cover
         return f'<fundamentals> endpoint data\n' \
@@ -723,3 +1236,142 @@ class FundamentalsResponse(_Response):
                f'  metrics: {", ".join(self._query_args["filter"])}'
 
 
+class PanelResponse:
+    """
+    Object containing responses of the same endpoint fetched for many symbols at once.
+    """
+
+    def __init__(self, responses: Dict[str, _Response], errors: Dict[str, Exception], query_args: Dict):
+        self._responses = responses
+        self._errors = errors
+        self._query_args = query_args
+        self._dataframe = None
+
+    def __getitem__(self, symbol: str) -> _Response:
+        return self._responses[symbol]
+
+    def __len__(self):
+        return len(self._responses)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._responses.keys())
+
+    @property
+    def responses(self) -> Dict[str, _Response]:
+        return self._responses
+
+    @property
+    def errors(self) -> Dict[str, Exception]:
+        return self._errors
+
+    @property
+    def as_dict(self):
+        return {symbol: response.as_dict for symbol, response in self._responses.items()}
+
+    @property
+    def as_dataframe(self):
+        """
+        Data of all symbols in a single pandas DataFrame. Time series data is indexed by a (symbol, timestamp)
+        MultiIndex, snapshot data is indexed by symbol. The DataFrame is built once, on the first access.
+        """
+        if self._dataframe is None:
+            self._dataframe = self._build_dataframe()
+        return self._dataframe
+
+    def _build_dataframe(self) -> pd.DataFrame:
+        """
+        Build a single DataFrame from the data of all responses by concatenating the columns of each metric
+        directly instead of concatenating per-symbol DataFrames.
+        :return: pandas DataFrame.
+        """
+        if any(isinstance(response, FundamentalsResponse) for response in self._responses.values()):
+            # snapshot data - one row per symbol
+            return pd.DataFrame.from_records([response.as_dict for response in self._responses.values()],
+                                             index=pd.Index(self.symbols, name='symbol'))
+
+        responses = list(self._responses.values())
+        lengths = [len(response.timestamps) for response in responses]
+        metric_names = []
+        for response in responses:
+            metric_names.extend(key for key in response._data_dict.keys()
+                                if key != 'timestamp' and key not in metric_names)
+
+        # concatenate every column once
+        columns = {}
+        for name in metric_names:
+            parts = [response._data_dict.get(name) for response in responses]
+            if all(isinstance(part, np.ndarray) or (part is None and length == 0)
+                   for part, length in zip(parts, lengths)):
+                columns[name] = np.concatenate([part for part in parts if part is not None] or [np.empty(0)])
+            else:
+                column = []
+                for part, length in zip(parts, lengths):
+                    column.extend([None] * length if part is None else part)
+                columns[name] = column
+        timestamps = np.concatenate([response.timestamps for response in responses] or [np.empty(0, np.int64)])
+
+        index = pd.MultiIndex.from_arrays([np.repeat(np.array(self.symbols, dtype=object), lengths),
+                                           pd.DatetimeIndex(timestamps.view('datetime64[ns]')).tz_localize('UTC')],
+                                          names=['symbol', 'timestamp'])
+
+        return pd.DataFrame(columns, index=index)
+
+    def as_arrow(self) -> 'pyarrow.Table':
+        """
+        Time series data of all symbols as a single Apache Arrow table with a ``symbol`` column. Requires
+        ``pyarrow``.
+        :return: pyarrow Table.
+        """
+        pa = _import_pyarrow()
+
+        return pa.concat_tables([response.as_arrow() for response in self._responses.values()])
+
+    def to_parquet(self, path: str, partition_by: Union[str, List[str]] = None) -> None:
+        """
+        Write time series data of all symbols to Parquet. Requires ``pyarrow``.
+        :param path: Path of the Parquet file or, if partitioned, of the root directory of the dataset.
+        :param partition_by: Column or list of columns to partition the dataset by, e.g. ``symbol``. ``date``
+            partitions by the UTC date of the timestamps.
+        """
+        _write_parquet(self.as_arrow(), path, partition_by)
+
+    def __repr__(self):  # pragma: no cover
+        return f'<panel> data of {len(self._responses)} symbols\n' \
+               f'  symbols: {", ".join(self.symbols)}\n' \
+               f'  failed: {", ".join(self._errors.keys())}'
+
+
+def _join_time_series(responses: Dict[str, _Response], tolerance: str = None) -> pd.DataFrame:
+    """
+    Join time series responses of different endpoints for the same symbol and timeframe on a shared bar grid - the
+    union of timestamps of all endpoints but price metrics, which exist only while the market is open. Other
+    endpoints are aligned to the grid exactly, price metrics with an as-of join: every bar gets the latest price bar
+    at or before it, e.g. the last bar of the session during closed hours.
+
+    :param responses: Dict mapping endpoint names (e.g. ``price-metrics``) to responses.
+
+    :param tolerance: Maximum age of the price bar joined to a bar, e.g. ``1h``. Not limited if not given.
+
+    :return: pandas DataFrame indexed by UTC DatetimeIndex with (endpoint, metric) MultiIndex columns.
+    """
+    grid = [response.timestamps for endpoint, response in responses.items() if endpoint != 'price-metrics']
+    if not grid:
+        grid = [response.timestamps for response in responses.values()]
+    grid = np.unique(np.concatenate(grid))
+    index = pd.DatetimeIndex(grid.view('datetime64[ns]')).tz_localize('UTC')
+
+    frames = {}
+    for endpoint, response in responses.items():
+        df = response.as_dataframe
+        if endpoint == 'price-metrics':
+            df = df[~df.index.duplicated(keep='last')]
+            frames[endpoint] = df.reindex(index, method='ffill',
+                                          tolerance=pd.Timedelta(tolerance) if tolerance is not None else None)
+        else:
+            frames[endpoint] = df.reindex(index)
+
+    joined = pd.concat(frames, axis=1)
+    joined.columns.names = ['endpoint', 'metric']
+
+    return joined
@@ -0,0 +1,153 @@
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RequestScheduler:
+    """
+    Paces requests sent to StockGeist's API: a token bucket limits the request rate, failed requests with retryable
+    status codes are retried with exponential backoff and jitter, and the credit balance reported by REST API is
+    tracked so that fetching stops before the balance runs out.
+
+    The scheduler only computes the delays, sleeping is left to the caller, so it is shared by the synchronous and
+    asynchronous clients.
+    """
+
+    # status codes of transient errors worth retrying, 599 stands for network errors (timeouts, dropped connections)
+    retry_statuses = (429, 500, 502, 503, 504, 599)
+
+    def __init__(self, rate: float = None, burst: int = 1, max_retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30., credit_reserve: int = 0):
+        """
+        :param rate: Maximum sustained number of requests per second. Not limited if not given.
+
+        :param burst: Maximum number of requests sent at once after a period of inactivity.
+
+        :param max_retries: Maximum number of retries of a single request.
+
+        :param backoff: Delay in seconds before the first retry, doubled with every next one.
+
+        :param max_backoff: Maximum delay in seconds between two retries.
+
+        :param credit_reserve: Number of credits which must remain on the balance. Requests are refused once the
+            balance reported by REST API drops below it, so that fetching stops with the data collected so far.
+        """
+        self._rate = rate
+        self._burst = burst
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._credit_reserve = credit_reserve
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._credits = None
+        self._lowest_credits = None
+        self._retries = 0
+
+    def reserve(self) -> Optional[float]:
+        """
+        Take a token from the bucket for the next request.
+
+        :return: Delay in seconds the request has to wait before being sent or None if the request mustn't be sent
+            because the credit balance is below the reserve.
+        """
+        with self._lock:
+            if self.exhausted:
+                return None
+
+            if self._rate is None:
+                return 0.
+
+            # refill the bucket, tokens taken in advance leave it in debt
+            now = time.monotonic()
+            self._tokens = min(float(self._burst), self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+
+            return 0. if self._tokens >= 0 else -self._tokens / self._rate
+
+    def retry_delay(self, status_code: int, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Decide whether a failed request should be retried.
+
+        :param status_code: Status code of the failed request.
+
+        :param attempt: Number of retries of the request made so far.
+
+        :param retry_after: Value of the ``Retry-After`` header, if any.
+
+        :return: Delay in seconds before the retry or None if the request shouldn't be retried.
+        """
+        if status_code not in self.retry_statuses or attempt >= self._max_retries:
+            return None
+
+        with self._lock:
+            self._retries += 1
+
+        # full jitter spreads the retries of concurrent requests
+        delay = random.uniform(0, min(self._max_backoff, self._backoff * 2 ** attempt))
+        if retry_after is not None:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+
+        return delay
+
+    def update(self, metadata: Dict) -> Optional[int]:
+        """
+        Track the credit balance reported in metadata of a page returned by REST API.
+
+        Credits spent by a request are the drop of the balance below the lowest balance reported so far. Responses of
+        concurrent requests may arrive out of order, so a higher balance reported after a lower one is taken for
+        a late response, not for a refill of the balance.
+
+        :param metadata: Metadata of the page.
+
+        :return: Number of credits spent by the request or None if the balance before the request isn't known.
+        """
+        credits = metadata.get('credits')
+        if credits is None:
+            return 0 if self._lowest_credits is not None else None
+
+        with self._lock:
+            self._credits = credits
+            lowest = self._lowest_credits
+            self._lowest_credits = credits if lowest is None else min(lowest, credits)
+
+        return max(lowest - credits, 0) if lowest is not None else None
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        Whether the credit balance reported by REST API is below the reserve.
+        """
+        return self._credits is not None and self._credits < self._credit_reserve
+
+    @property
+    def credit_reserve(self) -> int:
+        return self._credit_reserve
+
+    @property
+    def rate(self) -> Optional[float]:
+        return self._rate
+
+    @property
+    def credits(self) -> Optional[int]:
+        """
+        Credit balance reported by the latest response or None if not known yet.
+        """
+        return self._credits
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    def __repr__(self):  # pragma: no cover
+        return f'<request scheduler>\n' \
+               f'  rate: {self._rate if self._rate is not None else "unlimited"} requests/s\n' \
+               f'  credits: {self._credits} (reserve {self._credit_reserve})\n' \
+               f'  retries: {self._retries}'
@@ -0,0 +1,242 @@
+import os
+import pickle
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class TimeSeriesStore:
+    """
+    Persistent local store of time series data fetched from StockGeist's API, used as a cache by
+    :class:`stockgeist.client.StockGeistClient`.
+
+    Data is kept in one directory per (endpoint, symbol, timeframe, metric) holding a sorted column of timestamps,
+    a column of values (memory-mapped NumPy arrays for numeric metrics) and the list of time ranges which have
+    already been downloaded. Only the ranges that are not covered yet have to be fetched from REST API.
+    """
+
+    # arguments identifying the data of a metric, all other arguments except for the time range are folded into key
+    _key_args = ('symbol', 'timeframe', 'filter', 'start', 'end')
+
+    def __init__(self, path: str):
+        """
+        :param path: Root directory of the store, ``~`` is expanded. Created if it doesn't exist.
+        """
+        self._path = os.path.expanduser(path)
+        os.makedirs(self._path, exist_ok=True)
+
+    @staticmethod
+    def _to_ns(timestamp: str) -> int:
+        return pd.Timestamp(timestamp, tz='UTC').value
+
+    @staticmethod
+    def _from_ns(timestamp: int, fmt: str = '%Y-%m-%dT%H:%M:%S') -> str:
+        return pd.Timestamp(timestamp, tz='UTC').strftime(fmt)
+
+    def _metric_dir(self, endpoint_name: str, query_args: Dict, metric: str) -> str:
+        """
+        Get the directory holding data of a single metric.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :param metric: Name of the metric.
+
+        :return: Path of the directory.
+        """
+        extra = ','.join(f'{name}={value}' for name, value in sorted(query_args.items())
+                         if name not in self._key_args and value is not None)
+        symbol = str(query_args['symbol']) + (f'@{extra}' if extra else '')
+
+        return os.path.join(self._path, endpoint_name, symbol, query_args['timeframe'], metric)
+
+    def _load(self, directory: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Load timestamps, values and covered ranges of a single metric.
+
+        :param directory: Directory holding data of the metric.
+
+        :return: Tuple of timestamps (int64 ns), values and covered [start, end) ranges (int64 ns).
+        """
+        if not os.path.exists(os.path.join(directory, 'coverage.npy')):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty((0, 2), dtype=np.int64)
+
+        timestamps = np.load(os.path.join(directory, 'timestamps.npy'), mmap_mode='r')
+        coverage = np.load(os.path.join(directory, 'coverage.npy'))
+        if os.path.exists(os.path.join(directory, 'values.npy')):
+            values = np.load(os.path.join(directory, 'values.npy'), mmap_mode='r')
+        else:
+            with open(os.path.join(directory, 'values.pkl'), 'rb') as f:
+                values = pickle.load(f)
+
+        return timestamps, values, coverage
+
+    @staticmethod
+    def _save_array(path: str, array: np.ndarray) -> None:
+        # write to a temporary file first so that readers never see partially written data
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, array)
+        os.replace(path + '.tmp', path)
+
+    def _save(self, directory: str, timestamps: np.ndarray, values: np.ndarray, coverage: np.ndarray) -> None:
+        """
+        Save timestamps, values and covered ranges of a single metric.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._save_array(os.path.join(directory, 'timestamps.npy'), timestamps)
+        if values.dtype == object:
+            with open(os.path.join(directory, 'values.pkl.tmp'), 'wb') as f:
+                pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(os.path.join(directory, 'values.pkl.tmp'), os.path.join(directory, 'values.pkl'))
+            if os.path.exists(os.path.join(directory, 'values.npy')):
+                os.remove(os.path.join(directory, 'values.npy'))
+        else:
+            self._save_array(os.path.join(directory, 'values.npy'), values)
+            if os.path.exists(os.path.join(directory, 'values.pkl')):
+                os.remove(os.path.join(directory, 'values.pkl'))
+        # coverage is written last - it marks the data as complete
+        self._save_array(os.path.join(directory, 'coverage.npy'), coverage)
+
+    @staticmethod
+    def _to_array(values: List) -> np.ndarray:
+        """
+        Convert list of values to numeric array if possible, otherwise to an array of Python objects.
+        """
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            return np.asarray(values)
+
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+        return array
+
+    @staticmethod
+    def _merge_ranges(ranges: np.ndarray) -> np.ndarray:
+        """
+        Merge overlapping or adjacent [start, end) ranges.
+        """
+        merged = []
+        for start, end in sorted(ranges.tolist()):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return np.array(merged, dtype=np.int64).reshape(-1, 2)
+
+    @staticmethod
+    def _subtract_ranges(start: int, end: int, covered: np.ndarray) -> List[List[int]]:
+        """
+        Find parts of [start, end) range not included in merged covered ranges.
+        """
+        missing = []
+        for covered_start, covered_end in covered.tolist():
+            if covered_end <= start or covered_start >= end:
+                continue
+            if covered_start > start:
+                missing.append([start, covered_start])
+            start = max(start, covered_end)
+        if start < end:
+            missing.append([start, end])
+        return missing
+
+    def missing_ranges(self, endpoint_name: str, query_args: Dict) -> List[Tuple[str, str]]:
+        """
+        Find time ranges of the query that are not stored locally for at least one of the requested metrics.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: list of (start, end) tuples ordered from the latest range to the earliest one.
+        """
+        start, end = self._to_ns(query_args['start']), self._to_ns(query_args['end'])
+
+        missing = np.empty((0, 2), dtype=np.int64)
+        for metric in query_args['filter']:
+            _, _, coverage = self._load(self._metric_dir(endpoint_name, query_args, metric))
+            missing = np.concatenate([missing, np.array(self._subtract_ranges(start, end, coverage),
+                                                        dtype=np.int64).reshape(-1, 2)])
+        missing = self._merge_ranges(missing)
+
+        return [(self._from_ns(start), self._from_ns(end)) for start, end in missing.tolist()[::-1]]
+
+    def write(self, endpoint_name: str, query_args: Dict, res: List[Dict]) -> None:
+        """
+        Merge fetched pages into the store and mark the time range of the query as covered. Bars which might still
+        change (the current and the previous one) are stored but not marked as covered, so they are fetched again.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API for the fetched range.
+
+        :param res: list of batches of data returned by REST API.
+        """
+        rows = [row for batch in res for row in batch['body']]
+        timestamps = pd.to_datetime([row['timestamp'] for row in rows], utc=True) \
+            .values.astype('datetime64[ns]').view(np.int64)
+
+        # don't mark unfinished bars as covered
+        timeframe = pd.Timedelta(query_args['timeframe'])
+        settled = (pd.Timestamp.now(tz='UTC').floor(timeframe) - timeframe).value
+        start, end = self._to_ns(query_args['start']), min(self._to_ns(query_args['end']), settled)
+
+        for metric in query_args['filter']:
+            directory = self._metric_dir(endpoint_name, query_args, metric)
+            old_timestamps, old_values, coverage = self._load(directory)
+
+            new_values = self._to_array([row.get(metric) for row in rows])
+            if len(old_values) == 0:
+                all_values = new_values
+            elif old_values.dtype == object or new_values.dtype == object:
+                all_values = np.empty(len(old_values) + len(new_values), dtype=object)
+                all_values[:len(old_values)] = old_values
+                all_values[len(old_values):] = new_values
+            else:
+                all_values = np.concatenate([old_values, new_values])
+            all_timestamps = np.concatenate([old_timestamps, timestamps])
+
+            # sort by time, newly fetched values win over the stored ones
+            order = np.argsort(all_timestamps, kind='stable')
+            all_timestamps = all_timestamps[order]
+            all_values = all_values[order]
+            keep = np.append(all_timestamps[1:] != all_timestamps[:-1], True) if len(all_timestamps) \
+                else np.empty(0, dtype=bool)
+
+            if start < end:
+                coverage = self._merge_ranges(np.concatenate([coverage, np.array([[start, end]], dtype=np.int64)]))
+
+            self._save(directory, all_timestamps[keep], all_values[keep], coverage)
+
+    def read(self, endpoint_name: str, query_args: Dict) -> List[Dict]:
+        """
+        Read stored data of the query in the layout of REST API pages.
+
+        :param endpoint_name: Name of the StockGeist's REST API endpoint.
+
+        :param query_args: Dict containing all arguments passed to REST API.
+
+        :return: list containing a single batch of data.
+        """
+        start, end = self._to_ns(query_args['start']), self._to_ns(query_args['end'])
+
+        rows = {}
+        for metric in query_args['filter']:
+            timestamps, values, _ = self._load(self._metric_dir(endpoint_name, query_args, metric))
+            lo, hi = np.searchsorted(timestamps, [start, end])
+            for timestamp, value in zip(timestamps[lo:hi].tolist(), values[lo:hi].tolist()):
+                rows.setdefault(timestamp, {})[metric] = value
+
+        body = []
+        for timestamp in sorted(rows):
+            row = {metric: rows[timestamp].get(metric) for metric in query_args['filter']}
+            row['timestamp'] = self._from_ns(timestamp, '%Y-%m-%d %H:%M:%S+00:00')
+            if query_args['symbol'] is not None:
+                row['symbol'] = query_args['symbol']
+            body.append({key: row[key] for key in sorted(row)})
+
+        metadata = {'status_code': 200, 'message': 'OK', 'credits': None,
+                    'server_timestamp': str(pd.Timestamp.now(tz='UTC'))}
+
+        return [{'metadata': metadata, 'body': body}]
@@ -0,0 +1,229 @@
+import datetime
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> datetime.date:
+    """
+    Get the n-th given weekday of a month; negative ``n`` counts from the end of the month.
+    """
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _easter(year: int) -> datetime.date:
+    """
+    Get the date of (Western) Easter Sunday.
+    """
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    day = (h + l - 7 * m + 33 * month + 19) % 32
+
+    return datetime.date(year, month, day)
+
+
+def _observed(date: datetime.date) -> datetime.date:
+    """
+    Move a holiday falling on a weekend to the closest weekday.
+    """
+    if date.weekday() == 5:
+        return date - datetime.timedelta(days=1)
+    if date.weekday() == 6:
+        return date + datetime.timedelta(days=1)
+    return date
+
+
+class NYSECalendar:
+    """
+    Trading calendar of the New York Stock Exchange: weekends, holidays, unscheduled closures and early closes.
+
+    StockGeist's price metrics cover the extended trading session from 08:00 to 17:30 New York time, so the calendar
+    is used by :class:`stockgeist.client.StockGeistClient` to plan page windows of price metrics queries that skip
+    closed periods, and by :meth:`stockgeist.responses.PriceMetricsResponse.visualize` to hide them on charts.
+    Early closes shorten only the regular session, so they don't shorten the planned windows.
+    """
+
+    timezone = 'America/New_York'
+    session_open = pd.Timedelta(hours=8)
+    session_close = pd.Timedelta(hours=17, minutes=30)
+    early_close = pd.Timedelta(hours=13)
+
+    # unscheduled closures
+    special_closures = ['2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14', '2004-06-11', '2007-01-02',
+                        '2012-10-29', '2012-10-30', '2018-12-05', '2025-01-09']
+
+    @lru_cache(maxsize=None)
+    def holidays(self, year: int) -> Tuple[datetime.date, ...]:
+        """
+        Get full-day closures of a year falling on weekdays.
+
+        :param year: Year.
+
+        :return: Sorted tuple of dates.
+        """
+        holidays = [
+            _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+            _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+            _easter(year) - datetime.timedelta(days=2),  # Good Friday
+            _nth_weekday(year, 5, 0, -1),  # Memorial Day
+            _observed(datetime.date(year, 7, 4)),  # Independence Day
+            _nth_weekday(year, 9, 0, 1),  # Labor Day
+            _nth_weekday(year, 11, 3, 4),  # Thanksgiving Day
+            _observed(datetime.date(year, 12, 25)),  # Christmas Day
+        ]
+        # New Year's Day falling on Saturday is not observed on the previous Friday
+        new_year = datetime.date(year, 1, 1)
+        if new_year.weekday() != 5:
+            holidays.append(_observed(new_year))
+        if year >= 2022:
+            holidays.append(_observed(datetime.date(year, 6, 19)))  # Juneteenth
+        holidays.extend(pd.Timestamp(date).date() for date in self.special_closures if date.startswith(str(year)))
+
+        return tuple(sorted(date for date in holidays if date.weekday() < 5))
+
+    @lru_cache(maxsize=None)
+    def early_closes(self, year: int) -> Tuple[datetime.date, ...]:
+        """
+        Get days of a year when the regular session closes at 13:00.
+
+        :param year: Year.
+
+        :return: Sorted tuple of dates.
+        """
+        early_closes = [_nth_weekday(year, 11, 3, 4) + datetime.timedelta(days=1)]  # day after Thanksgiving
+        for date in [datetime.date(year, 7, 3), datetime.date(year, 12, 24)]:
+            # only if the following day is a holiday on a weekday
+            if date.weekday() < 4:
+                early_closes.append(date)
+
+        return tuple(sorted(date for date in early_closes if date not in self.holidays(year)))
+
+    def trading_days(self, start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+        """
+        Get trading days between two dates, inclusive.
+
+        :param start: First date.
+
+        :param end: Last date.
+
+        :return: Naive DatetimeIndex of trading days (midnights).
+        """
+        days = pd.date_range(pd.Timestamp(start.date()), pd.Timestamp(end.date()), freq='D')
+        holidays = {pd.Timestamp(date) for year in range(start.year, end.year + 1) for date in self.holidays(year)}
+
+        return days[(days.weekday < 5) & ~days.isin(holidays)]
+
+    def bars(self, start: str, end: str, timeframe: str) -> np.ndarray:
+        """
+        Get timestamps of all bars of price data expected in a time range.
+
+        :param start: Start of the range (inclusive), UTC.
+
+        :param end: End of the range (exclusive), UTC.
+
+        :param timeframe: Time resolution of data. Possible values are 5m, 1h, 1d.
+
+        :return: Sorted array of bar timestamps as int64 nanoseconds since epoch (UTC).
+        """
+        start, end = pd.Timestamp(start, tz='UTC'), pd.Timestamp(end, tz='UTC')
+        step = pd.Timedelta(timeframe)
+        days = self.trading_days(start - pd.Timedelta(days=1), end + pd.Timedelta(days=1))
+
+        if step >= pd.Timedelta(days=1):
+            # daily bars are stamped with midnight UTC of the trading day
+            bars = days.tz_localize('UTC').asi8
+        else:
+            opens = (days + self.session_open).tz_localize(self.timezone).tz_convert('UTC').asi8
+            # only whole bars are served - no 1h bar starts at 17:00
+            n_bars = (self.session_close - self.session_open).value // step.value
+            bars = (opens[:, None] + np.arange(n_bars, dtype=np.int64)[None, :] * step.value).ravel()
+
+        return bars[(bars >= start.value) & (bars < end.value)]
+
+    def plan_windows(self, start: str, end: str, timeframe: str, page_size: int) -> List[Tuple[str, str]]:
+        """
+        Plan windows of pages of a price metrics query so that every page ends right after a bar of an open market
+        and no page covers only closed periods. REST API serves a page as the window of ``page_size`` bars of
+        wall-clock time ending at the ``end`` argument.
+
+        :param start: Start of the query (inclusive), UTC.
+
+        :param end: End of the query (exclusive), UTC.
+
+        :param timeframe: Time resolution of data. Possible values are 5m, 1h, 1d.
+
+        :param page_size: Maximum number of bars returned in a single page.
+
+        :return: list of (start, end) tuples ordered from the latest window to the earliest one.
+        """
+        bars = self.bars(start, end, timeframe)
+        step = pd.Timedelta(timeframe).value
+        start_ns, end_ns = pd.Timestamp(start, tz='UTC').value, pd.Timestamp(end, tz='UTC').value
+
+        def fmt(timestamp):
+            return pd.Timestamp(timestamp, tz='UTC').strftime('%Y-%m-%dT%H:%M:%S')
+
+        windows = []
+        i = len(bars) - 1
+        while i >= 0:
+            window_end = min(end_ns, int(bars[i]) + step)
+            window_start = max(start_ns, window_end - page_size * step)
+            windows.append((fmt(window_start), fmt(window_end)))
+            # the latest bar before the window
+            i = int(np.searchsorted(bars, window_start, side='left')) - 1
+
+        return windows
+
+    def rangebreaks(self, timestamps: pd.DatetimeIndex, timeframe: str) -> List[Dict]:
+        """
+        Get plotly rangebreaks hiding closed periods in the span of the data.
+
+        :param timestamps: Timestamps of the data (UTC).
+
+        :param timeframe: Time resolution of data. Possible values are 5m, 1h, 1d.
+
+        :return: list of rangebreak dicts.
+        """
+        rangebreaks = []
+        if len(timestamps) == 0:
+            return rangebreaks
+
+        first, last = timestamps.min(), timestamps.max()
+        if pd.Timedelta(timeframe) < pd.Timedelta(days=1):
+            # session hours in UTC depend on daylight saving time; hide only hours closed on every day of the span
+            days = self.trading_days(first, last)
+            opens = (days + self.session_open).tz_localize(self.timezone).tz_convert('UTC')
+            closes = (days + self.session_close).tz_localize(self.timezone).tz_convert('UTC')
+            if len(days):
+                hour = lambda index: index.hour + index.minute / 60
+                rangebreaks.append(dict(bounds=[float(hour(closes).max()), float(hour(opens).min())], pattern='hour'))
+
+        rangebreaks.append(dict(bounds=['sat', 'mon']))
+
+        holidays = [date.strftime('%Y-%m-%d') for year in range(first.year, last.year + 1)
+                    for date in self.holidays(year) if first.date() <= date <= last.date()]
+        if holidays:
+            rangebreaks.append(dict(values=holidays))
+
+        return rangebreaks
+
+    def __repr__(self):  # pragma: no cover
+        return f'<NYSE calendar>\n' \
+               f'  session: {self.session_open} - {self.session_close} {self.timezone}'
+
+
+# calendar of the exchanges covered by StockGeist's price metrics
+nyse = NYSECalendar()
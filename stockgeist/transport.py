@@ -0,0 +1,152 @@
+import gzip
+import json
+import os
+import threading
+from typing import Dict, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+
+class CassetteResponse:
+    """
+    Minimal stand-in for ``requests.Response`` serving a page from a cassette.
+    """
+
+    def __init__(self, content: bytes, status_code: int):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {'Content-Type': 'application/json'}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class CassetteTransport:
+    """
+    HTTP transport of :class:`stockgeist.client.StockGeistClient` recording responses of REST API to a local
+    cassette file and replaying them without any network access, e.g. to re-run backtests or tests deterministically::
+
+        client = StockGeistClient(token, transport=CassetteTransport('backtest.cassette.gz', mode='record'))
+        ...
+        client = StockGeistClient(token, transport=CassetteTransport('backtest.cassette.gz', mode='replay'))
+
+    Responses are keyed by the endpoint and query arguments without the token, so a cassette recorded with one token
+    can be replayed with any other. The cassette is a gzip-compressed file of JSON lines, one per response; new
+    responses are appended as soon as they are received and the whole cassette is held in memory.
+    """
+
+    modes = ('record', 'replay', 'auto')
+
+    def __init__(self, path: str, mode: str = 'auto'):
+        """
+        :param path: Path of the cassette file.
+
+        :param mode: ``record`` sends every request to REST API and records successful responses, ``replay`` serves
+            only recorded responses and raises an Exception for any other request, ``auto`` replays recorded
+            responses and records the missing ones.
+        """
+        if mode not in self.modes:
+            raise Exception(f'Unknown cassette mode: {mode}! Possible values are: {", ".join(self.modes)}.')
+
+        self._path = path
+        self._mode = mode
+        self._session = None
+        self._lock = threading.Lock()
+        self._entries = self._load(path)
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Tuple[int, bytes]]:
+        """
+        Load all responses recorded in a cassette.
+
+        :param path: Path of the cassette file.
+
+        :return: Dict mapping request keys to (status code, content) tuples.
+        """
+        entries = {}
+        if os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    entries[entry['key']] = (entry['status_code'], entry['content'].encode('utf-8'))
+        return entries
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """
+        Get the key of a request - its path and query arguments without the token.
+
+        :param url: Request URL.
+
+        :return: Request key.
+        """
+        parts = urlsplit(url)
+        args = [(name, value) for name, value in parse_qsl(parts.query) if name != 'token']
+        return f'{parts.path.strip("/")}?{urlencode(args)}'
+
+    def mount(self, session) -> 'CassetteTransport':
+        """
+        Set the HTTP session used for requests which are not replayed.
+
+        :param session: HTTP session, e.g. ``requests.Session``.
+
+        :return: The transport itself.
+        """
+        self._session = session
+        return self
+
+    def get(self, url: str, **kwargs):
+        """
+        Serve a request from the cassette or send it to REST API, depending on the mode.
+
+        :param url: Request URL.
+
+        :param kwargs: Arguments of the request passed to the underlying session.
+
+        :return: Response object.
+        """
+        key = self._key(url)
+
+        if self._mode != 'record':
+            entry = self._entries.get(key)
+            if entry is not None:
+                return CassetteResponse(entry[1], entry[0])
+            if self._mode == 'replay':
+                raise Exception(f'Request {key} is not recorded in cassette {self._path}!')
+
+        if self._session is None:
+            raise Exception('CassetteTransport has no HTTP session to send requests with!')
+        response = self._session.get(url, **kwargs)
+
+        # don't record transient errors
+        if response.status_code == 200:
+            self._record(key, response.status_code, response.content)
+
+        return response
+
+    def _record(self, key: str, status_code: int, content: bytes) -> None:
+        line = json.dumps({'key': key, 'status_code': status_code, 'content': content.decode('utf-8')})
+        with self._lock:
+            self._entries[key] = (status_code, content)
+            # appending produces a multi-member gzip file which is read back as a single stream
+            with gzip.open(self._path, 'at', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session.
+        """
+        if self._session is not None:
+            self._session.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def __repr__(self):  # pragma: no cover
+        return f'<cassette transport>\n' \
+               f'  path: {self._path}\n' \
+               f'  mode: {self._mode}\n' \
+               f'  responses: {len(self._entries)}'
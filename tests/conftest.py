@@ -0,0 +1,194 @@
+import asyncio
+import json
+import pickle
+from urllib.parse import urlsplit, parse_qsl
+
+import pandas as pd
+import pytest
+
+
+class FakeResponse:
+    """
+    Minimal stand-in for ``requests.Response`` serving a single API page.
+    """
+
+    def __init__(self, page):
+        self.content = json.dumps(page).encode('utf-8')
+        self.status_code = page['metadata']['status_code']
+        self.headers = {'Content-Type': 'application/json'}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeApi:
+    """
+    Offline emulation of StockGeist's REST API built from the pickled pages in ``tests/data``.
+
+    Time series pages are served the same way the real API does it: a page covers at most ``page_size`` bars
+    ending (exclusively) at the ``end`` query argument and never goes past ``start``.
+    """
+
+    page_size = 50
+
+    def __init__(self):
+        self._series = {}
+        self._snapshots = {}
+        self.credits = 1000000
+        self.queries = []
+        self._failures = []
+
+    def add_pages(self, endpoint_name, symbol, timeframe, pages):
+        rows = [row for page in pages for row in page['body']]
+        rows = sorted(rows, key=lambda row: row['timestamp'])
+        self._series[(endpoint_name, str(symbol), timeframe)] = rows
+
+    def add_pickle(self, endpoint_name, symbol, timeframe, path):
+        self.add_pages(endpoint_name, symbol, timeframe, pickle.load(open(path, 'rb')))
+
+    def add_snapshot(self, endpoint_name, body):
+        self._snapshots[endpoint_name] = body
+
+    def fail(self, status_code, times=1, after=0):
+        """
+        Make ``times`` requests following the next ``after`` ones fail with ``status_code``.
+        """
+        self._failures = [None] * after + [status_code] * times
+
+    def _metadata(self, status_code=200, message='OK'):
+        return {'status_code': status_code, 'message': message, 'credits': self.credits,
+                'server_timestamp': '2021-06-23 10:20:12.617781+00:00'}
+
+    def respond(self, url):
+        parts = urlsplit(url)
+        endpoint_name = parts.path.strip('/')
+        args = dict(parse_qsl(parts.query))
+        self.queries.append((endpoint_name, args))
+
+        if self._failures:
+            status_code = self._failures.pop(0)
+            if status_code is not None:
+                return {'metadata': self._metadata(status_code, 'Service Unavailable'), 'body': []}
+
+        if endpoint_name.startswith('snapshot/'):
+            body = self._snapshots.get(endpoint_name, {})
+            return {'metadata': self._metadata(), 'body': body}
+
+        key = (endpoint_name, args.get('symbol', 'None'), args['timeframe'])
+        if key not in self._series:
+            return {'metadata': self._metadata(404, 'Not Found'), 'body': []}
+        rows = self._series[key]
+
+        # page window [end - page_size * timeframe, end)
+        step = pd.Timedelta(args['timeframe']) * self.page_size
+        if 'end' in args:
+            end = pd.Timestamp(args['end'], tz='UTC')
+        else:
+            end = pd.Timestamp(rows[-1]['timestamp']) + pd.Timedelta(args['timeframe'])
+        start = end - step
+        if 'start' in args:
+            start = max(start, pd.Timestamp(args['start'], tz='UTC'))
+
+        lo = start.strftime('%Y-%m-%d %H:%M:%S+00:00')
+        hi = end.strftime('%Y-%m-%d %H:%M:%S+00:00')
+        metrics = set(args['filter'].split(',')) | {'timestamp', 'symbol'} if 'filter' in args else None
+        body = [{name: val for name, val in row.items() if metrics is None or name in metrics}
+                for row in rows if lo <= row['timestamp'] < hi]
+        self.credits -= len(body)
+
+        return {'metadata': self._metadata(), 'body': body}
+
+
+class FakeSession:
+    """
+    Synchronous session routing every GET request to a ``FakeApi``.
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self.request_kwargs = None
+
+    def get(self, url, **kwargs):
+        self.request_kwargs = kwargs
+        return FakeResponse(self.api.respond(url))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_api():
+    api = FakeApi()
+    for endpoint, symbol in [('message-metrics', 'TSLA'), ('article-metrics', 'NVDA'), ('price-metrics', 'GILD'),
+                             ('topic-metrics', 'AAPL'), ('ranking-metrics', 'A'), ('ranking-metrics', None)]:
+        for timeframe in ['5m', '1h', '1d']:
+            api.add_pickle(f'time-series/{endpoint}', symbol, timeframe,
+                           f'tests/data/{endpoint}/{symbol}-{timeframe}-all-metrics.pkl')
+    api.add_snapshot('snapshot/symbols', {'symbols': {'stocks': ['AAPL', 'GILD', 'NVDA', 'TSLA'], 'crypto': ['BTC']},
+                                          'timestamp': '2021-06-23 00:00:00+00:00'})
+    api.add_snapshot('snapshot/fundamentals', {'symbol': 'AAPL', 'market_cap': 2.2e12,
+                                               'timestamp': '2021-06-23 00:00:00+00:00'})
+    return api
+
+
+@pytest.fixture
+def fake_session(fake_api):
+    return FakeSession(fake_api)
+
+
+class FakeAsyncResponse:
+    """
+    Minimal stand-in for ``aiohttp.ClientResponse`` serving a single API page.
+    """
+
+    def __init__(self, page):
+        self._response = FakeResponse(page)
+        self.status = self._response.status_code
+        self.headers = self._response.headers
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def read(self):
+        return self._response.content
+
+    async def json(self, content_type='application/json'):
+        return self._response.json()
+
+
+class FakeAsyncSession:
+    """
+    Asynchronous session routing every GET request to a ``FakeApi`` and recording the peak number of requests
+    in flight.
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url, **kwargs):
+        session = self
+
+        class _Request:
+            async def __aenter__(self):
+                session.in_flight += 1
+                session.max_in_flight = max(session.max_in_flight, session.in_flight)
+                await asyncio.sleep(0.001)
+                return FakeAsyncResponse(session.api.respond(url))
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                session.in_flight -= 1
+
+        return _Request()
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_async_session(fake_api):
+    return FakeAsyncSession(fake_api)
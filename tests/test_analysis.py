@@ -0,0 +1,85 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stockgeist import MessageMetricsResponse, PanelResponse
+from stockgeist.analysis import RollingStats
+
+
+def load_message_metrics():
+    test_data = pickle.load(open(f'tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': None, 'start': None, 'end': None}
+    return MessageMetricsResponse(test_data, query_args)
+
+
+def test_rolling_stats_match_pandas():
+    df = load_message_metrics().as_dataframe
+
+    stats = RollingStats(window=12)
+    for i in range(len(df)):
+        zscores = stats.update('TSLA', df.iloc[i].to_dict())
+
+    x = df['total_count']
+    mean, std = x.rolling(12).mean(), x.rolling(12).std()
+    result = stats.get('TSLA', 'total_count')
+    assert result['count'] == 12 and result['last'] == x.iloc[-1]
+    assert result['mean'] == pytest.approx(mean.iloc[-1])
+    assert result['std'] == pytest.approx(std.iloc[-1])
+    assert result['ewma'] == pytest.approx(x.ewm(span=12, adjust=False).mean().iloc[-1])
+    assert zscores['total_count'] == pytest.approx(((x - mean) / std).iloc[-1])
+    assert len(stats) == len(df.columns)
+
+
+def test_rolling_stats_add_response():
+    response = load_message_metrics()
+    df = response.as_dataframe
+
+    # batch initialization gives the same state as updates row by row
+    incremental = RollingStats(window=24, metrics=('total_count', 'pos_index'))
+    incremental.update('TSLA', {name: df[name].tolist() for name in df.columns})
+    batch = RollingStats(window=24, metrics=('total_count', 'pos_index'))
+    batch.add_response(response)
+
+    assert batch.keys == [('TSLA', 'total_count'), ('TSLA', 'pos_index')]
+    pd.testing.assert_frame_equal(batch.as_dataframe, incremental.as_dataframe)
+
+    # updates continue from the history
+    batch.update('TSLA', {'total_count': 1000., 'timestamp': '2021-06-20 15:40:00+00:00'})
+    spikes = batch.spikes(threshold=3.)
+    assert spikes == [('TSLA', 'total_count', batch.get('TSLA', 'total_count')['zscore'])] and spikes[0][2] > 3
+
+    # all symbols of a panel
+    panel = RollingStats(window=24, metrics=('total_count',))
+    panel.add_response(PanelResponse({'TSLA': response, 'AAPL': response}, {}, {}))
+    assert panel.keys == [('TSLA', 'total_count'), ('AAPL', 'total_count')]
+
+
+def test_rolling_stats_many_series():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(100, 500))
+
+    stats = RollingStats(window=20, span=10)
+    for i in range(values.shape[0]):
+        stats.update(None, {f'metric-{j}': values[i, j] for j in range(values.shape[1])})
+
+    df = stats.as_dataframe
+    assert len(df) == 500
+    expected = pd.DataFrame(values).rolling(20).std().iloc[-1].to_numpy()
+    np.testing.assert_allclose(df['std'].to_numpy(), expected)
+
+
+def test_rolling_stats_missing_values():
+    stats = RollingStats(window=3, metrics=('total_count',))
+
+    # missing values and non-numeric columns are skipped
+    assert stats.update('TSLA', {'total_count': [1., None, 2.], 'titles': [['a'], [], ['b']]}) == \
+           {'total_count': pytest.approx(0.7071067811865476)}
+    assert stats.get('TSLA', 'total_count')['count'] == 2
+
+    assert stats.update('TSLA', {'titles': ['a']}) == {}
+    assert RollingStats(window=3).as_dataframe.empty
+
+    with pytest.raises(Exception, match='at least 2'):
+        RollingStats(window=1)
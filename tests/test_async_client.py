@@ -0,0 +1,98 @@
+import asyncio
+import pickle
+
+import pytest
+
+from stockgeist import AsyncStockGeistClient, MessageMetricsResponse, PriceMetricsResponse, SymbolsResponse
+
+
+def test_async_client_created_successfully():
+    client = AsyncStockGeistClient('test-token', max_concurrency=3)
+    assert isinstance(client, AsyncStockGeistClient)
+
+
+def test_async_client_get_message_metrics(fake_async_session):
+    # load expected result
+    query_args = {'symbol': 'TSLA',
+                  'timeframe': '5m',
+                  'filter': ('total_count', 'ma_diff'),
+                  'start': '2021-06-20T00:05:00',
+                  'end': '2021-06-20T15:40:00'}
+    test_case = pickle.load(open(f'tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    test_case = MessageMetricsResponse(test_case, query_args).as_dict
+
+    # get actual result
+    client = AsyncStockGeistClient('test-token')
+    client._session = fake_async_session
+    res = asyncio.run(client.get_message_metrics(**query_args))
+
+    assert isinstance(res, MessageMetricsResponse)
+    assert res.as_dict['total_count'] == test_case['total_count']
+    assert res.as_dict['timestamp'] == test_case['timestamp']
+
+
+def test_async_client_concurrency_limit(fake_async_session):
+    async def fetch_all(client):
+        return await asyncio.gather(*[client.get_price_metrics('GILD', timeframe, ('close',),
+                                                               '2021-04-19T00:05:00', '2021-04-20T15:40:00')
+                                      for timeframe in ['5m', '1h', '1d'] * 4])
+
+    client = AsyncStockGeistClient('test-token', max_concurrency=2)
+    client._session = fake_async_session
+    res = asyncio.run(fetch_all(client))
+
+    assert all(isinstance(entry, PriceMetricsResponse) for entry in res)
+    assert fake_async_session.max_in_flight == 2
+
+
+def test_async_client_snapshot_endpoints(fake_async_session):
+    async def fetch(client):
+        async with client:
+            return await client.get_symbols(), await client.get_credits()
+
+    client = AsyncStockGeistClient('test-token')
+    client._session = fake_async_session
+    symbols, credits = asyncio.run(fetch(client))
+
+    assert isinstance(symbols, SymbolsResponse) and 'AAPL' in symbols.as_dict['stocks']
+    assert credits == fake_async_session.api.credits
+
+
+def test_async_client_retries_transient_errors(fake_api, fake_async_session, monkeypatch):
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+    client = AsyncStockGeistClient('test-token')
+    client._session = fake_async_session
+    test_case = asyncio.run(client.get_message_metrics(**query_args)).as_dict
+
+    client = AsyncStockGeistClient('test-token', max_retries=2)
+    client._session = fake_async_session
+    client.scheduler._backoff = 0.
+    fake_api.fail(502, times=2, after=2)
+    res = asyncio.run(client.get_message_metrics(**query_args))
+
+    assert res.as_dict == test_case and client.scheduler.retries == 2
+
+
+def test_async_client_retries_network_errors(fake_api, fake_async_session, monkeypatch):
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+    client = AsyncStockGeistClient('test-token')
+    client._session = fake_async_session
+    test_case = asyncio.run(client.get_message_metrics(**query_args)).as_dict
+
+    # the second request times out
+    get = fake_async_session.get
+    errors = [None, asyncio.TimeoutError()]
+
+    def flaky_get(url, **kwargs):
+        error = errors.pop(0) if errors else None
+        if error is not None:
+            raise error
+        return get(url, **kwargs)
+
+    monkeypatch.setattr(fake_async_session, 'get', flaky_get)
+    client.scheduler._backoff = 0.
+    res = asyncio.run(client.get_message_metrics(**query_args))
+
+    assert res.as_dict == test_case and client.scheduler.retries == 1
@@ -0,0 +1,41 @@
+import math
+
+import pytest
+
+from benchmarks.run import compare, run_benchmarks
+from benchmarks.synthetic import PAGE_SIZE, SOURCES, SyntheticSession, query_args, synthetic_pages
+from stockgeist import StockGeistClient, MessageMetricsResponse
+
+
+def test_synthetic_pages_replay():
+    pages = synthetic_pages('message-metrics', 1234)
+    client = StockGeistClient('test-token', progress=False)
+    client._session = SyntheticSession(pages, '5m')
+
+    args = query_args('message-metrics', 1234)
+    res = MessageMetricsResponse(client._fetch_data_time_series('time-series/message-metrics', args), args)
+
+    assert len(res.timestamps) == 1234 and res.as_dict == MessageMetricsResponse(pages, args).as_dict
+
+
+def test_benchmarks_smoke():
+    results = run_benchmarks(['price-metrics'], [200], [100], repeat=1)
+
+    assert set(results) == {'fetch/price-metrics/200', 'fetch-4-workers/price-metrics/200',
+                            'convert/price-metrics/200', 'as_dataframe/price-metrics/200',
+                            'visualize/price-metrics/recorded', 'visualize-candlesticks/price-metrics/recorded',
+                            'visualize/price-metrics/100', 'visualize-candlesticks/price-metrics/100'}
+    assert all(result['min'] <= result['median'] for result in results.values())
+    assert all(results[f'{name}/price-metrics/200']['rows'] == 200
+               for name in ['fetch', 'fetch-4-workers', 'convert', 'as_dataframe'])
+    assert len(compare(results, results)) == len(results) + 1
+
+
+@pytest.mark.parametrize('endpoint', list(SOURCES))
+def test_benchmarks_fetch_all_rows(endpoint):
+    n_rows = 1234
+    results = run_benchmarks([endpoint], [n_rows], [], repeat=1, select='fetch')
+
+    assert len(results) == 2
+    for result in results.values():
+        assert result['rows'] == n_rows and result['pages'] == math.ceil(n_rows / PAGE_SIZE)
@@ -1,10 +1,16 @@
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from stockgeist import StockGeistClient, MessageMetricsResponse, ArticleMetricsResponse, PriceMetricsResponse, \
-    TopicMetricsResponse, RankingMetricsResponse, SymbolsResponse, FundamentalsResponse
+    TopicMetricsResponse, RankingMetricsResponse, SymbolsResponse, FundamentalsResponse, PanelResponse
 from dotenv import load_dotenv
 import pytest
 import pickle
+import pandas as pd
+import requests
 
 load_dotenv()
 
@@ -99,7 +105,6 @@ def test_client_fetch_data_article_metrics(api_connection, timeframe, start, end
 def test_client_fetch_data_price_metrics(api_connection, timeframe, start, end):
     # load expected result
     test_case = pickle.load(open(f'tests/data/price-metrics/GILD-{timeframe}-all-metrics.pkl', 'rb'))
-    test_case = [entry['body'] for entry in test_case]
 
     # get actual result
     query_args = {'symbol': 'GILD',
@@ -108,9 +113,10 @@ def test_client_fetch_data_price_metrics(api_connection, timeframe, start, end):
                   'start': start,
                   'end': end}
     actual_result = api_connection._fetch_data_time_series('time-series/price-metrics', query_args)
-    actual_result = [entry['body'] for entry in actual_result]
 
-    assert test_case == actual_result
+    # pages are planned with the trading calendar, so they are split differently than the recorded ones
+    rows = lambda res: sorted((row for page in res for row in page['body']), key=lambda row: row['timestamp'])
+    assert rows(test_case) == rows(actual_result)
 
 
 @pytest.mark.parametrize('timeframe, start, end',
@@ -305,3 +311,450 @@ def test_client_get_fundamentals(api_connection):
 
     assert set(metrics) == set(fundamentals)
 
+
+
+@pytest.mark.parametrize('endpoint, symbol, timeframe, start, end',
+                         [('message-metrics', 'TSLA', '5m', '2021-06-20T00:05:00', '2021-06-20T15:40:00'),
+                          ('article-metrics', 'NVDA', '1h', '2021-05-18T00:00:00', '2021-05-20T03:00:00'),
+                          ('price-metrics', 'GILD', '5m', '2021-04-19T00:05:00', '2021-04-20T15:40:00'),
+                          ('price-metrics', 'GILD', '1h', '2021-05-18T00:00:00', '2021-05-20T03:00:00'),
+                          ('ranking-metrics', None, '1d', '2021-06-01T00:00:00', '2021-06-05T00:00:00')])
+def test_client_fetch_data_time_series_offline(fake_session, endpoint, symbol, timeframe, start, end):
+    # load expected result
+    test_case = pickle.load(open(f'tests/data/{endpoint}/{symbol}-{timeframe}-all-metrics.pkl', 'rb'))
+    test_case = [entry['body'] for entry in test_case]
+
+    # get actual result - pages of price metrics are recorded without the trading calendar
+    client = StockGeistClient('test-token', calendar=False)
+    client._session = fake_session
+    query_args = {'symbol': symbol, 'timeframe': timeframe, 'start': start, 'end': end}
+    actual_result = client._fetch_data_time_series(f'time-series/{endpoint}', query_args)
+    actual_result = [entry['body'] for entry in actual_result]
+
+    assert test_case == actual_result
+
+
+@pytest.mark.parametrize('timeframe, start, end', [('5m', '2021-04-19T00:05:00', '2021-04-20T15:40:00'),
+                                                   ('1h', '2021-05-18T00:00:00', '2021-05-20T03:00:00')])
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_client_fetch_data_price_metrics_calendar(fake_session, fake_api, timeframe, start, end, max_workers):
+    query_args = {'symbol': 'GILD', 'timeframe': timeframe, 'filter': None, 'start': start, 'end': end}
+
+    # page backwards through the whole range
+    client = StockGeistClient('test-token', calendar=False)
+    client._session = fake_session
+    test_case = client._fetch_data_time_series('time-series/price-metrics', query_args)
+    n_requests = len(fake_api.queries)
+
+    # pages planned with the trading calendar
+    fake_api.queries.clear()
+    client = StockGeistClient('test-token', max_workers=max_workers)
+    client._session = fake_session
+    actual_result = client._fetch_data_time_series('time-series/price-metrics', query_args)
+
+    # pages are split differently, rows within a page are ordered from the earliest one
+    rows = lambda res: sorted((row for page in res for row in page['body']), key=lambda row: row['timestamp'])
+    assert rows(actual_result) == rows(test_case)
+    assert all(len(page['body']) for page in actual_result)
+    assert len(fake_api.queries) == len(actual_result) < n_requests
+
+
+@pytest.mark.parametrize('endpoint, symbol, timeframe, start, end, response_class',
+                         [('message-metrics', 'TSLA', '5m', '2021-06-20T00:05:00', '2021-06-20T15:40:00',
+                           MessageMetricsResponse),
+                          ('article-metrics', 'NVDA', '1h', '2021-05-18T00:00:00', '2021-05-20T03:00:00',
+                           ArticleMetricsResponse),
+                          ('price-metrics', 'GILD', '5m', '2021-04-19T00:05:00', '2021-04-20T15:40:00',
+                           PriceMetricsResponse)])
+def test_client_fetch_data_time_series_parallel(fake_session, endpoint, symbol, timeframe, start, end,
+                                                response_class):
+    query_args = {'symbol': symbol, 'timeframe': timeframe, 'filter': None, 'start': start, 'end': end}
+
+    # serial fetching
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    test_case = response_class(client._fetch_data_time_series(f'time-series/{endpoint}', query_args), query_args)
+
+    # range-split fetching
+    client = StockGeistClient('test-token', max_workers=4)
+    client._session = fake_session
+    actual_result = response_class(client._fetch_data_time_series(f'time-series/{endpoint}', query_args),
+                                   query_args)
+
+    assert test_case.as_dict == actual_result.as_dict
+    assert query_args['end'] == end
+
+
+def test_client_split_range():
+    client = StockGeistClient('test-token')
+    windows = client._split_range({'symbol': 'TSLA', 'timeframe': '5m', 'filter': None,
+                                   'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'})
+
+    assert [(window['start'], window['end']) for window in windows] == \
+           [('2021-06-20T11:30:00', '2021-06-20T15:40:00'),
+            ('2021-06-20T07:20:00', '2021-06-20T11:30:00'),
+            ('2021-06-20T03:10:00', '2021-06-20T07:20:00'),
+            ('2021-06-20T00:05:00', '2021-06-20T03:10:00')]
+
+
+@pytest.mark.parametrize('chronological', [False, True])
+def test_client_iter_price_metrics(fake_session, chronological):
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    query_args = {'symbol': 'GILD', 'timeframe': '5m', 'filter': ('open', 'close'),
+                  'start': '2021-04-19T00:05:00', 'end': '2021-04-20T15:40:00'}
+    test_case = client.get_price_metrics(**query_args).as_dict
+
+    chunks = list(client.iter_price_metrics(**query_args, chronological=chronological))
+    if not chronological:
+        chunks = chunks[::-1]
+
+    assert all(len(chunk['timestamp']) != 0 for chunk in chunks)
+    for key in test_case:
+        assert [val for chunk in chunks for val in chunk[key]] == test_case[key]
+
+
+def test_client_iter_message_metrics_dataframe(fake_session):
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+    test_case = client.get_message_metrics(**query_args).as_dataframe
+
+    chunks = client.iter_message_metrics(**query_args, chronological=True, as_dataframe=True)
+
+    pd.testing.assert_frame_equal(pd.concat(list(chunks)), test_case)
+
+
+def test_client_iter_errors(fake_session):
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+
+    with pytest.raises(Exception):
+        client.iter_message_metrics('TSLA', chronological=True)
+    with pytest.raises(Exception):
+        list(client.iter_message_metrics('UNKNOWN', start='2021-06-20T00:05:00', end='2021-06-20T15:40:00'))
+
+
+def test_client_retries_transient_errors(fake_api, fake_session, monkeypatch):
+    monkeypatch.setattr('stockgeist.client.time.sleep', lambda delay: None)
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    test_case = client.get_message_metrics(**query_args).as_dict
+
+    # the second page fails twice
+    fake_api.fail(503, times=1, after=1)
+    fake_api._failures.append(429)
+    actual_result = client.get_message_metrics(**query_args)
+
+    assert actual_result.as_dict == test_case
+    assert client.scheduler.retries == 2 and client.scheduler.credits == fake_api.credits
+
+
+def test_client_retries_network_errors(fake_api, fake_session, monkeypatch):
+    monkeypatch.setattr('stockgeist.client.time.sleep', lambda delay: None)
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+
+    client = StockGeistClient('test-token', max_retries=2)
+    client._session = fake_session
+    test_case = client.get_message_metrics(**query_args).as_dict
+
+    # the second page times out, then the connection drops
+    errors = [None, requests.exceptions.ReadTimeout('read timed out'), requests.exceptions.ConnectionError('reset')]
+    get = fake_session.get
+
+    def flaky_get(url, **kwargs):
+        error = errors.pop(0) if errors else None
+        if error is not None:
+            raise error
+        return get(url, **kwargs)
+
+    monkeypatch.setattr(fake_session, 'get', flaky_get)
+    assert client.get_message_metrics(**query_args).as_dict == test_case
+    assert client.scheduler.retries == 2
+
+    # pages fetched before the retries ran out are kept
+    errors = [None] + [requests.exceptions.ConnectTimeout('timed out')] * 3
+    res = client.get_message_metrics(**query_args)
+    assert res.status_codes == [200, 599] and len(res.as_dict['timestamp']) == 50
+
+
+def test_client_retries_truncated_responses(fake_api, fake_session, monkeypatch, caplog):
+    monkeypatch.setattr('stockgeist.client.time.sleep', lambda delay: None)
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+
+    client = StockGeistClient('test-token', max_retries=1)
+    client._session = fake_session
+    test_case = client.get_message_metrics(**query_args).as_dict
+
+    # the body of the second page is cut off although the status code is 200
+    get = fake_session.get
+    truncated = [False, True]
+
+    def truncating_get(url, **kwargs):
+        response = get(url, **kwargs)
+        if truncated and truncated.pop(0):
+            response.content = response.content[:100]
+        return response
+
+    monkeypatch.setattr(fake_session, 'get', truncating_get)
+    assert client.get_message_metrics(**query_args).as_dict == test_case
+    assert client.scheduler.retries == 1 and "Invalid response (HTTP 200, 100 bytes) can't be decoded" in caplog.text
+
+    # a page which stays invalid isn't taken for the end of data
+    truncated = [False, True, True]
+    res = client.get_message_metrics(**query_args)
+    assert res.status_codes == [200, 599] and 'incomplete' in caplog.text
+
+
+def test_client_warns_about_incomplete_data(fake_api, fake_session, monkeypatch, caplog):
+    monkeypatch.setattr('stockgeist.client.time.sleep', lambda delay: None)
+
+    client = StockGeistClient('test-token', max_retries=1)
+    client._session = fake_session
+    fake_api.fail(503, times=2, after=1)
+    res = client.get_message_metrics('TSLA', start='2021-06-20T00:05:00', end='2021-06-20T15:40:00')
+
+    assert res.status_codes == [200, 503]
+    assert 'incomplete' in caplog.text
+
+
+def test_client_credit_reserve(fake_api, fake_session, caplog):
+    client = StockGeistClient('test-token', credit_reserve=fake_api.credits - 100)
+    client._session = fake_session
+
+    # fetching stops before the balance runs out, keeping the pages already paid for
+    res = client.get_message_metrics('TSLA', start='2021-06-20T00:05:00', end='2021-06-20T15:40:00')
+    assert len(fake_api.queries) == 3
+    assert res.status_codes == [200, 200, 200, 402]
+    assert len(res.as_dict['timestamp']) == 3 * 50
+    assert res.as_dict['timestamp'][-1] == '2021-06-20 15:35:00+00:00'
+    assert 'below the reserve' in caplog.text
+
+    # concurrent windows stop the same way
+    client = StockGeistClient('test-token', credit_reserve=fake_api.credits - 100, max_workers=2)
+    client._session = fake_session
+    res = client.get_message_metrics('TSLA', timeframe='5m', start='2021-06-20T00:05:00', end='2021-06-20T15:40:00')
+    assert res.status_codes[-1] == 402 and 0 < len(res.as_dict['timestamp']) < 187
+
+
+def test_client_session_options(fake_session):
+    client = StockGeistClient('test-token', max_workers=32, timeout=(3., 30.))
+
+    adapter = client._session.get_adapter('https://api.stockgeist.ai/')
+    assert adapter._pool_maxsize == 32
+    assert 'gzip' in client._session.headers['Accept-Encoding']
+
+    client._session = fake_session
+    with client:
+        client.get_symbols()
+    assert fake_session.request_kwargs == {'timeout': (3., 30.)}
+
+
+def test_client_http2_requires_httpx(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'httpx', None)
+
+    with pytest.raises(Exception):
+        StockGeistClient('test-token', http2=True)
+
+
+def test_client_coalesces_concurrent_queries(fake_api, fake_session, monkeypatch):
+    query_args = {'symbol': 'GILD', 'timeframe': '5m', 'filter': ('close',),
+                  'start': '2021-04-19T00:05:00', 'end': '2021-04-20T15:40:00'}
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    test_case = client.get_price_metrics(**query_args).as_dict
+    n_queries = len(fake_api.queries)
+    balance = fake_api.credits
+
+    # slow down the API so that the queries overlap
+    get = fake_session.get
+    monkeypatch.setattr(fake_session, 'get', lambda url, **kwargs: time.sleep(0.02) or get(url, **kwargs))
+    barrier = threading.Barrier(8)
+
+    def fetch(_):
+        barrier.wait()
+        return client.get_price_metrics(**query_args)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(fetch, range(8)))
+
+    assert len(fake_api.queries) == 2 * n_queries
+    assert all(response.as_dict == test_case for response in responses)
+    assert len(client._in_flight) == 0
+
+    # only the leading query reports the pages and credits
+    stats = client.stats.as_dataframe.loc['time-series/price-metrics']
+    assert stats['calls'] == 9 and stats['shared'] == 7 and stats['pages'] == 2 * n_queries
+    assert stats['credits'] == balance - fake_api.credits
+
+
+def test_client_get_message_metrics_many(fake_api, fake_session):
+    # serve the same data for two symbols
+    fake_api.add_pickle('time-series/message-metrics', 'GME', '5m', 'tests/data/message-metrics/TSLA-5m-all-metrics.pkl')
+
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    panel = client.get_message_metrics_many(['TSLA', 'GME', 'UNKNOWN'], timeframe='5m',
+                                            filter=('total_count', 'ma_diff'),
+                                            start='2021-06-20T00:05:00', end='2021-06-20T15:40:00', max_workers=3)
+
+    assert isinstance(panel, PanelResponse)
+    assert panel.symbols == ['TSLA', 'GME'] and list(panel.errors.keys()) == ['UNKNOWN']
+
+    df = panel.as_dataframe
+    assert df.index.names == ['symbol', 'timestamp'] and len(df) == 2 * 187
+    assert list(df.loc['GME', 'total_count']) == panel['TSLA'].as_dict['total_count']
+    assert df is panel.as_dataframe
+
+
+def test_client_many_to_parquet(fake_api, fake_session, tmp_path):
+    pytest.importorskip('pyarrow')
+    fake_api.add_pickle('time-series/price-metrics', 'AMGN', '1h', 'tests/data/price-metrics/GILD-1h-all-metrics.pkl')
+
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    panel = client.get_price_metrics_many(['GILD', 'AMGN'], timeframe='1h', filter=('close', 'volume'),
+                                          start='2021-05-18T00:00:00', end='2021-05-20T03:00:00')
+    panel.to_parquet(str(tmp_path), partition_by='symbol')
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['symbol=AMGN', 'symbol=GILD']
+    assert panel.as_arrow().num_rows == len(panel.as_dataframe)
+
+
+def test_client_get_fundamentals_many(fake_session):
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    panel = client.get_fundamentals_many(['AAPL', 'TSLA'])
+
+    assert list(panel.as_dataframe.index) == ['AAPL', 'TSLA'] and 'market_cap' in panel.as_dataframe.columns
+
+
+def test_client_snapshot_cache(fake_api, fake_session):
+    client = StockGeistClient('test-token', snapshot_ttl={'snapshot/credits': 60})
+    client._session = fake_session
+
+    # repeated queries are served from cache
+    for _ in range(3):
+        symbols = client.get_symbols()
+        client.get_fundamentals('AAPL')
+        client.get_credits()
+    assert len(fake_api.queries) == 3
+    assert client.snapshot_cache.hits == 6 and client.snapshot_cache.hit_rate == 6 / 9
+    assert all('token' not in key for key in client.snapshot_cache._entries)
+
+    # data of different queries is cached separately
+    client.get_fundamentals('TSLA')
+    assert len(fake_api.queries) == 4
+
+    # invalidated data is fetched again
+    client.snapshot_cache.invalidate('snapshot/symbols')
+    assert client.get_symbols().as_dict == symbols.as_dict
+    assert len(fake_api.queries) == 5 and len(client.snapshot_cache) == 4
+
+
+def test_client_snapshot_cache_ttl(fake_api, fake_session):
+    client = StockGeistClient('test-token', snapshot_ttl={'snapshot/symbols': 0})
+    client._session = fake_session
+
+    client.get_symbols()
+    client.get_symbols()
+    client.get_credits()
+    client.get_credits()
+    assert len(fake_api.queries) == 4
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_client_plan(fake_api, fake_session, max_workers):
+    totals = []
+
+    def progress(iterable, total=None):
+        totals.append(total)
+        return iterable
+
+    client = StockGeistClient('test-token', max_workers=max_workers, progress=progress)
+    client._session = fake_session
+
+    # no requests are sent while planning
+    plan = client.plan('message-metrics', 'TSLA', '5m', filter=('total_count', 'ma'), start='2021-06-20T00:05:00',
+                       end='2021-06-20T15:40:00')
+    assert fake_api.queries == []
+    assert plan.as_dict == {'endpoint': 'time-series/message-metrics', 'pages': 4, 'rows': 187, 'credits': 561,
+                            'eta': 4 / max_workers * StockGeistClient.default_latency}
+    assert [window['end'] for window in plan.windows] == \
+           ['2021-06-20T15:40:00', '2021-06-20T11:30:00', '2021-06-20T07:20:00', '2021-06-20T03:10:00']
+
+    # the plan is fetched as planned, the progress bar knows the number of pages
+    res = client.execute(plan)
+    assert len(fake_api.queries) == 4 and totals == [4]
+    assert len(res.as_dataframe) == 187
+    assert res.as_dict == client.get_message_metrics('TSLA', '5m', filter=('total_count', 'ma'),
+                                                     start='2021-06-20T00:05:00', end='2021-06-20T15:40:00').as_dict
+    assert len(fake_api.queries) == 8 and totals == [4, 4]
+
+
+def test_client_plan_price_metrics(fake_api, fake_session):
+    client = StockGeistClient('test-token', rate_limit=1, progress=False)
+    client._session = fake_session
+
+    # only trading hours of the days are planned
+    plan = client.plan('price-metrics', 'GILD', '5m', start='2021-04-19T00:05:00', end='2021-04-20T15:40:00')
+    assert plan.pages == 4 and plan.rows == 158 and plan.credits == 158 and plan.eta == 4
+
+    res = client.execute(plan)
+    assert len(fake_api.queries) == 4 and len(res.as_dataframe) == 158
+
+    # market closed during the whole range
+    plan = client.plan('price-metrics', 'GILD', '5m', start='2021-04-17T00:00:00', end='2021-04-19T00:00:00')
+    assert plan.pages == plan.rows == 0
+    assert len(client.execute(plan).as_dict) == 0
+
+    with pytest.raises(Exception, match='requires start'):
+        client.plan('price-metrics', 'GILD', '5m')
+    with pytest.raises(Exception, match='Unknown endpoint'):
+        client.plan('options', 'GILD', '5m', start='2021-04-19T00:05:00')
+
+
+def test_client_get_joined(fake_api, fake_session):
+    # data of all endpoints for the same symbol and days
+    fake_api.add_pickle('time-series/price-metrics', 'NVDA', '1h', 'tests/data/price-metrics/GILD-1h-all-metrics.pkl')
+    pages = pickle.load(open('tests/data/message-metrics/TSLA-1h-all-metrics.pkl', 'rb'))
+    for row in (row for page in pages for row in page['body']):
+        row['timestamp'] = str(pd.Timestamp(row['timestamp']) - pd.Timedelta(days=31))
+    fake_api.add_pages('time-series/message-metrics', 'NVDA', '1h', pages)
+
+    client = StockGeistClient('test-token', progress=False)
+    client._session = fake_session
+    query_args = {'symbol': 'NVDA', 'timeframe': '1h', 'start': '2021-05-18T00:00:00', 'end': '2021-05-20T03:00:00'}
+    balance = client.get_credits()
+    df = client.get_joined(**query_args, filters={'price-metrics': ('close', 'volume')})
+
+    # concurrent fetches of the endpoints don't count each other's credits
+    assert client.stats.as_dataframe['credits'].sum() == balance - fake_api.credits > 0
+
+    assert list(df.columns) == [('message-metrics', 'total_count'), ('article-metrics', 'titles'),
+                                ('price-metrics', 'close'), ('price-metrics', 'volume')]
+    assert df.columns.names == ['endpoint', 'metric']
+    assert len(df) == 51 and df.index.is_monotonic_increasing and str(df.index.tz) == 'UTC'
+
+    # message and article metrics are aligned exactly
+    messages = client.get_message_metrics(**query_args).as_dataframe
+    assert df['message-metrics', 'total_count'].tolist() == messages['total_count'].tolist()
+
+    # price metrics are joined as-of - closed hours get the last bar of the session
+    prices = client.get_price_metrics(**query_args).as_dataframe
+    assert df['price-metrics', 'close'][:'2021-05-18 11:00'].isna().all()
+    assert df.loc['2021-05-18 15:00', ('price-metrics', 'close')] == prices.loc['2021-05-18 15:00', 'close']
+    assert df.loc['2021-05-19 03:00', ('price-metrics', 'close')] == prices.loc['2021-05-18 20:00', 'close']
+
+    df = client.get_joined(**query_args, endpoints=('message-metrics', 'price-metrics'), tolerance='1h')
+    assert df.loc['2021-05-18 21:00', ('price-metrics', 'close')] == prices.loc['2021-05-18 20:00', 'close']
+    assert df['price-metrics', 'close'].isna().sum() == 51 - 18 - 2
+
+    with pytest.raises(Exception, match='Unknown endpoint'):
+        client.get_joined('NVDA', endpoints=('ranking-metrics',))
@@ -0,0 +1,47 @@
+import json
+import pickle
+import sys
+
+import pytest
+
+from stockgeist import StockGeistClient
+from stockgeist.decoding import get_decoder
+
+
+@pytest.mark.parametrize('name', ['auto', 'orjson', 'msgspec', 'json'])
+def test_decoder_matches_stdlib(name):
+    if name in ['orjson', 'msgspec']:
+        pytest.importorskip(name)
+    page = pickle.load(open('tests/data/article-metrics/NVDA-1h-all-metrics.pkl', 'rb'))[0]
+    content = json.dumps(page).encode('utf-8')
+
+    decode = get_decoder(name)
+
+    assert decode(content) == json.loads(content)
+    with pytest.raises(ValueError):
+        decode(b'<html>502 Bad Gateway</html>')
+
+
+def test_decoder_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+    monkeypatch.setitem(sys.modules, 'msgspec', None)
+
+    assert get_decoder('auto') is json.loads
+    with pytest.raises(Exception):
+        get_decoder('orjson')
+    with pytest.raises(Exception):
+        get_decoder('yaml')
+
+
+def test_client_custom_decoder(fake_session):
+    decoded = []
+
+    def decode(content):
+        decoded.append(content)
+        return json.loads(content)
+
+    client = StockGeistClient('test-token', json_decoder=decode)
+    client._session = fake_session
+    client.get_message_metrics('TSLA', start='2021-06-20T00:05:00', end='2021-06-20T15:40:00')
+
+    assert len(decoded) == 4 and all(isinstance(content, bytes) for content in decoded)
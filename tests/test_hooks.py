@@ -0,0 +1,101 @@
+import numpy as np
+
+from stockgeist import StockGeistClient, Hooks, ClientStats
+
+
+class RecordingHooks(Hooks):
+    def __init__(self):
+        self.events = []
+
+    def on_request_start(self, endpoint_name, query_key):
+        self.events.append(('request_start', endpoint_name, query_key))
+
+    def on_request_end(self, endpoint_name, status_code, latency, n_bytes):
+        self.events.append(('request_end', endpoint_name, status_code, n_bytes))
+
+    def on_page_decoded(self, endpoint_name, n_rows, duration):
+        self.events.append(('page_decoded', endpoint_name, n_rows))
+
+    def on_retry(self, endpoint_name, status_code, attempt, delay):
+        self.events.append(('retry', endpoint_name, status_code, attempt))
+
+    def on_call_end(self, endpoint_name, stats):
+        self.events.append(('call_end', endpoint_name, stats))
+
+    def on_conversion_done(self, response_name, n_rows, duration):
+        self.events.append(('conversion_done', response_name, n_rows))
+
+    def of(self, name):
+        return [event for event in self.events if event[0] == name]
+
+
+def test_hooks_events(fake_api, fake_session):
+    hooks = RecordingHooks()
+    client = StockGeistClient('test-token', hooks=[hooks], progress=False)
+    client._session = fake_session
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+    client.get_message_metrics(**query_args)
+
+    assert len(hooks.of('request_start')) == len(hooks.of('request_end')) == len(hooks.of('page_decoded')) == 4
+    assert all('token' not in event[2] for event in hooks.of('request_start'))
+    assert sum(event[2] for event in hooks.of('page_decoded')) == 187
+    assert hooks.of('conversion_done') == [('conversion_done', 'MessageMetricsResponse', 187)]
+
+    stats = hooks.of('call_end')[0][2]
+    assert stats['requests'] == stats['pages'] == 4 and stats['rows'] == 187
+    assert stats['bytes'] == sum(event[3] for event in hooks.of('request_end')) and stats['latency'] > 0
+    # the balance before the first query isn't known
+    assert stats['credits'] is None
+
+    # the fake API charges one credit per row
+    client.get_message_metrics(**query_args)
+    assert hooks.of('call_end')[-1][2]['credits'] == 187
+
+
+def test_hooks_retry_and_failing_hook(fake_api, fake_session, monkeypatch):
+    monkeypatch.setattr('stockgeist.client.time.sleep', lambda delay: None)
+
+    class FailingHooks(Hooks):
+        def on_request_end(self, endpoint_name, status_code, latency, n_bytes):
+            raise ValueError('exporter is down')
+
+    hooks = RecordingHooks()
+    client = StockGeistClient('test-token', hooks=[FailingHooks(), hooks], progress=False)
+    client._session = fake_session
+    fake_api.fail(503, times=1)
+    client.get_price_metrics('GILD', '1h', start='2021-05-18T00:00:00', end='2021-05-20T03:00:00')
+
+    assert hooks.of('retry') == [('retry', 'time-series/price-metrics', 503, 1)]
+    assert client.stats.as_dataframe.loc['time-series/price-metrics', 'retries'] == 1
+
+
+def test_client_stats(fake_api, fake_session):
+    client = StockGeistClient('test-token', max_workers=4, progress=False)
+    client._session = fake_session
+    for timeframe in ['5m', '1h']:
+        client.get_price_metrics('GILD', timeframe, start='2021-05-18T00:00:00', end='2021-05-20T03:00:00')
+    client.get_symbols()
+
+    assert isinstance(client.stats, ClientStats)
+    df = client.stats.as_dataframe
+    assert list(df.index) == ['time-series/price-metrics', 'snapshot/symbols']
+    assert df.loc['time-series/price-metrics', 'calls'] == 2
+    assert df.loc['time-series/price-metrics', 'requests'] == df.loc['time-series/price-metrics', 'pages']
+    assert df.loc['time-series/price-metrics', 'bytes'] > 0
+    assert 0 < df.loc['snapshot/symbols', 'p50'] <= df.loc['snapshot/symbols', 'p99']
+    assert np.isnan(client.stats.latency_percentiles('time-series/topic-metrics')['p50'])
+
+
+def test_client_custom_progress(fake_session):
+    totals = []
+
+    def progress(iterable, total=None):
+        totals.append(total)
+        return iterable
+
+    client = StockGeistClient('test-token', max_workers=2, progress=progress)
+    client._session = fake_session
+    client.get_message_metrics('TSLA', start='2021-06-20T00:05:00', end='2021-06-20T15:40:00')
+
+    assert totals == [4]
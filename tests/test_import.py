@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+# time budget in seconds for importing stockgeist on top of its core dependencies
+IMPORT_BUDGET = 0.5
+
+PLOTTING_MODULES = ['plotly', 'cufflinks', 'wordcloud', 'termcolor', 'matplotlib', 'IPython']
+
+
+def _run(code):
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return json.loads(output)
+
+
+def test_import_skips_plotting_stack():
+    loaded = _run('import json, sys; import stockgeist; '
+                  f'print(json.dumps([m for m in {PLOTTING_MODULES!r} if m in sys.modules]))')
+
+    assert loaded == []
+
+
+def test_import_time_budget():
+    # core dependencies are imported first, so that only the time spent in stockgeist itself is measured
+    elapsed = _run('import json, time; import numpy, pandas, requests, tqdm; '
+                   'start = time.perf_counter(); import stockgeist; '
+                   'print(json.dumps(time.perf_counter() - start))')
+
+    assert elapsed < IMPORT_BUDGET
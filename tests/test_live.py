@@ -0,0 +1,65 @@
+import pickle
+
+import pandas as pd
+
+from stockgeist import StockGeistClient, Subscription
+
+
+def _rows(endpoint, symbol, timeframe):
+    pages = pickle.load(open(f'tests/data/{endpoint}/{symbol}-{timeframe}-all-metrics.pkl', 'rb'))
+    return sorted([row for page in pages for row in page['body']], key=lambda row: row['timestamp'])
+
+
+def test_live_poll_fetches_only_new_bars(fake_api, fake_session):
+    rows = _rows('message-metrics', 'TSLA', '5m')
+    fake_api.add_pages('time-series/message-metrics', 'TSLA', '5m', [{'body': rows[:-5]}])
+
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    deltas = []
+    subscription = client.tail('message-metrics', 'TSLA', '5m', maxlen=52,
+                               callback=lambda symbol, delta: deltas.append((symbol, delta)))
+    assert isinstance(subscription, Subscription)
+
+    # the first poll fetches the latest page
+    subscription.poll()
+    assert len(deltas[0][1]['timestamp']) == 50
+    assert subscription.last_timestamp() == rows[-6]['timestamp']
+
+    # new bars are appended, the latest known bar is fetched again and reported if it has changed
+    rows[-6] = dict(rows[-6], total_count=rows[-6]['total_count'] + 1)
+    fake_api.add_pages('time-series/message-metrics', 'TSLA', '5m', [{'body': rows}])
+    delta = subscription.poll()['TSLA']
+
+    assert fake_api.queries[-1][1]['start'] == pd.Timestamp(rows[-6]['timestamp']).strftime('%Y-%m-%dT%H:%M:%S')
+    assert delta['timestamp'] == [row['timestamp'] for row in rows[-6:]]
+    assert deltas[-1] == ('TSLA', delta)
+
+    # the ring buffer keeps only the latest bars
+    buffered = subscription.as_dict()
+    assert buffered['timestamp'] == [row['timestamp'] for row in rows[-52:]]
+    assert buffered['total_count'] == [row['total_count'] for row in rows[-52:]]
+
+    # nothing new
+    assert subscription.poll() == {} and len(deltas) == 2
+
+
+def test_live_many_symbols(fake_api, fake_session):
+    fake_api.add_pickle('time-series/message-metrics', 'GME', '5m', 'tests/data/message-metrics/TSLA-5m-all-metrics.pkl')
+
+    client = StockGeistClient('test-token')
+    client._session = fake_session
+    subscription = client.tail('message-metrics', ['TSLA', 'GME'], '5m', filter=('total_count',))
+    deltas = subscription.poll()
+
+    assert list(deltas) == ['TSLA', 'GME']
+    df = subscription.as_dataframe('GME')
+    assert list(df.columns) == ['symbol', 'total_count'] and str(df.index.tz) == 'UTC'
+
+
+def test_live_next_poll_time():
+    client = StockGeistClient('test-token')
+    subscription = client.tail('price-metrics', 'GILD', '5m', delay=10)
+
+    assert subscription._next_poll_time(pd.Timestamp('2021-06-20 15:42:31', tz='UTC')) == \
+           pd.Timestamp('2021-06-20 15:45:10', tz='UTC')
@@ -1,5 +1,8 @@
-from stockgeist.responses import _Response, MessageMetricsResponse, ArticleMetricsResponse, PriceMetricsResponse
+from stockgeist.responses import _Response, MessageMetricsResponse, ArticleMetricsResponse, PriceMetricsResponse, \
+    TopicMetricsResponse
 import pickle
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -153,3 +156,233 @@ def test_article_metrics_response_visualize():
     article_metrics_response = ArticleMetricsResponse(test_data, query_args)
 
     assert article_metrics_response.visualize('titles+mentions+title_sentiments', False) == test_fig
+
+
+def test_base_response_columns():
+    # load test data
+    test_data = pickle.load(open(f'tests/data/article-metrics/NVDA-5m-all-metrics.pkl', 'rb'))
+    base_response = _Response(test_data)
+
+    # numeric metrics are typed arrays, the rest are lists, everything in chronological order
+    assert isinstance(base_response._data_dict['titles'], list)
+    assert isinstance(base_response._data_dict['timestamp'], list)
+    assert base_response._data_dict['timestamp'] == sorted(base_response._data_dict['timestamp'])
+    assert isinstance(base_response.as_dict['titles'], list) and len(base_response.as_dict['titles']) == 187
+
+
+def test_base_response_columns_deduplicated():
+    # load test data with overlapping page boundaries
+    test_data = pickle.load(open(f'tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    for older, newer in zip(test_data[1:], test_data[:-1]):
+        older['body'].append(dict(newer['body'][0]))
+    base_response = _Response(test_data)
+
+    assert base_response._data_dict['total_count'].dtype == np.float64
+    assert len(base_response.as_dict['timestamp']) == len(set(base_response.as_dict['timestamp'])) == 187
+
+
+def test_base_response_columns_mixed_types():
+    # load test data with a non-numeric value in numeric metric
+    test_data = pickle.load(open(f'tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    test_data[0]['body'][-1]['total_count'] = 'n/a'
+    base_response = _Response(test_data)
+
+    assert isinstance(base_response._data_dict['total_count'], list)
+    assert base_response.as_dict['total_count'][-1] == 'n/a' and len(base_response.as_dict['total_count']) == 187
+
+
+def test_base_response_dataframe_memoized():
+    # load test data
+    test_data = pickle.load(open(f'tests/data/article-metrics/NVDA-5m-all-metrics.pkl', 'rb'))
+    base_response = _Response(test_data)
+    df = base_response.as_dataframe
+
+    assert df is base_response.as_dataframe
+    assert str(df.index.tz) == 'UTC' and df.index.equals(pd.DatetimeIndex(base_response.as_dict['timestamp']))
+    assert df['mentions'].dtype == object and 'timestamp' not in df.columns
+    assert base_response.timestamps.dtype == np.int64 and base_response.timestamps[0] == df.index[0].value
+
+
+def test_base_response_dataframe_dtypes():
+    # load test data
+    test_data = pickle.load(open(f'tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    df = _Response(test_data).as_dataframe
+
+    assert all(dtype == np.float64 for dtype in df.dtypes)
+
+
+def test_base_response_as_dict_keeps_types():
+    metadata = {'status_code': 200, 'message': 'OK', 'credits': 0, 'server_timestamp': '2021-06-23 10:20:12+00:00'}
+    rows = [{'timestamp': '2021-06-20 00:00:00+00:00', 'total_count': 5, 'pos_index': 0.5, 'ma': 1.},
+            {'timestamp': '2021-06-20 00:05:00+00:00', 'total_count': 7, 'pos_index': None, 'ma': 2.5},
+            {'timestamp': '2021-06-20 00:10:00+00:00', 'total_count': 0, 'pos_index': 1.0, 'ma': None}]
+    response = _Response([{'metadata': metadata, 'body': rows}])
+
+    # numeric metrics are float64 columns, but as_dict returns the values as they came from REST API
+    assert response.as_dataframe['total_count'].dtype == np.float64
+    for key in ['timestamp', 'total_count', 'pos_index', 'ma']:
+        assert response.as_dict[key] == [row[key] for row in rows]
+        assert [type(value) for value in response.as_dict[key]] == [type(row[key]) for row in rows]
+
+
+def test_topic_metrics_response_visualize():
+    # load test data
+    test_data = pickle.load(open(f'tests/data/topic-metrics/AAPL-1h-all-metrics.pkl', 'rb'))
+    query_args = {'symbol': 'AAPL',
+                  'timeframe': '1h',
+                  'filter': ('words', 'scores'),
+                  'start': '2021-05-10T00:00:00',
+                  'end': '2021-05-12T03:00:00'}
+    topic_metrics_response = TopicMetricsResponse(test_data, query_args)
+    fig = topic_metrics_response.visualize('2021-05-11 10:00:00', False)
+
+    assert list(fig.data[1].text) == topic_metrics_response.as_dict['words'][34][::-1]
+    with pytest.raises(Exception, match="Can't visualize topics"):
+        topic_metrics_response.visualize('2021-07-11 10:00:00', False)
+
+
+def test_article_metrics_response_as_arrow():
+    pa = pytest.importorskip('pyarrow')
+
+    # load test data
+    test_data = pickle.load(open(f'tests/data/article-metrics/NVDA-5m-all-metrics.pkl', 'rb'))
+    article_metrics_response = ArticleMetricsResponse(test_data, {'symbol': 'NVDA', 'timeframe': '5m'})
+    table = article_metrics_response.as_arrow()
+
+    assert table.num_rows == 187
+    assert table.schema.field('timestamp').type == pa.timestamp('ns', tz='UTC')
+    assert table.schema.field('titles').type == pa.list_(pa.string())
+    assert table.column('titles').to_pylist() == article_metrics_response.as_dict['titles']
+    assert table.column('timestamp').cast(pa.int64()).to_pylist() == article_metrics_response.timestamps.tolist()
+    assert set(table.column('symbol').to_pylist()) == {'NVDA'}
+
+
+def test_message_metrics_response_to_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+
+    # load test data
+    test_data = pickle.load(open(f'tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    message_metrics_response = MessageMetricsResponse(test_data, {'symbol': 'TSLA', 'timeframe': '5m'})
+
+    message_metrics_response.to_parquet(str(tmp_path / 'tsla.parquet'))
+    df = pq.read_table(str(tmp_path / 'tsla.parquet')).to_pandas().set_index('timestamp')
+    pd.testing.assert_frame_equal(df.drop(columns='symbol'), message_metrics_response.as_dataframe,
+                                  check_names=False, check_freq=False)
+
+    # partitioned dataset
+    message_metrics_response.to_parquet(str(tmp_path / 'dataset'), partition_by=['symbol', 'date'])
+    assert [p.name for p in (tmp_path / 'dataset' / 'symbol=TSLA').iterdir()] == ['date=2021-06-20']
+    assert pq.read_table(str(tmp_path / 'dataset')).num_rows == 187
+
+
+def test_message_metrics_response_resample():
+    test_data = pickle.load(open(f'tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': None, 'start': None, 'end': None}
+    message_metrics_response = MessageMetricsResponse(test_data, query_args)
+
+    # moving statistics and ratios can't be aggregated
+    with pytest.raises(Exception, match="Can't resample ma"):
+        message_metrics_response.resample('1h')
+
+    df = message_metrics_response.resample('1h', drop_unsupported=True)
+    assert 'total_count' in df and 'ma' not in df and 'pos_index' not in df
+    expected = message_metrics_response.as_dataframe[df.columns].resample('1h').sum()
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    # full hours match the bars of the 1h timeframe
+    test_data = pickle.load(open(f'tests/data/message-metrics/TSLA-1h-all-metrics.pkl', 'rb'))
+    hourly = MessageMetricsResponse(test_data, dict(query_args, timeframe='1h')).as_dataframe
+    assert df.loc['2021-06-20 01:00':'2021-06-20 02:00', 'total_count'].tolist() == \
+           hourly.loc['2021-06-20 01:00':'2021-06-20 02:00', 'total_count'].tolist()
+
+    with pytest.raises(Exception, match='multiple'):
+        message_metrics_response.resample('7m', drop_unsupported=True)
+
+
+def test_price_metrics_response_resample():
+    test_data = pickle.load(open(f'tests/data/price-metrics/GILD-5m-all-metrics.pkl', 'rb'))
+    query_args = {'symbol': 'GILD', 'timeframe': '5m', 'filter': None, 'start': None, 'end': None}
+    price_metrics_response = PriceMetricsResponse(test_data, query_args)
+
+    for timeframe in ['1h', '1d']:
+        df = price_metrics_response.resample(timeframe)
+        expected = price_metrics_response.as_dataframe.resample(timeframe).agg(
+            {'close': 'last', 'high': 'max', 'low': 'min', 'open': 'first', 'volume': 'sum'}).dropna()
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    # only downloaded metrics are resampled
+    test_data = [{'metadata': page['metadata'], 'body': [{'timestamp': row['timestamp'], 'close': row['close']}
+                                                         for row in page['body']]} for page in test_data]
+    df = PriceMetricsResponse(test_data, query_args).resample('1d')
+    assert list(df.columns) == ['close'] and df['close'].tolist() == [66.0, 66.02]
+
+
+def test_article_metrics_response_aggregates():
+    test_data = pickle.load(open(f'tests/data/article-metrics/NVDA-5m-all-metrics.pkl', 'rb'))
+    query_args = {'symbol': 'NVDA', 'timeframe': '5m', 'filter': None, 'start': None, 'end': None}
+    article_metrics_response = ArticleMetricsResponse(test_data, query_args)
+
+    df = article_metrics_response.aggregates
+    assert list(df.columns) == ['titles_count', 'mentions_count', 'titles_count_positive', 'titles_count_neutral',
+                                'titles_count_negative']
+    assert df.index.equals(article_metrics_response.index)
+    assert article_metrics_response.aggregates is df
+
+    # the same as counting row by row
+    data = article_metrics_response.as_dict
+    assert df['titles_count'].tolist() == [len(entry) for entry in data['titles']]
+    assert df['mentions_count'].tolist() == [sum(entry) for entry in data['mentions']]
+    for label in ['positive', 'neutral', 'negative']:
+        assert df[f'titles_count_{label}'].tolist() == [entry.count(label) for entry in data['title_sentiments']]
+
+    # only downloaded metrics are aggregated
+    test_data = [{'metadata': page['metadata'], 'body': [{'timestamp': row['timestamp'], 'mentions': row['mentions']}
+                                                         for row in page['body']]} for page in test_data]
+    df = ArticleMetricsResponse(test_data, query_args).aggregates
+    assert list(df.columns) == ['mentions_count']
+
+
+def test_lttb():
+    from stockgeist.responses import _lttb
+
+    x = np.arange(10000, dtype=np.float64)
+    y = np.sin(x / 300.)
+    y[5000] = 10.
+
+    selected = _lttb(x, y, 500)
+    assert len(selected) == 500 and selected[0] == 0 and selected[-1] == 9999
+    assert np.all(np.diff(selected) > 0)
+    # extremes are kept
+    assert 5000 in selected and y[selected].min() == pytest.approx(y.min(), abs=1e-3)
+
+    # nothing to downsample
+    assert _lttb(x[:100], y[:100], 500).tolist() == list(range(100))
+
+
+def test_message_metrics_response_visualize_large():
+    timestamps = pd.date_range('2021-01-01', periods=30000, freq='5min', tz='UTC').astype(str)
+    rng = np.random.default_rng(0)
+    total_count = rng.poisson(10, size=len(timestamps)).astype(np.float64)
+    total_count[100] = np.nan
+    metadata = {'status_code': 200, 'message': 'OK', 'credits': 0, 'server_timestamp': '2021-06-23 10:20:12+00:00'}
+    # pages are ordered from the latest one
+    test_data = [{'metadata': metadata,
+                  'body': [{'timestamp': t, 'total_count': c} for t, c in zip(timestamps[i:i + 1000],
+                                                                               total_count[i:i + 1000])]}
+                 for i in range(29000, -1, -1000)]
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',), 'start': None, 'end': None}
+    message_metrics_response = MessageMetricsResponse(test_data, query_args)
+
+    # downsampled to the pixel budget, keeping the first and the last bar and the peak
+    trace = message_metrics_response.visualize('total_count', show_fig=False).data[0]
+    assert trace.type == 'scatter' and len(trace.y) == _Response.max_plot_points
+    assert trace.x.dtype == np.int64
+    assert trace.x[0] == pd.Timestamp(timestamps[0]).value // 10 ** 6
+    assert trace.x[-1] == pd.Timestamp(timestamps[-1]).value // 10 ** 6
+    assert np.nanmax(total_count) in trace.y
+
+    # all points with WebGL
+    trace = message_metrics_response.visualize('total_count', show_fig=False, full_resolution=True).data[0]
+    assert trace.type == 'scattergl' and len(trace.y) == 30000
+    assert trace.x.dtype == np.int64 and np.all(np.diff(trace.x) > 0)
@@ -0,0 +1,42 @@
+import pytest
+
+from stockgeist import RequestScheduler
+
+
+def test_scheduler_token_bucket():
+    scheduler = RequestScheduler(rate=10, burst=2)
+
+    delays = [scheduler.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0., 0.]
+    assert delays[2] == pytest.approx(0.1, abs=0.01) and delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_scheduler_unlimited_rate():
+    scheduler = RequestScheduler()
+
+    assert all(scheduler.reserve() == 0. for _ in range(100))
+
+
+def test_scheduler_retry_delay():
+    scheduler = RequestScheduler(max_retries=2, backoff=1., max_backoff=3.)
+
+    assert scheduler.retry_delay(404, 0) is None
+    assert 0. <= scheduler.retry_delay(503, 0) <= 1.
+    assert 0. <= scheduler.retry_delay(429, 1) <= 2.
+    assert scheduler.retry_delay(429, 2) is None
+    assert scheduler.retry_delay(429, 0, retry_after='5') >= 5.
+    assert scheduler.retries == 3
+
+
+def test_scheduler_credit_reserve():
+    scheduler = RequestScheduler(credit_reserve=100)
+
+    # balance is unknown until the first response
+    scheduler.reserve()
+    scheduler.update({'status_code': 200, 'credits': 150})
+    scheduler.reserve()
+    scheduler.update({'status_code': 200, 'credits': 99})
+
+    assert scheduler.credits == 99 and scheduler.exhausted
+    assert scheduler.reserve() is None
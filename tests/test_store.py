@@ -0,0 +1,81 @@
+import pickle
+
+import numpy as np
+
+from stockgeist import StockGeistClient, MessageMetricsResponse, ArticleMetricsResponse, TimeSeriesStore
+
+
+def test_store_missing_ranges(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count', 'ma'),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+
+    assert store.missing_ranges('time-series/message-metrics', query_args) == \
+           [('2021-06-20T00:05:00', '2021-06-20T15:40:00')]
+
+    # store a part of the range
+    test_data = pickle.load(open('tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb'))
+    store.write('time-series/message-metrics', dict(query_args, start='2021-06-20T03:10:00', end='2021-06-20T11:30:00'),
+                test_data[1:3])
+
+    assert store.missing_ranges('time-series/message-metrics', query_args) == \
+           [('2021-06-20T11:30:00', '2021-06-20T15:40:00'), ('2021-06-20T00:05:00', '2021-06-20T03:10:00')]
+    assert store.missing_ranges('time-series/message-metrics', dict(query_args, filter=('ma', 'pos_index'))) == \
+           [('2021-06-20T00:05:00', '2021-06-20T15:40:00')]
+
+
+def test_store_expands_home_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    store = TimeSeriesStore('~/.stockgeist-store')
+
+    assert store._path == str(tmp_path / '.stockgeist-store')
+    assert (tmp_path / '.stockgeist-store').is_dir() and not (tmp_path / '~').exists()
+
+
+def test_store_numeric_columns_memory_mapped(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    query_args = {'symbol': 'TSLA', 'timeframe': '5m', 'filter': ('total_count',),
+                  'start': '2021-06-20T00:05:00', 'end': '2021-06-20T15:40:00'}
+    store.write('time-series/message-metrics', query_args,
+                pickle.load(open('tests/data/message-metrics/TSLA-5m-all-metrics.pkl', 'rb')))
+
+    timestamps, values, _ = store._load(store._metric_dir('time-series/message-metrics', query_args, 'total_count'))
+    assert isinstance(values, np.memmap) and len(values) == len(timestamps) == 187
+
+
+def test_client_fetch_with_store(tmp_path, fake_api, fake_session):
+    query_args = {'symbol': 'NVDA', 'timeframe': '5m', 'filter': ('titles', 'mentions'),
+                  'start': '2021-05-20T00:05:00', 'end': '2021-05-20T15:40:00'}
+    test_case = ArticleMetricsResponse(
+        pickle.load(open('tests/data/article-metrics/NVDA-5m-all-metrics.pkl', 'rb')), query_args).as_dict
+
+    client = StockGeistClient('test-token', store=str(tmp_path))
+    client._session = fake_session
+
+    # first half of the range is downloaded
+    client.get_article_metrics(**dict(query_args, end='2021-05-20T07:20:00'))
+    n_queries = len(fake_api.queries)
+
+    # only the second half is downloaded
+    res = client.get_article_metrics(**query_args)
+    assert len(fake_api.queries) - n_queries == 2
+    assert res.as_dict['titles'] == test_case['titles'] and res.as_dict['mentions'] == test_case['mentions']
+
+    # everything is served locally
+    n_queries = len(fake_api.queries)
+    res = client.get_article_metrics(**query_args)
+    assert len(fake_api.queries) == n_queries
+    assert res.as_dict['timestamp'] == test_case['timestamp']
+
+
+def test_client_fetch_with_store_keeps_extra_arguments_apart(tmp_path, fake_session):
+    client = StockGeistClient('test-token', store=str(tmp_path))
+    client._session = fake_session
+    query_args = {'timeframe': '1h', 'filter': ('symbols',),
+                  'start': '2021-05-02T00:00:00', 'end': '2021-05-04T03:00:00'}
+    client.get_ranking_metrics(**query_args, top=5)
+
+    assert client._store.missing_ranges('time-series/ranking-metrics',
+                                        dict(query_args, symbol=None, by='total_count', direction='descending',
+                                             top=3)) == [('2021-05-02T00:00:00', '2021-05-04T03:00:00')]
@@ -0,0 +1,135 @@
+import datetime
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stockgeist import PriceMetricsResponse
+from stockgeist.trading_calendar import NYSECalendar
+
+
+@pytest.mark.parametrize('year, expected', [
+    (2021, ['2021-01-01', '2021-01-18', '2021-02-15', '2021-04-02', '2021-05-31', '2021-07-05', '2021-09-06',
+            '2021-11-25', '2021-12-24']),
+    (2022, ['2022-01-17', '2022-02-21', '2022-04-15', '2022-05-30', '2022-06-20', '2022-07-04', '2022-09-05',
+            '2022-11-24', '2022-12-26']),
+    (2023, ['2023-01-02', '2023-01-16', '2023-02-20', '2023-04-07', '2023-05-29', '2023-06-19', '2023-07-04',
+            '2023-09-04', '2023-11-23', '2023-12-25']),
+])
+def test_calendar_holidays(year, expected):
+    holidays = NYSECalendar().holidays(year)
+
+    assert [date.strftime('%Y-%m-%d') for date in holidays] == expected
+
+
+def test_calendar_special_closures_and_early_closes():
+    calendar = NYSECalendar()
+
+    assert datetime.date(2012, 10, 29) in calendar.holidays(2012)
+    assert datetime.date(2012, 10, 30) in calendar.holidays(2012)
+    assert [date.strftime('%Y-%m-%d') for date in calendar.early_closes(2021)] == ['2021-11-26']
+    assert [date.strftime('%Y-%m-%d') for date in calendar.early_closes(2024)] == \
+           ['2024-07-03', '2024-11-29', '2024-12-24']
+
+
+@pytest.mark.parametrize('timeframe, start, end, n_bars, first, last', [
+    # Good Friday and the weekend are skipped, daylight saving time is in effect
+    ('5m', '2021-04-01T00:00:00', '2021-04-06T00:00:00', 2 * 114, '2021-04-01 12:00:00', '2021-04-05 21:25:00'),
+    ('1h', '2021-04-01T00:00:00', '2021-04-06T00:00:00', 2 * 9, '2021-04-01 12:00:00', '2021-04-05 20:00:00'),
+    ('1d', '2021-04-01T00:00:00', '2021-04-06T00:00:00', 2, '2021-04-01 00:00:00', '2021-04-05 00:00:00'),
+    # standard time
+    ('1h', '2021-01-04T00:00:00', '2021-01-05T00:00:00', 9, '2021-01-04 13:00:00', '2021-01-04 21:00:00'),
+])
+def test_calendar_bars(timeframe, start, end, n_bars, first, last):
+    bars = pd.to_datetime(NYSECalendar().bars(start, end, timeframe))
+
+    assert len(bars) == n_bars
+    assert str(bars[0]) == first
+    assert str(bars[-1]) == last
+
+
+@pytest.mark.parametrize('timeframe', ['5m', '1h'])
+def test_calendar_bars_match_recorded_data(timeframe):
+    # no 1h bar starts at 17:00, when only a half an hour of the session is left
+    pages = pickle.load(open(f'tests/data/price-metrics/GILD-{timeframe}-all-metrics.pkl', 'rb'))
+    recorded = pd.to_datetime(sorted(row['timestamp'] for page in pages for row in page['body']))
+    bars = pd.to_datetime(NYSECalendar().bars(recorded[0].strftime('%Y-%m-%dT%H:%M:%S'),
+                                              (recorded[-1] + pd.Timedelta(timeframe)).strftime('%Y-%m-%dT%H:%M:%S'),
+                                              timeframe)).tz_localize('UTC')
+
+    assert bars.equals(recorded)
+
+
+def test_calendar_plan_windows():
+    calendar = NYSECalendar()
+
+    # whole window per trading day - the weekend, Good Friday and nights are skipped
+    windows = calendar.plan_windows('2021-04-01T00:00:00', '2021-04-06T00:00:00', '1h', 50)
+    assert windows == [('2021-04-03T19:00:00', '2021-04-05T21:00:00'), ('2021-04-01T00:00:00', '2021-04-01T21:00:00')]
+
+    # the range is clipped to the query
+    windows = calendar.plan_windows('2021-04-01T14:00:00', '2021-04-01T16:30:00', '5m', 50)
+    assert windows == [('2021-04-01T14:00:00', '2021-04-01T16:30:00')]
+
+    # market closed during the whole range
+    assert calendar.plan_windows('2021-04-02T00:00:00', '2021-04-05T00:00:00', '5m', 50) == []
+
+
+def test_calendar_rangebreaks():
+    calendar = NYSECalendar()
+
+    index = pd.date_range('2021-03-31 12:00', '2021-04-05 21:00', freq='1h', tz='UTC')
+    assert calendar.rangebreaks(index, '1h') == [dict(bounds=[21.5, 12.0], pattern='hour'),
+                                                 dict(bounds=['sat', 'mon']), dict(values=['2021-04-02'])]
+
+    # session hours in UTC change with daylight saving time
+    index = pd.date_range('2021-03-10 13:00', '2021-03-16 21:00', freq='1h', tz='UTC')
+    assert calendar.rangebreaks(index, '1h')[0] == dict(bounds=[22.5, 12.0], pattern='hour')
+
+    index = pd.date_range('2021-06-14', '2021-06-18', freq='1d', tz='UTC')
+    assert calendar.rangebreaks(index, '1d') == [dict(bounds=['sat', 'mon'])]
+
+
+def test_price_metrics_response_visualize_rangebreaks():
+    test_data = pickle.load(open(f'tests/data/price-metrics/GILD-1h-all-metrics.pkl', 'rb'))
+    query_args = {'symbol': 'GILD', 'timeframe': '1h', 'filter': ('open', 'high', 'low', 'close', 'volume'),
+                  'start': None, 'end': None}
+
+    fig = PriceMetricsResponse(test_data, query_args).visualize('close', show_fig=False)
+    rangebreaks = [rangebreak.to_plotly_json() for rangebreak in fig.layout.xaxis.rangebreaks]
+
+    assert rangebreaks == [dict(bounds=[21.5, 12.0], pattern='hour'), dict(bounds=['sat', 'mon'])]
+
+
+def test_price_metrics_response_visualize_without_calendar():
+    test_data = pickle.load(open(f'tests/data/price-metrics/GILD-1h-all-metrics.pkl', 'rb'))
+    query_args = {'symbol': 'GILD', 'timeframe': '1h', 'filter': ('open', 'high', 'low', 'close', 'volume'),
+                  'start': None, 'end': None}
+
+    fig = PriceMetricsResponse(test_data, query_args).visualize('close', show_fig=False, calendar=None)
+    rangebreaks = [rangebreak.to_plotly_json() for rangebreak in fig.layout.xaxis.rangebreaks]
+
+    assert rangebreaks == [dict(bounds=[21.5, 12], pattern='hour'), dict(bounds=['sat', 'mon'])]
+
+
+def test_price_metrics_response_visualize_full_resolution():
+    timestamps = pd.date_range('2021-01-04', periods=30000, freq='5min', tz='UTC').astype(str)
+    metadata = {'status_code': 200, 'message': 'OK', 'credits': 0, 'server_timestamp': '2021-06-23 10:20:12+00:00'}
+    test_data = [{'metadata': metadata, 'body': [{'timestamp': t, 'close': float(i % 97)}
+                                                 for i, t in enumerate(timestamps)]}]
+    response = PriceMetricsResponse(test_data, {'symbol': 'GILD', 'timeframe': '5m', 'filter': ('close',),
+                                                'start': None, 'end': None})
+
+    # downsampled lines keep the closed periods hidden
+    fig = response.visualize('close', show_fig=False)
+    assert fig.data[0].type == 'scatter' and len(fig.layout.xaxis.rangebreaks) > 0
+
+    # all points are rendered with WebGL, which doesn't support rangebreaks
+    fig = response.visualize('close', show_fig=False, full_resolution=True)
+    assert fig.data[0].type == 'scattergl' and len(fig.data[0].y) == 30000
+    assert len(fig.layout.xaxis.rangebreaks) == 0
+
+    # timestamps are passed as epoch milliseconds of a date axis
+    assert fig.data[0].x.dtype == np.int64 and fig.layout.xaxis.type == 'date'
+    assert fig.data[0].x[0] == pd.Timestamp(timestamps[0]).value // 10 ** 6
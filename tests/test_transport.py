@@ -0,0 +1,70 @@
+import gzip
+
+import pytest
+
+from stockgeist import StockGeistClient, CassetteTransport
+
+
+class OfflineSession:
+    def get(self, url, **kwargs):
+        raise AssertionError('network access in replay mode')
+
+    def close(self):
+        pass
+
+
+def _client(session, path, mode, token='test-token'):
+    client = StockGeistClient(token, progress=False)
+    client._session = CassetteTransport(path, mode).mount(session)
+    return client
+
+
+def test_transport_record_and_replay(fake_api, fake_session, tmp_path):
+    path = str(tmp_path / 'backtest.cassette.gz')
+    query_args = {'symbol': 'GILD', 'timeframe': '5m', 'filter': ('close', 'volume'),
+                  'start': '2021-04-19T00:05:00', 'end': '2021-04-20T15:40:00'}
+
+    # record
+    client = _client(fake_session, path, 'record')
+    test_case = client.get_price_metrics(**query_args)
+    symbols = client.get_symbols()
+    n_queries = len(fake_api.queries)
+
+    # replay with another token and no network
+    client = _client(OfflineSession(), path, 'replay', token='other-token')
+    assert client.get_price_metrics(**query_args).as_dict == test_case.as_dict
+    assert client.get_symbols().as_dict == symbols.as_dict
+    assert len(client._session) == n_queries
+
+    # the token isn't recorded
+    with gzip.open(path, 'rt') as f:
+        assert 'test-token' not in f.read()
+
+    # unknown requests fail in replay mode
+    with pytest.raises(Exception, match='not recorded'):
+        client.get_price_metrics(**dict(query_args, symbol='AMGN'))
+
+
+def test_transport_auto_records_missing_requests(fake_api, fake_session, tmp_path):
+    path = str(tmp_path / 'tests.cassette.gz')
+    query_args = {'symbol': 'TSLA', 'timeframe': '1h', 'start': '2021-06-18T00:00:00', 'end': '2021-06-20T15:00:00'}
+
+    client = _client(fake_session, path, 'auto')
+    client.get_message_metrics(**query_args)
+    n_queries = len(fake_api.queries)
+    client.get_message_metrics(**query_args)
+    assert len(fake_api.queries) == n_queries
+
+    # failed requests are not recorded
+    fake_api.fail(503, times=4)
+    client = StockGeistClient('test-token', max_retries=0, progress=False,
+                              transport=CassetteTransport(path, 'auto'))
+    client._session.mount(fake_session)
+    with pytest.raises(Exception):
+        client.get_message_metrics('AAPL', '1h')
+    assert len(CassetteTransport(path, 'replay')) == n_queries
+
+
+def test_transport_unknown_mode(tmp_path):
+    with pytest.raises(Exception):
+        CassetteTransport(str(tmp_path / 'cassette.gz'), 'rewind')